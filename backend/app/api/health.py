@@ -2,6 +2,8 @@
 
 from fastapi import APIRouter, Response
 
+from app.services.warmup import get_warmup
+
 router = APIRouter()
 
 @router.get("/")
@@ -14,3 +16,15 @@ def health_check(response: Response):
         "status": "ok",
         "service": "financial-risk-intelligence-api"
     }
+
+
+@router.get("/ready")
+@router.head("/ready")
+def readiness_check(response: Response):
+    """
+    Readiness (route traffic here only when 200): models loaded and
+    warmed. /api/health stays the liveness check.
+    """
+    warmup = get_warmup()
+    response.status_code = 200 if warmup.ready else 503
+    return warmup.to_dict()
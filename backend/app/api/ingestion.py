@@ -1,44 +1,92 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import text
 
 from app.db.deps import get_db
-from app.services.ingestion import ingest_ieee_rows
+from app.services.ingestion import (
+    CHUNK_SIZE,
+    MAX_CHUNK_SIZE,
+    checkpoint_lease_holder,
+    count_raw_pending,
+    load_checkpoint,
+)
+from app.services.ingestion_jobs import JobConflictError, job_manager
+from app.services.pacing import build_pacing
 
 router = APIRouter()
 
-@router.post("/start")
+@router.post("/start", status_code=202)
 def start_ingestion(
     limit: int = 2000,
-    db: Session = Depends(get_db),
+    chunk_size: int = CHUNK_SIZE,
+    mode: str = "realtime",
+    rate_tps: float | None = None,
 ):
     """
-    Ingest rows FROM RAW TABLE into ML pipeline
+    Submit a background job: NEW rows FROM RAW TABLE into ML pipeline
+    (resumes after the persisted watermark, see /checkpoint).
+    Poll /jobs/{job_id} for progress.
+
+    mode:
+    - realtime : fixed pause per chunk (UI demo, default)
+    - rate     : token bucket at rate_tps
+    - max      : no pacing (backfills)
+    - adaptive : backs off when commits slow down
     """
+    if not 1 <= chunk_size <= MAX_CHUNK_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"chunk_size must be in [1, {MAX_CHUNK_SIZE}]",
+        )
+
+    try:
+        pacing = build_pacing(mode, rate_tps)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        job = job_manager.submit(limit, chunk_size, pacing)
+    except JobConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return job.to_dict()
+
+
+@router.get("/jobs")
+def list_jobs():
+    return [job.to_dict() for job in job_manager.list()]
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_manager.get(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+
+    return job.to_dict()
+
+
+@router.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str):
+    job = job_manager.cancel(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+
+    return job.to_dict()
+
 
-    rows = db.execute(
-        text("""
-            SELECT
-                "TransactionID",
-                "TransactionAmt",
-                "ProductCD",
-                card1,
-                addr1,
-                "C1",
-                "C2",
-                "D1",
-                "DeviceType",
-                "DeviceInfo"
-            FROM ieee_raw_transactions
-            ORDER BY ingested_at ASC
-            LIMIT :limit
-        """),
-        {"limit": limit}
-    ).mappings().all()
-
-    ingest_ieee_rows(db, rows)
+@router.get("/checkpoint")
+def get_checkpoint(db: Session = Depends(get_db)):
+    checkpoint = load_checkpoint(db)
+    pending = count_raw_pending(db, checkpoint)
+    db.commit()
 
     return {
-        "status": "db_ingestion_complete",
-        "rows_fetched": len(rows),
+        "name": checkpoint.name,
+        "last_ingested_at": checkpoint.last_ingested_at,
+        "last_id": checkpoint.last_id,
+        "updated_at": checkpoint.updated_at,
+        "leased_by": checkpoint_lease_holder(checkpoint),
+        "rows_pending": pending,
     }
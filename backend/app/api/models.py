@@ -1,11 +1,22 @@
 # app/api/models.py
 
-from fastapi import APIRouter
+import hmac
+import os
+
+from fastapi import APIRouter, Header, HTTPException
 from app.services.online_metrics import get_online_model_stats
 from app.ml.offline.ieee_offline_metrics import load_cached_offline_metrics
+from app.ml.registry import available_versions, get_model_registry
+from app.ml.thread_budget import get_thread_budget
+from app.services.model_reload import get_model_reloader
+from app.services.scoring_pool import get_scoring_pool
 
 router = APIRouter(tags=["Models"])
 
+# shared secret for model admin actions (X-Admin-Token);
+# unset = admin actions disabled (fail closed)
+MODEL_ADMIN_TOKEN = os.getenv("MODEL_ADMIN_TOKEN")
+
 
 @router.get("/offline-metrics")
 def offline_metrics():
@@ -21,3 +32,58 @@ def online_stats():
     Online production monitoring (unlabeled).
     """
     return get_online_model_stats()
+
+
+@router.get("/loaded")
+def loaded_models():
+    """
+    Models held by THIS process (one copy each): artifact versions,
+    load times, memory footprint, thread budget.
+    Pool workers hold one copy each.
+    """
+    pool = get_scoring_pool()
+    return {
+        **get_model_registry().describe(),
+        "thread_budget": get_thread_budget().to_dict(),
+        "scoring_pool": pool.to_dict() if pool is not None else None,
+    }
+
+
+@router.get("/versions")
+def model_versions():
+    """
+    Artifact versions available for hot reload.
+    """
+    return {
+        "live": get_model_registry().version,
+        "available": available_versions(),
+    }
+
+
+@router.post("/reload", status_code=202)
+def reload_models(version: str, x_admin_token: str | None = Header(None)):
+    """
+    Hot reload (background): load -> validate -> warmup -> parity -> swap.
+    In-flight requests finish on the old version. Poll GET /reload.
+    """
+    if not MODEL_ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=403,
+            detail="Model admin is disabled (MODEL_ADMIN_TOKEN not set)",
+        )
+    if not hmac.compare_digest(x_admin_token or "", MODEL_ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+    if version not in available_versions():
+        raise HTTPException(status_code=404, detail=f"Unknown model version '{version}'")
+
+    reloader = get_model_reloader()
+    if not reloader.start(version):
+        raise HTTPException(status_code=409, detail="A model reload is already running")
+
+    return reloader.to_dict()
+
+
+@router.get("/reload")
+def reload_status():
+    return get_model_reloader().to_dict()
@@ -1,14 +1,56 @@
 # app.api.scoring.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+from datetime import datetime, timezone
+import json
+import math
+import os
 import uuid
 
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Float, Integer, String
+from sqlalchemy.orm import Session
+
 from app.db.deps import get_db
 from app.db.models.transaction import Transaction
-from app.ml.pipeline import RiskPipeline
+from app.ml.anomaly.isolation_forest import IF_FEATURES
+from app.ml.cascade import get_cascade
+from app.ml.pipeline import RiskPipeline, iter_score_rows
+from app.services.explanations import (
+    explanations_deferred,
+    get_explanation_worker,
+)
+from app.services.ingestion import (
+    RAW_FIELDS,
+    TEXT_FIELDS,
+    _transaction_record,
+    apply_scores,
+)
+from app.services.score_persistence import get_score_persister
+from app.services.scoring_pool import get_scoring_pool
+from app.services.scoring_coalescer import (
+    COALESCE_ENABLED,
+    COALESCE_MAX_BATCH,
+    get_scoring_coalescer,
+)
 
 router = APIRouter()
-pipeline = RiskPipeline()
+pipeline = RiskPipeline(executor=get_scoring_pool(), cascade=get_cascade())
+
+MAX_BATCH_SIZE = int(os.getenv("SCORING_MAX_BATCH_SIZE", "1000"))
+
+# raw inputs typed by their Transaction column (+ Isolation Forest inputs):
+# a bad value here is a 400, never a 500 in scoring or a failed write
+_COLUMN_TYPES = {column.name: column.type for column in Transaction.__table__.columns}
+
+BATCH_NUMERIC_FIELDS = list(dict.fromkeys(
+    [f for f in RAW_FIELDS if isinstance(_COLUMN_TYPES[f], (Float, Integer))]
+    + IF_FEATURES
+))
+# categorical: hashed and one-hot encoded (str, number or null)
+BATCH_TEXT_FIELDS = [
+    f for f in TEXT_FIELDS + RAW_FIELDS if isinstance(_COLUMN_TYPES[f], String)
+]
 
 
 # -----------------------------
@@ -58,19 +100,192 @@ def persist_transaction(transaction_id: str, db: Session = Depends(get_db)):
     if not tx:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
-    result = pipeline.score(tx)
+    deferred = explanations_deferred()
+    result = pipeline.score(tx, explain=not deferred)
 
     tx.fraud_prob = result["fraud_prob"]
     tx.anomaly_score = result.get("anomaly_score")
     tx.decision = result["decision"]
     tx.severity = result["severity"]       
     tx.decision_reasons = result.get("reasons", [])  
+    tx.shap_values = result.get("shap_values")
+    tx.explanation_status = result.get("explanation_status")
+    tx.model_version = result.get("model_version")
+    tx.scored_by = result.get("scored_by")
 
 
     db.commit()
 
+    if result["explanation_status"] == "pending":
+        get_explanation_worker().submit([tx_id])
+
     return {
         "status": "persisted",
-        "transaction_id": str(tx.id),
-        "decision": tx.decision,
+        "transaction_id": str(tx_id),
+        "decision": result["decision"],
+        "explanation_status": result["explanation_status"],
     }
+
+
+# -----------------------------
+# Online batch scoring (raw payloads, NO DB round trip)
+# -----------------------------
+def parse_batch_payload(body: bytes, content_type: str) -> list:
+    """
+    JSON array (or {"transactions": [...]}) / NDJSON -> list of raw
+    IEEE-shaped dicts. Raises ValueError on malformed input.
+    """
+    if "ndjson" in content_type or "jsonl" in content_type:
+        txs = [json.loads(line) for line in body.splitlines() if line.strip()]
+    else:
+        txs = json.loads(body)
+        if isinstance(txs, dict):
+            txs = txs.get("transactions")
+
+    if not isinstance(txs, list):
+        raise ValueError("Expected a JSON array of transactions (or NDJSON)")
+
+    for i, tx in enumerate(txs):
+        if not isinstance(tx, dict):
+            raise ValueError(f"Transaction {i} is not an object")
+
+        if tx.get("TransactionAmt") is None:
+            raise ValueError(f"Transaction {i}: TransactionAmt must be a number")
+
+        for field in BATCH_NUMERIC_FIELDS:
+            if not _is_number_or_null(tx.get(field)):
+                raise ValueError(f"Transaction {i}: {field} must be a number")
+
+        for field in BATCH_TEXT_FIELDS:
+            value = tx.get(field)
+            if not (isinstance(value, str) or _is_number_or_null(value)):
+                raise ValueError(
+                    f"Transaction {i}: {field} must be a string, number or null"
+                )
+
+    return txs
+
+
+def _is_number_or_null(value) -> bool:
+    if value is None:
+        return True
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return False
+    try:
+        # huge JSON integers overflow float()
+        return math.isfinite(float(value))
+    except (OverflowError, ValueError):
+        return False
+
+
+def build_response(txs: list, columns: dict, persist: bool) -> dict:
+    """
+    Pipeline columns -> per-transaction results (+ write-behind hand-off).
+    """
+    results = [
+        {"TransactionID": tx.get("TransactionID"), **row}
+        for tx, row in zip(txs, iter_score_rows(columns))
+    ]
+
+    persisted = None
+    if persist:
+        ingested_at = datetime.now(timezone.utc)
+        records = [_transaction_record(tx, ingested_at) for tx in txs]
+        apply_scores(records, columns)
+
+        queued = get_score_persister().submit(records)
+        persisted = {"queued": queued, "dropped": len(records) - queued}
+
+    return {
+        "count": len(results),
+        "results": results,
+        "persisted": persisted,
+    }
+
+
+def score_payload(txs: list, explain: bool, persist: bool) -> dict:
+    """
+    ONE batched pipeline pass; persistence is handed off, never awaited.
+    """
+    ctx = pipeline.build_context(txs)
+    columns = pipeline.run(ctx, explain=explain)
+
+    return {
+        **build_response(txs, columns, persist),
+        "timings_ms": ctx.timings_ms(),
+    }
+
+
+async def score_coalesced(txs: list, explain: bool, persist: bool) -> dict:
+    """
+    Small requests share a pipeline pass with concurrent ones.
+    """
+    coalescer = get_scoring_coalescer(pipeline)
+    scored = await asyncio.wrap_future(coalescer.submit(txs, explain))
+
+    return {
+        **build_response(txs, scored["columns"], persist),
+        "timings_ms": scored["timings_ms"],
+        "coalesced": {
+            "batch_size": scored["batch_size"],
+            "wait_ms": scored["wait_ms"],
+        },
+    }
+
+
+@router.post("/batch")
+async def score_batch(
+    request: Request,
+    persist: bool = False,
+    explain: bool | None = None,
+):
+    """
+    Score raw IEEE-shaped transactions inline (JSON array or NDJSON).
+
+    - no DB reads or writes on the request path
+    - persist=true : scored rows are written asynchronously
+                     (requires TransactionID, idempotent on it)
+    - small batches (<= SCORING_COALESCE_MAX_BATCH) are micro-batched
+      with concurrent requests (SCORING_COALESCE=0 disables)
+    - explain      : SHAP for REVIEW / BLOCK rows
+                     (default: inline unless EXPLANATION_MODE=deferred;
+                     pending rows are back-filled only when persisted)
+    """
+    try:
+        txs = parse_batch_payload(
+            await request.body(),
+            request.headers.get("content-type", ""),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not txs:
+        raise HTTPException(status_code=400, detail="Empty batch")
+
+    if len(txs) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large (max {MAX_BATCH_SIZE} transactions)",
+        )
+
+    if persist and any(tx.get("TransactionID") is None for tx in txs):
+        raise HTTPException(
+            status_code=400,
+            detail="persist=true requires TransactionID on every transaction",
+        )
+
+    if explain is None:
+        explain = not explanations_deferred()
+
+    if COALESCE_ENABLED and len(txs) <= COALESCE_MAX_BATCH:
+        return await score_coalesced(txs, explain, persist)
+
+    return await run_in_threadpool(score_payload, txs, explain, persist)
+
+
+@router.get("/coalescer")
+def coalescer_stats():
+    """
+    Micro-batching counters (batches formed, mean batch size, backlog).
+    """
+    return get_scoring_coalescer(pipeline).to_dict()
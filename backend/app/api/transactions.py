@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from app.db.deps import get_db
 from app.db.models.transaction import Transaction
+from app.services.explanations import explanation_status
 
 router = APIRouter()
 
@@ -86,7 +87,9 @@ def get_transaction(transaction_id: str, db: Session = Depends(get_db)):
         "ingested_at": tx.ingested_at,
         "fraud_prob": tx.fraud_prob,
         "anomaly_score": tx.anomaly_score,
+        "scored_by": tx.scored_by,
         "decision": tx.decision,
         "shap_values": tx.shap_values or [],
+        "explanation_status": explanation_status(tx),
 
     }
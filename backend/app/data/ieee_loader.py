@@ -8,12 +8,99 @@ DATA_DIR = BASE_DIR / "data" / "ieee"
 TX_PATH = DATA_DIR / "test_transaction.csv"
 ID_PATH = DATA_DIR / "test_identity.csv"
 
+# identity is ~1/4 of the rows and ~1/10 of the columns of the
+# transaction file: it is indexed once, transactions are streamed
+READ_CHUNK_SIZE = 50_000
+
+
+def _header(path: Path) -> list:
+    # test_identity.csv uses "id-01" style names
+    return [c.replace("-", "_") for c in pd.read_csv(path, nrows=0).columns]
+
+
+def _usecols(path: Path, columns) -> list | None:
+    """
+    Raw CSV names to read for the wanted (normalized) columns.
+    """
+    if columns is None:
+        return None
+
+    wanted = set(columns) | {"TransactionID"}
+    raw = pd.read_csv(path, nrows=0).columns
+    return [c for c in raw if c.replace("-", "_") in wanted]
+
+
+def build_identity_index(
+    columns=None,
+    transaction_ids=None,
+    path: Path | None = None,
+    chunk_size: int = READ_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    test_identity.csv indexed by TransactionID (read in chunks).
+
+    columns         : keep only these identity columns
+    transaction_ids : keep only these ids (small head() loads)
+    """
+    path = path or ID_PATH
+
+    parts = []
+    for chunk in pd.read_csv(
+        path,
+        usecols=_usecols(path, columns),
+        chunksize=chunk_size,
+    ):
+        chunk.columns = chunk.columns.str.replace("-", "_")
+        if transaction_ids is not None:
+            chunk = chunk[chunk["TransactionID"].isin(transaction_ids)]
+        parts.append(chunk)
+
+    identity = pd.concat(parts, ignore_index=True)
+    return identity.drop_duplicates("TransactionID").set_index("TransactionID")
+
+
+def iter_ieee_chunks(
+    chunk_size: int = READ_CHUNK_SIZE,
+    columns=None,
+    limit: int | None = None,
+    identity: pd.DataFrame | None = None,
+):
+    """
+    Stream test_transaction.csv left-joined with identity, chunk by chunk.
+    Peak memory ~ identity index + one chunk, independent of file size.
+    """
+    if identity is None:
+        id_columns = None
+        if columns is not None:
+            id_columns = [c for c in columns if c in _header(ID_PATH)]
+        identity = build_identity_index(columns=id_columns)
+
+    reader = pd.read_csv(
+        TX_PATH,
+        usecols=_usecols(TX_PATH, columns),
+        chunksize=chunk_size,
+        nrows=limit,
+    )
+
+    for chunk in reader:
+        df = chunk.join(identity, on="TransactionID")
+        if columns is not None:
+            df = df.reindex(columns=["TransactionID"] + [
+                c for c in columns if c != "TransactionID"
+            ])
+        yield df
+
 
 def load_ieee_test_rows(limit: int = 1000):
-    tx = pd.read_csv(TX_PATH)
-    identity = pd.read_csv(ID_PATH)
+    """
+    First `limit` merged rows: reads only those transaction rows
+    and only their identity rows.
+    """
+    tx = pd.read_csv(TX_PATH, nrows=limit)
+    identity = build_identity_index(
+        transaction_ids=set(tx["TransactionID"])
+    )
 
-    df = tx.merge(identity, on="TransactionID", how="left")
-    df = df.head(limit)
+    df = tx.join(identity, on="TransactionID")
 
     return df.to_dict(orient="records")
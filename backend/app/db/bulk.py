@@ -0,0 +1,392 @@
+import json
+import math
+import struct
+import uuid
+import zlib
+from collections.abc import Mapping
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    Float,
+    Integer,
+    SmallInteger,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Session
+
+
+# BULK WRITES (COPY ... FROM STDIN)
+#
+# copy_rows   : plain COPY into a table (append only)
+# copy_upsert : COPY into a temp staging table, then
+#               INSERT ... SELECT ... ON CONFLICT (upsert / skip)
+#
+# Both run inside the caller's transaction (Session or Connection),
+# so they commit atomically with anything else in it.
+#
+# format="text"   : tab separated, \N = NULL
+# format="binary" : PGCOPY, values packed from the SQLAlchemy column types
+
+
+COPY_FORMATS = ("text", "binary")
+
+_READ_SIZE = 1 << 16
+
+
+# value encoders per column type
+
+_TEXT_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    "\t": "\\t",
+    "\n": "\\n",
+    "\r": "\\r",
+})
+
+
+def _text_str(v) -> str:
+    return str(v).translate(_TEXT_ESCAPES)
+
+
+def _text_float(v) -> str:
+    return repr(float(v))
+
+
+def _text_int(v) -> str:
+    return str(int(v))
+
+
+def _text_bool(v) -> str:
+    return "t" if v else "f"
+
+
+def _text_json(v) -> str:
+    return json.dumps(v).translate(_TEXT_ESCAPES)
+
+
+def _text_datetime(v) -> str:
+    return v.isoformat() if isinstance(v, datetime) else _text_str(v)
+
+
+_PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+_PG_EPOCH_NAIVE = datetime(2000, 1, 1)
+
+_pack_i16 = struct.Struct(">h").pack
+_pack_i32 = struct.Struct(">i").pack
+_pack_i64 = struct.Struct(">q").pack
+_pack_f64 = struct.Struct(">d").pack
+
+_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + _pack_i32(0) + _pack_i32(0)
+_BINARY_TRAILER = _pack_i16(-1)
+_BINARY_NULL = _pack_i32(-1)
+
+
+def _field(payload: bytes) -> bytes:
+    return _pack_i32(len(payload)) + payload
+
+
+def _bin_str(v) -> bytes:
+    return _field(str(v).encode())
+
+
+def _bin_float(v) -> bytes:
+    return _field(_pack_f64(float(v)))
+
+
+def _bin_int4(v) -> bytes:
+    return _field(_pack_i32(int(v)))
+
+
+def _bin_int8(v) -> bytes:
+    return _field(_pack_i64(int(v)))
+
+
+def _bin_int2(v) -> bytes:
+    return _field(_pack_i16(int(v)))
+
+
+def _bin_bool(v) -> bytes:
+    return _field(b"\x01" if v else b"\x00")
+
+
+def _bin_jsonb(v) -> bytes:
+    # jsonb binary = version byte + text
+    return _field(b"\x01" + json.dumps(v).encode())
+
+
+def _bin_uuid(v) -> bytes:
+    if not isinstance(v, uuid.UUID):
+        v = uuid.UUID(str(v))
+    return _field(v.bytes)
+
+
+def _micros(delta) -> int:
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _bin_timestamptz(v) -> bytes:
+    if v.tzinfo is None:
+        v = v.replace(tzinfo=timezone.utc)
+    return _field(_pack_i64(_micros(v - _PG_EPOCH)))
+
+
+def _bin_timestamp(v) -> bytes:
+    # timestamp without time zone keeps the wall clock (like text input)
+    return _field(_pack_i64(_micros(v.replace(tzinfo=None) - _PG_EPOCH_NAIVE)))
+
+
+def _encoders(column):
+    """
+    (text encoder, binary encoder) chosen from the SQLAlchemy type.
+    Columns missing from the model are sent as text for Postgres to parse.
+    """
+    if column is None:
+        return _text_str, None
+
+    col_type = column.type
+
+    if isinstance(col_type, Boolean):
+        return _text_bool, _bin_bool
+    if isinstance(col_type, SmallInteger):
+        return _text_int, _bin_int2
+    if isinstance(col_type, BigInteger):
+        return _text_int, _bin_int8
+    if isinstance(col_type, Integer):
+        return _text_int, _bin_int4
+    if isinstance(col_type, Float):
+        return _text_float, _bin_float
+    if isinstance(col_type, JSONB):
+        return _text_json, _bin_jsonb
+    if isinstance(col_type, UUID):
+        return _text_str, _bin_uuid
+    if isinstance(col_type, DateTime):
+        if col_type.timezone:
+            return _text_datetime, _bin_timestamptz
+        return _text_datetime, _bin_timestamp
+    return _text_str, _bin_str
+
+
+def _is_null(v) -> bool:
+    return v is None or (isinstance(v, float) and math.isnan(v))
+
+
+class _ChunkStream:
+    """
+    File-like view over an iterator of byte chunks (COPY reads from it).
+    Rows are encoded lazily: memory ~ one read buffer, not the batch.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buf = bytearray()
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buf) < size:
+            try:
+                self._buf += next(self._chunks)
+            except StopIteration:
+                break
+
+        if size < 0 or size >= len(self._buf):
+            out = bytes(self._buf)
+            self._buf.clear()
+        else:
+            out = bytes(self._buf[:size])
+            del self._buf[:size]
+        return out
+
+
+class _Encoder:
+    def __init__(self, table, columns: list, fmt: str):
+        if fmt not in COPY_FORMATS:
+            raise ValueError(
+                f"Unknown COPY format '{fmt}'. "
+                f"Expected one of: {', '.join(COPY_FORMATS)}"
+            )
+
+        self.fmt = fmt
+        pick = 0 if fmt == "text" else 1
+        self.encoders = [_encoders(table.c.get(name))[pick] for name in columns]
+
+        unknown = [c for c, e in zip(columns, self.encoders) if e is None]
+        if unknown:
+            raise ValueError(
+                f"binary COPY needs typed model columns, "
+                f"{table.name} has no: {', '.join(unknown)}"
+            )
+        self.columns = columns
+        self.rows = 0
+
+    def _values(self, rows):
+        columns = self.columns
+        for row in rows:
+            self.rows += 1
+            if isinstance(row, Mapping):
+                yield [row.get(name) for name in columns]
+            else:
+                yield row
+
+    def chunks(self, rows, rows_per_chunk: int = 1000):
+        if self.fmt == "binary":
+            return self._binary_chunks(rows, rows_per_chunk)
+        return self._text_chunks(rows, rows_per_chunk)
+
+    def _text_chunks(self, rows, rows_per_chunk: int):
+        encoders = self.encoders
+        lines = []
+
+        for values in self._values(rows):
+            lines.append("\t".join([
+                "\\N" if _is_null(v) else encode(v)
+                for encode, v in zip(encoders, values)
+            ]))
+            if len(lines) >= rows_per_chunk:
+                yield ("\n".join(lines) + "\n").encode()
+                lines = []
+
+        if lines:
+            yield ("\n".join(lines) + "\n").encode()
+
+    def _binary_chunks(self, rows, rows_per_chunk: int):
+        encoders = self.encoders
+        n_fields = _pack_i16(len(encoders))
+        parts = [_BINARY_HEADER]
+        pending = 0
+
+        for values in self._values(rows):
+            parts.append(n_fields)
+            for encode, v in zip(encoders, values):
+                parts.append(_BINARY_NULL if _is_null(v) else encode(v))
+            pending += 1
+            if pending >= rows_per_chunk:
+                yield b"".join(parts)
+                parts = []
+                pending = 0
+
+        parts.append(_BINARY_TRAILER)
+        yield b"".join(parts)
+
+
+def _table(model_or_table):
+    return getattr(model_or_table, "__table__", model_or_table)
+
+
+def _connection(bind):
+    """
+    SQLAlchemy Connection behind a Session / Connection
+    (same transaction the caller is already in).
+    """
+    if isinstance(bind, Session):
+        return bind.connection()
+    return bind
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _column_list(columns) -> str:
+    return ", ".join(_quote(c) for c in columns)
+
+
+def _default_columns(table, rows):
+    if isinstance(rows, list) and rows and isinstance(rows[0], Mapping):
+        return [c.name for c in table.columns if c.name in rows[0]]
+    raise ValueError("columns are required unless rows is a list of dicts")
+
+
+def _copy(conn, target: str, columns: list, encoder: _Encoder, rows):
+    options = "FORMAT binary" if encoder.fmt == "binary" else "FORMAT text"
+    dbapi = conn.connection.dbapi_connection
+
+    with dbapi.cursor() as cur:
+        cur.copy_expert(
+            f"COPY {target} ({_column_list(columns)}) FROM STDIN WITH ({options})",
+            _ChunkStream(encoder.chunks(rows)),
+            size=_READ_SIZE,
+        )
+
+
+def copy_rows(bind, model_or_table, rows, columns=None, format: str = "text") -> int:
+    """
+    Append rows with one COPY (no conflict handling).
+
+    rows    : dicts (by column name) or sequences ordered like `columns`
+    columns : defaults to the model columns present in the first dict
+    Returns the number of rows sent.
+    """
+    table = _table(model_or_table)
+    columns = list(columns or _default_columns(table, rows))
+    encoder = _Encoder(table, columns, format)
+
+    _copy(_connection(bind), _quote(table.name), columns, encoder, rows)
+    return encoder.rows
+
+
+def copy_upsert(
+    bind,
+    model_or_table,
+    rows,
+    conflict_columns,
+    columns=None,
+    update_columns=None,
+    returning: str | None = None,
+    format: str = "text",
+):
+    """
+    COPY into a temp staging table, then ONE
+    INSERT ... SELECT ... ON CONFLICT (conflict_columns).
+
+    update_columns=None : DO NOTHING (idempotent loads)
+    update_columns=[..] : DO UPDATE SET col = EXCLUDED.col
+    returning           : column to return for rows actually written
+                          (typed like the model, e.g. UUID ids)
+
+    Returns the list of `returning` values, or the written row count.
+    """
+    table = _table(model_or_table)
+    columns = list(columns or _default_columns(table, rows))
+    encoder = _Encoder(table, columns, format)
+    conn = _connection(bind)
+
+    # one staging table per (table, column set) and session:
+    # plain columns, no constraints, emptied before every use
+    stage = _quote(
+        f"_stage_{table.name}_{zlib.crc32(','.join(columns).encode()):08x}"
+    )
+    column_list = _column_list(columns)
+
+    conn.execute(text(
+        f"CREATE TEMP TABLE IF NOT EXISTS {stage} "
+        f"ON COMMIT DELETE ROWS AS "
+        f"SELECT {column_list} FROM {_quote(table.name)} WITH NO DATA"
+    ))
+    conn.execute(text(f"TRUNCATE {stage}"))
+
+    _copy(conn, stage, columns, encoder, rows)
+
+    conflict = _column_list(conflict_columns)
+    if update_columns:
+        action = "DO UPDATE SET " + ", ".join(
+            f"{_quote(c)} = EXCLUDED.{_quote(c)}" for c in update_columns
+        )
+    else:
+        action = "DO NOTHING"
+
+    # DISTINCT ON: a batch may repeat a key (DO UPDATE rejects that)
+    sql = (
+        f"INSERT INTO {_quote(table.name)} ({column_list}) "
+        f"SELECT DISTINCT ON ({conflict}) {column_list} FROM {stage} "
+        f"ON CONFLICT ({conflict}) {action}"
+    )
+
+    if returning is None:
+        return conn.execute(text(sql)).rowcount
+
+    stmt = text(f"{sql} RETURNING {_quote(returning)}").columns(
+        table.c[returning]
+    )
+    return list(conn.execute(stmt).scalars())
@@ -2,9 +2,19 @@ from app.db.database import SessionLocal
 
 from sqlalchemy import text
 
-def get_db():
+
+def open_session():
+    """
+    Session outside a request (background jobs / workers).
+    Caller closes it.
+    """
     db = SessionLocal()
     db.execute(text("SET search_path TO railway, public"))
+    return db
+
+
+def get_db():
+    db = open_session()
     try:
         yield db
     finally:
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime
+from sqlalchemy import Column, String, Float, DateTime, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 from datetime import datetime, timezone
@@ -28,3 +28,20 @@ class IEEERawTransaction(Base):
         default=lambda: datetime.now(timezone.utc),
         nullable=False,
     )
+
+    # WORKER CLAIMS (multi-process ingestion, see services/ingestion_workers.py)
+    claimed_by = Column(String, nullable=True)
+    claimed_until = Column(DateTime(timezone=True), nullable=True)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # keyset scans for incremental ingestion
+        Index("ix_ieee_raw_ingested_at_id", "ingested_at", "id"),
+        # claim queue: only unprocessed rows
+        Index(
+            "ix_ieee_raw_unprocessed",
+            "ingested_at",
+            "id",
+            postgresql_where=text("processed_at IS NULL"),
+        ),
+    )
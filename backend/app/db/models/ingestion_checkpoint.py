@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+from datetime import datetime, timezone
+
+
+class IngestionCheckpoint(Base):
+    """
+    Keyset watermark over a raw source table.
+    Everything <= (last_ingested_at, last_id) has been ingested.
+
+    leased_by / leased_until: the ONE run allowed to advance it
+    (across processes; renewed with every watermark commit).
+    """
+    __tablename__ = "ingestion_checkpoints"
+
+    name = Column(String, primary_key=True)
+
+    last_ingested_at = Column(DateTime(timezone=True), nullable=True)
+    last_id = Column(UUID(as_uuid=True), nullable=True)
+
+    leased_by = Column(String, nullable=True)
+    leased_until = Column(DateTime(timezone=True), nullable=True)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
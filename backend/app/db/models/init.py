@@ -1,2 +1,3 @@
 from app.db.models.alert import Alert
 from app.db.models.transaction import Transaction
+from app.db.models.ingestion_checkpoint import IngestionCheckpoint
@@ -127,6 +127,11 @@ class Transaction(Base):
     severity = Column(String)
     decision_reasons = Column(JSONB, nullable=True)
     shap_values = Column(JSONB, nullable=True)
+    explanation_status = Column(String, nullable=True)
+    # artifact version that scored the row (deferred SHAP must match it)
+    model_version = Column(String, nullable=True)
+    # stage that produced fraud_prob: "full" | "screen" (cascade, k trees)
+    scored_by = Column(String, nullable=True)
 
 
     # HUMAN-IN-THE-LOOP
@@ -0,0 +1,105 @@
+# app/gunicorn_conf.py
+#
+# Multi-worker serving with SHARED model memory:
+#   gunicorn -c python:app.gunicorn_conf app.main:app
+#
+# preload_app imports app.main ONCE in the master; models are loaded
+# there and the workers are forked from it, so numpy / sklearn /
+# lightgbm code, the unpickled models and the feature contract live
+# in copy-on-write pages shared by every worker instead of N copies.
+
+import gc
+import os
+
+from app.ml.thread_budget import FORK_SAFE_ENV, THREAD_ENV
+
+# LightGBM's OpenMP runtime (libgomp) is not fork-safe once its thread
+# pool has more than one thread, and loading a model may already start
+# it: the master stays at 1 thread (app.main's set_env leaves this
+# alone) and post_fork raises each worker to its budget
+# (app/ml/thread_budget.py: cores / workers).
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.getenv("MODEL_PRELOAD", "1") == "1"
+forwarded_allow_ips = "*"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+
+if preload_app:
+    os.environ[FORK_SAFE_ENV] = "1"
+    for name in THREAD_ENV:
+        os.environ[name] = "1"
+
+
+def when_ready(server):
+    """
+    Master, after the app import and before the first fork:
+    load every artifact, then freeze the heap so the workers'
+    garbage collector never writes to (and un-shares) those pages.
+    """
+    if not preload_app:
+        return
+
+    from app.ml.registry import get_model_registry
+
+    registry = get_model_registry()
+    registry.load()
+    server.log.info("Preloaded model version %s in master", registry.version)
+
+    gc.collect()
+    gc.freeze()
+
+
+def on_reload(server):
+    """
+    Master, on SIGHUP, before the new workers are forked: load the
+    version a worker validated and handed off (services/model_reload.py),
+    so every new worker serves it and shares its pages. Loading only:
+    the master still never predicts.
+    """
+    if not preload_app:
+        return
+
+    from app.ml.registry import ModelSet, get_model_registry
+    from app.services.model_reload import read_master_handoff
+
+    version = read_master_handoff(server.pid)
+    registry = get_model_registry()
+    if version is None or version == registry.version:
+        return
+
+    try:
+        candidate = ModelSet(version)
+        candidate.load()
+    except Exception:
+        server.log.exception("Model version %s failed to load in master", version)
+        return
+
+    gc.unfreeze()
+    previous = registry.swap(candidate)
+    del previous
+    gc.collect()
+    gc.freeze()
+    server.log.info("Master now serves model version %s", version)
+
+
+def post_fork(server, worker):
+    # never share the master's DB connections with a worker
+    from app.db.database import engine
+    from app.ml.thread_budget import configure_thread_budget
+
+    engine.dispose(close=False)
+
+    # hot reloads go through the master (see on_reload)
+    if preload_app:
+        from app.services.model_reload import MASTER_PID_ENV
+        os.environ[MASTER_PID_ENV] = str(server.pid)
+
+    # budget from the real worker count (--workers overrides WEB_CONCURRENCY),
+    # replacing the master's 1-thread limits
+    os.environ.pop(FORK_SAFE_ENV, None)
+    budget = configure_thread_budget(processes=server.cfg.workers)
+    budget.set_env()
+    budget.enforce()
@@ -3,12 +3,18 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+# thread budget BEFORE numpy / lightgbm / sklearn size their pools
+from app.ml.thread_budget import get_thread_budget
+get_thread_budget().set_env()
+
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.db.database import engine
 from app.db.base import Base
-from app.db.models import transaction
+from app.db.models import transaction, ingestion_checkpoint
 
 from app.api.ingestion import router as ingestion_router
 from app.api.analytics import router as analytics_router
@@ -24,15 +30,41 @@ from app.api import (
 )
 
 from app.api import health
+from app.services.explanations import (
+    explanations_deferred,
+    get_explanation_worker,
+)
+from app.services.scoring_pool import get_scoring_pool
+from app.services.warmup import get_warmup
 
                   
 # DB init
                   
 Base.metadata.create_all(bind=engine)
 
+
+# Lifespan: model warmup (readiness at /api/health/ready)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_thread_budget().enforce()
+    pool = get_scoring_pool()
+    # one ModelRegistry per process: warming the scoring pipeline
+    # warms ingestion too (same model instances)
+    get_warmup().start(scoring.pipeline, scoring_pool=pool)
+    # deferred SHAP: sweep rows left pending by a previous run
+    # without waiting for new traffic
+    if explanations_deferred():
+        get_explanation_worker()
+    yield
+    if pool is not None:
+        pool.shutdown()
+
+
 app = FastAPI(
     title="Financial Risk Intelligence API",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
 )
 
                   
@@ -0,0 +1,163 @@
+import os
+import numpy as np
+
+
+class SklearnForestEvaluator:
+    """
+    Reference path: IsolationForest.score_samples
+    (input validation + one tree.apply per estimator).
+    """
+
+    name = "sklearn"
+
+    def __init__(self, model):
+        self.model = model
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        return self.model.score_samples(X)
+
+
+class CompiledForestEvaluator:
+    """
+    The trained forest flattened into NumPy arrays, every tree
+    evaluated at once (one row or a whole matrix).
+
+    Per node, all trees concatenated (tree t starts at roots[t]):
+    - feature   : input column (estimators_features_ already applied)
+    - threshold : go left if x <= threshold (float64, as sklearn)
+    - children  : [left, right] pairs, flat (node i -> 2i, 2i+1)
+    - missing_right : NaN goes right (sklearn missing_go_to_left)
+    - leaf_value : decision path length + average path length - 1
+                   (the per-tree depth term of score_samples)
+
+    Leaves point to themselves, so max_depth steps land every
+    (row, tree) on its leaf. Depths are summed tree by tree in
+    sklearn's order: scores are bit-identical to score_samples.
+    """
+
+    name = "compiled"
+
+    # rows per step (bounds the (rows, n_trees) work arrays)
+    CHUNK_ROWS = 2048
+
+    def __init__(self, model):
+        from sklearn.ensemble._iforest import _average_path_length
+
+        trees = [e.tree_ for e in model.estimators_]
+        sizes = [t.node_count for t in trees]
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.intp)
+
+        feature, threshold, children, missing_right, leaf_value = [], [], [], [], []
+
+        for tree_idx, tree in enumerate(trees):
+            offset = offsets[tree_idx]
+            nodes = np.arange(tree.node_count, dtype=np.intp)
+            is_leaf = tree.children_left == -1
+
+            columns = np.asarray(model.estimators_features_[tree_idx], dtype=np.intp)
+            feature.append(np.where(is_leaf, 0, columns[np.maximum(tree.feature, 0)]))
+            threshold.append(np.where(is_leaf, 0.0, tree.threshold))
+
+            left = np.where(is_leaf, nodes, tree.children_left) + offset
+            right = np.where(is_leaf, nodes, tree.children_right) + offset
+            children.append(np.stack([left, right], axis=1).ravel())
+
+            missing_left = getattr(tree, "missing_go_to_left", None)
+            if missing_left is None:
+                missing_left = np.zeros(tree.node_count, dtype=bool)
+            missing_right.append(np.asarray(missing_left) == 0)
+
+            leaf_value.append(
+                model._decision_path_lengths[tree_idx]
+                + model._average_path_length_per_tree[tree_idx]
+                - 1.0
+            )
+
+        self.roots = offsets
+        self.feature = np.concatenate(feature).astype(np.intp)
+        self.threshold = np.concatenate(threshold).astype(np.float64)
+        self.children = np.concatenate(children).astype(np.intp)
+        self.missing_right = np.concatenate(missing_right)
+        self.leaf_value = np.concatenate(leaf_value).astype(np.float64)
+
+        self.n_features = model.n_features_in_
+        self.max_depth = max(t.max_depth for t in trees)
+        self.denominator = len(trees) * _average_path_length([model._max_samples])[0]
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            a.nbytes for a in (
+                self.roots, self.feature, self.threshold,
+                self.children, self.missing_right, self.leaf_value,
+            )
+        )
+
+    def score_samples(self, X: np.ndarray) -> np.ndarray:
+        """
+        Same values as IsolationForest.score_samples (lower = more abnormal).
+        """
+        # sklearn scores float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(
+                f"Expected (n, {self.n_features}) input, got {X.shape}"
+            )
+
+        depths = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), self.CHUNK_ROWS):
+            stop = start + self.CHUNK_ROWS
+            depths[start:stop] = self._depths(X[start:stop])
+
+        # For a single training sample, denominator and depth are 0
+        scores = 2 ** (
+            -np.divide(
+                depths,
+                self.denominator,
+                out=np.ones_like(depths),
+                where=self.denominator != 0,
+            )
+        )
+        return -scores
+
+    def _depths(self, X: np.ndarray) -> np.ndarray:
+        n_rows = len(X)
+        flat = X.ravel()
+        row_base = (np.arange(n_rows, dtype=np.intp) * self.n_features)[:, None]
+        has_nan = bool(np.isnan(flat).any())
+
+        node = np.broadcast_to(self.roots, (n_rows, len(self.roots)))
+        for _ in range(self.max_depth):
+            x = flat[row_base + self.feature[node]]
+            go_right = ~(x <= self.threshold[node])
+            if has_nan:
+                go_right &= ~np.isnan(x) | self.missing_right[node]
+            node = self.children[2 * node + go_right]
+
+        # running sum tree by tree == sklearn's `depths += ...` order
+        return np.cumsum(self.leaf_value[node], axis=1)[:, -1]
+
+
+ANOMALY_EVALUATORS = {
+    CompiledForestEvaluator.name: CompiledForestEvaluator,
+    SklearnForestEvaluator.name: SklearnForestEvaluator,
+}
+
+
+def create_anomaly_evaluator(model, backend: str | None = None):
+    """
+    IF_EVALUATOR=compiled (default) | sklearn
+    """
+    backend = backend or os.getenv("IF_EVALUATOR", "compiled")
+
+    if backend not in ANOMALY_EVALUATORS:
+        raise RuntimeError(
+            f"Unknown IF_EVALUATOR '{backend}'. "
+            f"Expected one of: {', '.join(ANOMALY_EVALUATORS)}"
+        )
+
+    return ANOMALY_EVALUATORS[backend](model)
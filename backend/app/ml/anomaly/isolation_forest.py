@@ -2,6 +2,9 @@ import joblib
 import numpy as np
 from pathlib import Path
 import os
+import threading
+
+from app.ml.features import _field_getter, _to_float
 
 
 IF_FEATURES = [
@@ -13,17 +16,39 @@ IF_FEATURES = [
 ]
 
 
+def build_anomaly_matrix(txs) -> np.ndarray:
+    """
+    (N, 16) Isolation Forest input for a chunk of
+    ORM rows / dicts / RowMappings.
+    Missing, None, non-numeric or non-finite -> 0.0 (same coercion
+    as FeatureEncoder).
+    """
+    X = np.zeros((len(txs), len(IF_FEATURES)), dtype=np.float64)
+
+    for i, tx in enumerate(txs):
+        get = _field_getter(tx)
+        X[i] = [_to_float(get(f)) for f in IF_FEATURES]
+
+    return X
+
+
 class AnomalyScorer:
     """
     Lazy-loaded Isolation Forest scorer.
     App will NOT crash if model is missing at startup.
+    Scores through the compiled array evaluator (IF_EVALUATOR).
     """
 
-    def __init__(self):
+    def __init__(self, model_path: Path | None = None):
         self.model = None
+        self.evaluator = None
+
+        # load bookkeeping (ModelRegistry.describe)
+        self.load_info = {}
+        self._load_lock = threading.Lock()
 
         ml_dir = Path(__file__).resolve().parents[1] 
-        self.model_path = ml_dir / os.getenv(
+        self.model_path = Path(model_path) if model_path else ml_dir / os.getenv(
             "IF_MODEL_PATH",
             "ieee/artifacts/isolation_forest.joblib",
         )
@@ -32,13 +57,36 @@ class AnomalyScorer:
         if self.model is not None:
             return
 
-        if not self.model_path.exists():
-            raise RuntimeError(
-                f"Isolation Forest model not found at {self.model_path}. "
-                f"Upload artifact or disable anomaly scoring."
-            )
+        with self._load_lock:
+            if self.model is not None:
+                return
+
+            if not self.model_path.exists():
+                raise RuntimeError(
+                    f"Isolation Forest model not found at {self.model_path}. "
+                    f"Upload artifact or disable anomaly scoring."
+                )
+
+            from app.ml.artifacts import record_load
+            from app.ml.anomaly.evaluators import create_anomaly_evaluator
+            import sklearn
 
-        self.model = joblib.load(self.model_path)
+            info = {}
+            with record_load(self.model_path, info):
+                model = joblib.load(self.model_path)
+                evaluator = create_anomaly_evaluator(model)
+
+            info.update({
+                "library": f"scikit-learn {sklearn.__version__}",
+                "n_estimators": len(getattr(model, "estimators_", [])),
+                "n_features": getattr(model, "n_features_in_", None),
+                "evaluator": evaluator.name,
+            })
+
+            # publish model LAST: it is the "loaded" flag
+            self.evaluator = evaluator
+            self.load_info = info
+            self.model = model
 
     def score(self, tx) -> float:
         """
@@ -47,13 +95,24 @@ class AnomalyScorer:
         """
         self._load_model()
 
-        x = np.array([
-            getattr(tx, f, 0.0) or 0.0
-            for f in IF_FEATURES
-        ]).reshape(1, -1)
+        x = build_anomaly_matrix([tx])
 
         # sklearn: higher = more normal → invert
-        raw = self.model.score_samples(x)[0]
+        raw = self.evaluator.score_samples(x)[0]
         anomaly_score = -raw
 
         return float(anomaly_score)
+
+    def score_batch(self, txs) -> np.ndarray:
+        return self.score_matrix(build_anomaly_matrix(txs))
+
+    def score_matrix(self, X: np.ndarray) -> np.ndarray:
+        """
+        One evaluator call over the whole chunk.
+        """
+        self._load_model()
+
+        if len(X) == 0:
+            return np.empty(0, dtype=np.float64)
+
+        return -self.evaluator.score_samples(X)
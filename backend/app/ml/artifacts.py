@@ -0,0 +1,71 @@
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+# Artifact bookkeeping for the model registry:
+# what was loaded (file + hash), when, how long it took
+# and how much resident memory the load added.
+
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes() -> int | None:
+    """
+    Current resident set size (Linux /proc); None elsewhere.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def artifact_info(path: Path) -> dict:
+    """
+    On-disk identity of an artifact: size, mtime, sha256 prefix.
+    """
+    path = Path(path)
+    stat = path.stat()
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+
+    return {
+        "path": str(path),
+        "size_bytes": stat.st_size,
+        "modified_at": datetime.fromtimestamp(
+            stat.st_mtime, tz=timezone.utc
+        ).isoformat(),
+        "sha256": digest.hexdigest()[:16],
+    }
+
+
+@contextmanager
+def record_load(path: Path, info: dict):
+    """
+    Fill `info` with artifact identity, load time and RSS delta
+    for the block that loads `path`.
+    """
+    rss_before = rss_bytes()
+    started = time.perf_counter()
+
+    yield info
+
+    rss_after = rss_bytes()
+    info.update({
+        "artifact": artifact_info(path),
+        "loaded_at": datetime.now(timezone.utc).isoformat(),
+        "load_seconds": round(time.perf_counter() - started, 4),
+        "rss_delta_bytes": (
+            rss_after - rss_before
+            if rss_before is not None and rss_after is not None
+            else None
+        ),
+    })
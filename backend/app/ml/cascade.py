@@ -0,0 +1,69 @@
+import os
+import threading
+
+from app.ml.decision_engine import DecisionEngine
+
+
+# CASCADE SCORING
+# stage 1 (screen): LightGBM truncated to its first k iterations
+#   prob_k <  allow_below -> ALLOW now (no full model, no SHAP);
+#                            fraud_prob = prob_k, scored_by = "screen"
+#   prob_k >= allow_below -> full model (+ SHAP), scored_by = "full"
+# The Isolation Forest (~0.05 ms / row) scores EVERY row: risk views
+# rank on max(fraud_prob, anomaly_score).
+#
+# SCORING_CASCADE_ITERATIONS=0 (default) disables it.
+# Pick k / allow_below from: python -m app.ml.offline.bench_cascade
+
+CASCADE_ITERATIONS = int(os.getenv("SCORING_CASCADE_ITERATIONS", "0"))
+CASCADE_ALLOW_BELOW = float(os.getenv("SCORING_CASCADE_ALLOW_BELOW", "0.01"))
+
+# which stage produced fraud_prob (pipeline column / Transaction.scored_by)
+SCORED_BY_FULL = "full"
+SCORED_BY_SCREEN = "screen"
+
+
+class Cascade:
+    """
+    First-stage screen settings (immutable, pinned per request
+    like the model set: ScoringContext.cascade).
+    """
+
+    def __init__(self, iterations: int, allow_below: float):
+        if iterations < 1:
+            raise ValueError("Cascade needs at least 1 iteration")
+
+        # a screen may only ALLOW: everything it lets through must be
+        # below the first flagging threshold of the decision policy
+        if not 0.0 < allow_below <= DecisionEngine.REVIEW_TH:
+            raise ValueError(
+                f"allow_below must be in (0, {DecisionEngine.REVIEW_TH}], "
+                f"got {allow_below}"
+            )
+
+        self.iterations = iterations
+        self.allow_below = allow_below
+
+    def to_dict(self) -> dict:
+        return {"iterations": self.iterations, "allow_below": self.allow_below}
+
+    def __repr__(self):
+        return f"Cascade(iterations={self.iterations}, allow_below={self.allow_below})"
+
+
+_cascade = None
+_cascade_lock = threading.Lock()
+
+
+def get_cascade() -> Cascade | None:
+    """
+    Env-configured cascade (None = full pipeline for every row).
+    """
+    global _cascade
+    if CASCADE_ITERATIONS <= 0:
+        return None
+
+    with _cascade_lock:
+        if _cascade is None:
+            _cascade = Cascade(CASCADE_ITERATIONS, CASCADE_ALLOW_BELOW)
+    return _cascade
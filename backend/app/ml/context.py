@@ -0,0 +1,53 @@
+import time
+from contextlib import contextmanager
+
+
+class ScoringContext:
+    """
+    Scoring state for one transaction or one batch.
+
+    Built ONCE by RiskPipeline, then consumed by every stage
+    (predict, anomaly, decision, explain) so no stage re-encodes.
+    """
+
+    def __init__(self, txs, X, X_anomaly):
+        self.txs = txs
+
+        # encoded inputs
+        self.X = X                    # LightGBM contract matrix (N, 245)
+        self.X_anomaly = X_anomaly    # Isolation Forest matrix (N, 16)
+
+        # registry ModelSet pinned for this request (hot reload safe)
+        self.models = None
+
+        # first-stage screen for this request (None = full pipeline)
+        self.cascade = None
+
+        # stage outputs
+        self.fraud_probs = None
+        self.anomaly_scores = None
+        self.decisions = None
+        self.screened = None          # row indices ALLOWed by the cascade
+
+        # stage -> seconds
+        self.timings = {}
+
+    def __len__(self):
+        return len(self.txs)
+
+    @contextmanager
+    def timed(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = (
+                self.timings.get(stage, 0.0)
+                + time.perf_counter() - start
+            )
+
+    def timings_ms(self) -> dict:
+        return {
+            stage: round(seconds * 1000, 3)
+            for stage, seconds in self.timings.items()
+        }
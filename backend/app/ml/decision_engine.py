@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class DecisionEngine:
     """
     Production fraud decision policy
@@ -48,3 +51,37 @@ class DecisionEngine:
             "anomaly_score": anomaly_score,
             "reasons": reasons,
         }
+
+    def decide_batch(self, fraud_probs, anomaly_scores=None):
+        """
+        Vectorized decide(): same thresholds, columnar output.
+        """
+        fraud_probs = np.asarray(fraud_probs, dtype=np.float64)
+
+        # tier 0 = ALLOW ... 3 = BLOCK (same precedence as decide)
+        tier = np.select(
+            [
+                fraud_probs >= self.HARD_BLOCK_TH,
+                fraud_probs >= self.SOFT_BLOCK_TH,
+                fraud_probs >= self.REVIEW_TH,
+            ],
+            [3, 2, 1],
+            default=0,
+        )
+
+        decisions = np.array(["ALLOW", "REVIEW", "REVIEW", "BLOCK"])
+        severities = np.array(["LOW", "MEDIUM", "HIGH", "HIGH"])
+        reasons = [
+            [],
+            ["Elevated fraud probability"],
+            ["High fraud probability (manual review required)"],
+            ["Extremely high fraud probability"],
+        ]
+
+        return {
+            "decision": decisions[tier].tolist(),
+            "severity": severities[tier].tolist(),
+            "fraud_prob": fraud_probs,
+            "anomaly_score": anomaly_scores,
+            "reasons": [list(reasons[t]) for t in tier],
+        }
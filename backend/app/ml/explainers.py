@@ -0,0 +1,65 @@
+import os
+import numpy as np
+
+from app.ml.thread_budget import get_thread_budget
+
+
+class NativeContribExplainer:
+    """
+    Exact TreeSHAP straight from LightGBM (pred_contrib=True).
+    - No shap / numba / llvmlite import
+    - Batched: one predict call per matrix
+    """
+
+    name = "native"
+
+    def __init__(self, model):
+        self.model = model
+
+    def shap_values(self, X: np.ndarray) -> np.ndarray:
+        threads = get_thread_budget().threads_for(len(X))
+        kwargs = {} if threads is None else {"num_threads": threads}
+        contrib = self.model.predict(X, pred_contrib=True, **kwargs)
+        # last column is the expected value (bias term)
+        return np.asarray(contrib)[:, :-1]
+
+
+class ShapTreeExplainer:
+    """
+    Optional fallback: shap.TreeExplainer (heavy import).
+    """
+
+    name = "shap"
+
+    def __init__(self, model):
+        import shap
+
+        self.explainer = shap.TreeExplainer(model)
+
+    def shap_values(self, X: np.ndarray) -> np.ndarray:
+        shap_raw = self.explainer.shap_values(X)
+
+        if isinstance(shap_raw, list):
+            return shap_raw[-1]
+        return shap_raw
+
+
+EXPLAINER_BACKENDS = {
+    NativeContribExplainer.name: NativeContribExplainer,
+    ShapTreeExplainer.name: ShapTreeExplainer,
+}
+
+
+def create_explainer(model, backend: str | None = None):
+    """
+    EXPLAINER_BACKEND=native (default) | shap
+    """
+    backend = backend or os.getenv("EXPLAINER_BACKEND", "native")
+
+    if backend not in EXPLAINER_BACKENDS:
+        raise RuntimeError(
+            f"Unknown EXPLAINER_BACKEND '{backend}'. "
+            f"Expected one of: {', '.join(EXPLAINER_BACKENDS)}"
+        )
+
+    return EXPLAINER_BACKENDS[backend](model)
@@ -1,4 +1,7 @@
 from pathlib import Path
+from collections.abc import Mapping
+import math
+import re
 import pandas as pd
 import joblib
 import numpy as np
@@ -11,6 +14,32 @@ ARTIFACT_DIR = BASE_DIR / "app" / "ml" / "ieee" / "artifacts"
 FEATURES_PATH = ARTIFACT_DIR / "features_lgbm.joblib"
 
 
+# Raw feature contract (MUST MATCH ieee/train_lightgbm.py)
+TX_FEATURES = [
+    "TransactionAmt",
+    "ProductCD",
+    "card1",
+    "addr1",
+    "C1",
+    "C2",
+    "D1",
+]
+
+ID_FEATURES = [
+    "DeviceType",
+    "DeviceInfo",
+] + [f"id_{i:02d}" for i in range(1, 39)]
+
+RAW_FEATURES = TX_FEATURES + ID_FEATURES
+
+# same sanitization LightGBM training applies to get_dummies output
+_SANITIZE_RE = re.compile(r"[^A-Za-z0-9_]")
+
+
+def sanitize_feature_name(name: str) -> str:
+    return _SANITIZE_RE.sub("_", name)
+
+
 def _load_feature_columns():
     if not FEATURES_PATH.exists():
         raise RuntimeError(
@@ -19,36 +48,213 @@ def _load_feature_columns():
     return joblib.load(FEATURES_PATH)
 
 
+def _field_getter(tx):
+    """
+    ORM rows / Row objects expose attributes,
+    dicts / RowMappings expose keys.
+    """
+    if isinstance(tx, Mapping):
+        return tx.get
+    return lambda key: getattr(tx, key, None)
+
+
+def _to_float(value) -> float:
+    """
+    Scalar equivalent of pd.to_numeric(errors="coerce")
+    + inf/NaN -> 0.0
+    """
+    if value is None:
+        return 0.0
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    if not math.isfinite(value):
+        return 0.0
+    return value
+
+
+def _to_float_array(values) -> np.ndarray:
+    """
+    Vectorized _to_float: fast float64 cast, per-value
+    coercion only when the column holds non-numeric values.
+    """
+    try:
+        arr = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        arr = np.fromiter(
+            (_to_float(v) for v in values),
+            dtype=np.float64,
+            count=len(values),
+        )
+    return np.nan_to_num(arr, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def _column_reader(txs):
+    """
+    Returns (n_rows, column(field) -> sequence | None)
+    for row sequences and column arrays alike.
+    """
+    if isinstance(txs, pd.DataFrame):
+        return len(txs), lambda field: (
+            txs[field].to_numpy() if field in txs.columns else None
+        )
+
+    if isinstance(txs, Mapping):
+        lengths = {len(v) for v in txs.values()}
+        if len(lengths) > 1:
+            raise ValueError("Column arrays must all have the same length")
+        n_rows = lengths.pop() if lengths else 0
+        return n_rows, txs.get
+
+    getters = [_field_getter(tx) for tx in txs]
+    return len(getters), lambda field: [get(field) for get in getters]
+
+
+class FeatureEncoder:
+    """
+    Compiled LightGBM feature contract.
+
+    - Built ONCE from features_lgbm.joblib
+    - Raw numeric fields map straight to a column index
+    - Categorical fields map "<field>_<value>" to its one-hot slot,
+      exactly like pd.get_dummies + name sanitization at training time
+    - Unknown / dropped (drop_first) categories stay 0.0
+    """
+
+    def __init__(self, feature_columns):
+        self.feature_columns = list(feature_columns)
+        self.n_features = len(self.feature_columns)
+        self.column_index = {
+            name: i for i, name in enumerate(self.feature_columns)
+        }
+
+        # numeric fields survive get_dummies under their own name;
+        # every other raw field was one-hot encoded
+        self.numeric_slots = [
+            (field, self.column_index[field])
+            for field in RAW_FEATURES
+            if field in self.column_index
+        ]
+        self.categorical_fields = [
+            field for field in RAW_FEATURES
+            if field not in self.column_index
+        ]
+
+        # field -> {sanitized one-hot name -> column index}
+        self.onehot_slots = {
+            field: {
+                name: idx
+                for name, idx in self.column_index.items()
+                if name.startswith(f"{field}_")
+            }
+            for field in self.categorical_fields
+        }
+
+    def onehot_index(self, field: str, value):
+        """
+        Column index of the one-hot slot for field=value, or None.
+        """
+        if value is None:
+            return None
+        if isinstance(value, float) and math.isnan(value):
+            return None
+
+        name = sanitize_feature_name(f"{field}_{value}")
+        return self.onehot_slots[field].get(name)
+
+    def encode(self, tx, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Encode one transaction into a (1, n_features) float32 row.
+        Pass `out` (length n_features, float32) to reuse a buffer.
+        """
+        if out is None:
+            out = np.zeros((1, self.n_features), dtype=np.float32)
+        else:
+            out.fill(0.0)
+
+        row = out.reshape(-1)
+        get = _field_getter(tx)
+
+        for field, idx in self.numeric_slots:
+            row[idx] = _to_float(get(field))
+
+        for field in self.categorical_fields:
+            idx = self.onehot_index(field, get(field))
+            if idx is not None:
+                row[idx] = 1.0
+
+        return out
+
+    def encode_batch(self, txs, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Encode N transactions into one contiguous (N, n_features)
+        float32 matrix, one column at a time.
+
+        Accepts:
+        - a sequence of ORM rows / Rows / dicts / RowMappings
+        - column arrays: {field: array-like} or a DataFrame
+        """
+        n_rows, column = _column_reader(txs)
+
+        if out is None:
+            out = np.zeros((n_rows, self.n_features), dtype=np.float32)
+        else:
+            out.fill(0.0)
+
+        if n_rows == 0:
+            return out
+
+        for field, idx in self.numeric_slots:
+            values = column(field)
+            if values is not None:
+                out[:, idx] = _to_float_array(values)
+
+        for field in self.categorical_fields:
+            values = column(field)
+            if values is None:
+                continue
+
+            # one slot lookup per distinct value, then a single scatter
+            slots = {}
+            for v in values:
+                if v not in slots:
+                    idx = self.onehot_index(field, v)
+                    slots[v] = -1 if idx is None else idx
+
+            cols = np.fromiter(
+                (slots[v] for v in values), dtype=np.int64, count=n_rows
+            )
+            hit = cols >= 0
+            out[np.nonzero(hit)[0], cols[hit]] = 1.0
+
+        return out
+
+    def to_frame(self, X: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(X, columns=self.feature_columns, copy=False)
+
+
+_encoder = None
+
+
+def get_feature_encoder() -> FeatureEncoder:
+    """
+    Process-wide encoder (artifact read once).
+    """
+    global _encoder
+    if _encoder is None:
+        _encoder = FeatureEncoder(_load_feature_columns())
+    return _encoder
 
 
 def build_features(tx):
-    feature_columns = _load_feature_columns()
-
-    row = {
-        "TransactionAmt": tx.TransactionAmt,
-        "ProductCD": tx.ProductCD,
-        "card1": tx.card1,
-        "addr1": tx.addr1,
-        "C1": tx.C1,
-        "C2": tx.C2,
-        "D1": tx.D1,
-        "DeviceType": tx.DeviceType,
-        "DeviceInfo": tx.DeviceInfo,
-    }
-
-    for i in range(1, 39):
-        key = f"id_{i:02d}"
-        row[key] = getattr(tx, key)
-
-    df = pd.DataFrame([row])
-
-    df.columns = df.columns.str.replace(
-        r"[^A-Za-z0-9_]", "_", regex=True
-    )
-
-    X = df.reindex(columns=feature_columns, fill_value=0)
-    X = X.apply(pd.to_numeric, errors="coerce")
-    X = X.replace([np.inf, -np.inf], np.nan).fillna(0.0)
-    X = X.astype("float32")
-
-    return X
+    encoder = get_feature_encoder()
+    return encoder.to_frame(encoder.encode(tx))
+
+
+def build_feature_matrix(txs) -> np.ndarray:
+    """
+    Batch entry point: (N, n_features) float32 matrix
+    for a chunk of transactions (see FeatureEncoder.encode_batch).
+    """
+    return get_feature_encoder().encode_batch(txs)
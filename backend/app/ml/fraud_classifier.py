@@ -1,5 +1,6 @@
 from pathlib import Path
 import os
+import threading
 import joblib
 import numpy as np
 import warnings
@@ -14,15 +15,27 @@ class FraudClassifier:
     """
     Lazy-loading Fraud Classifier.
     - No ML artifacts touched at import time
-    - Model + SHAP loaded only when predict/explain is called
+    - Model + explainer loaded only when predict/explain is called
+    - Explanations via LightGBM pred_contrib (shap optional)
+    - Probabilities via PREDICTOR_BACKEND (native / numpy / treelite)
     """
 
-    def __init__(self):
+    def __init__(self, model_path: Path | None = None):
         self.model = None
+        self.predictor = None
         self.explainer = None
+        self.encoder = None
+
+        # load bookkeeping (ModelRegistry.describe)
+        self.load_info = {}
+        self._load_lock = threading.Lock()
+
+        # first-k-iteration predictors (cascade screen), built on demand
+        self._truncated = {}
+        self._truncated_lock = threading.Lock()
 
         ml_dir = Path(__file__).resolve().parent
-        self.model_path = ml_dir / os.getenv(
+        self.model_path = Path(model_path) if model_path else ml_dir / os.getenv(
             "MODEL_PATH",
             "ieee/artifacts/lightgbm_model.joblib",
         )
@@ -31,40 +44,134 @@ class FraudClassifier:
         if self.model is not None:
             return
 
-        if not self.model_path.exists():
-            raise RuntimeError(
-                f"Model artifact missing at {self.model_path}. "
-                "ML inference is disabled."
-            )
-
-        # LAZY imports (CRITICAL)
-        import shap
-        from app.ml.features import build_features
-
-        self._build_features = build_features
-        self.model = joblib.load(self.model_path)
-        self.explainer = shap.TreeExplainer(self.model)
+        with self._load_lock:
+            # another thread may have loaded it while we waited
+            if self.model is not None:
+                return
+
+            if not self.model_path.exists():
+                raise RuntimeError(
+                    f"Model artifact missing at {self.model_path}. "
+                    "ML inference is disabled."
+                )
+
+            # LAZY imports (CRITICAL)
+            from app.ml.artifacts import record_load
+            from app.ml.features import get_feature_encoder
+            from app.ml.explainers import create_explainer
+            from app.ml.predictors import create_predictor
+
+            info = {}
+            with record_load(self.model_path, info):
+                encoder = get_feature_encoder()
+                model = joblib.load(self.model_path)
+                predictor = create_predictor(model)
+                explainer = create_explainer(model)
+
+            import lightgbm
+
+            info.update({
+                "library": f"lightgbm {lightgbm.__version__}",
+                "num_trees": model.num_trees(),
+                "num_features": model.num_feature(),
+                "predictor": predictor.name,
+                "explainer": explainer.name,
+            })
+
+            # publish model LAST: it is the "loaded" flag
+            self.encoder = encoder
+            self.predictor = predictor
+            self.explainer = explainer
+            self.load_info = info
+            self.model = model
 
     def predict(self, tx) -> float:
         self._load_model()
 
-        X = self._build_features(tx)
-        prob = float(self.model.predict(X)[0])
+        X = self.encoder.encode(tx)
+        prob = float(self.predictor.predict(X)[0])
         return float(np.clip(prob, 0.0, 1.0))
 
+    def predict_batch(self, txs) -> np.ndarray:
+        """
+        One predictor call over the whole chunk.
+        Returns float64 probabilities, same values as predict().
+        """
+        return self.predict_matrix(self.build_matrix(txs))
+
+    def build_matrix(self, txs) -> np.ndarray:
+        self._load_model()
+        return self.encoder.encode_batch(txs)
+
+    def predict_matrix(self, X: np.ndarray, num_iteration: int | None = None) -> np.ndarray:
+        """
+        num_iteration=k: prediction of the first k boosting
+        iterations only (same backend, same values as
+        Booster.predict(X, num_iteration=k)).
+        """
+        self._load_model()
+
+        if len(X) == 0:
+            return np.empty(0, dtype=np.float64)
+
+        # Booster.predict default: best_iteration if set, else every tree
+        iterations = self.model.best_iteration or self.model.current_iteration()
+
+        predictor = self.predictor
+        if num_iteration is not None and num_iteration < iterations:
+            predictor = self._truncated_predictor(num_iteration)
+
+        probs = predictor.predict(X)
+        return np.clip(probs, 0.0, 1.0)
+
+    def _truncated_predictor(self, num_iteration: int):
+        predictor = self._truncated.get(num_iteration)
+        if predictor is not None:
+            return predictor
+
+        with self._truncated_lock:
+            predictor = self._truncated.get(num_iteration)
+            if predictor is None:
+                import lightgbm as lgb
+                from app.ml.predictors import create_predictor
+
+                # a Booster holding only the first k trees: every
+                # backend (numpy dump / treelite build) handles it as is
+                booster = lgb.Booster(
+                    model_str=self.model.model_to_string(num_iteration=num_iteration)
+                )
+                predictor = create_predictor(booster)
+                self._truncated[num_iteration] = predictor
+        return predictor
+
     def explain(self, tx, top_k: int = 10):
         self._load_model()
 
-        X = self._build_features(tx)
-        shap_raw = self.explainer.shap_values(X)
+        X = self.encoder.encode(tx)
+        return self.explain_matrix(X, top_k=top_k)[0]
+
+    def explain_batch(self, txs, top_k: int = 10):
+        return self.explain_matrix(self.build_matrix(txs), top_k=top_k)
 
-        if isinstance(shap_raw, list):
-            shap_vals = shap_raw[-1][0]
-        else:
-            shap_vals = shap_raw[0]
+    def explain_matrix(self, X: np.ndarray, top_k: int = 10):
+        """
+        Top-k SHAP contributions for every row of X.
+        """
+        self._load_model()
+
+        if len(X) == 0:
+            return []
+
+        shap_vals = self.explainer.shap_values(X)
+
+        return [
+            self._top_contributions(row, top_k)
+            for row in shap_vals
+        ]
 
+    def _top_contributions(self, shap_vals, top_k: int):
         shap_pairs = sorted(
-            zip(X.columns.tolist(), shap_vals),
+            zip(self.encoder.feature_columns, shap_vals),
             key=lambda x: abs(x[1]),
             reverse=True,
         )
@@ -0,0 +1,84 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from app.ml.features import (
+    RAW_FEATURES,
+    get_feature_encoder,
+)
+
+
+# Paths
+BASE_DIR = Path(__file__).resolve().parents[3]   # backend/
+DATA_DIR = BASE_DIR / "app" / "data" / "ieee"
+
+TX_PATH = DATA_DIR / "train_transaction.csv"
+ID_PATH = DATA_DIR / "train_identity.csv"
+
+
+# Config
+SAMPLE_SIZE = 5000
+
+
+def training_encoding(df: pd.DataFrame, feature_columns) -> np.ndarray:
+    """
+    Exactly the train_lightgbm.py encoding, aligned to the
+    feature contract (drop_first categories are not in the
+    contract, so drop_first=False + reindex is equivalent).
+    """
+    X = pd.get_dummies(df[RAW_FEATURES])
+    X.columns = X.columns.str.replace(r"[^A-Za-z0-9_]", "_", regex=True)
+    X = X.loc[:, ~X.columns.duplicated()]
+    X = X.reindex(columns=feature_columns, fill_value=0)
+    return X.astype("float32").to_numpy()
+
+
+def main():
+    encoder = get_feature_encoder()
+
+    # Load & merge (same rows the model was trained on)
+    tx = pd.read_csv(TX_PATH)
+    identity = pd.read_csv(ID_PATH)
+
+    df = tx.merge(identity, on="TransactionID", how="left")
+    df = df[RAW_FEATURES].dropna()
+    df = df.sample(min(SAMPLE_SIZE, len(df)), random_state=42)
+
+    expected = training_encoding(df, encoder.feature_columns)
+
+    mismatched_rows = 0
+    mismatched_cols = set()
+
+    for i, record in enumerate(df.to_dict(orient="records")):
+        row = encoder.encode(record)[0]
+        diff = np.nonzero(row != expected[i])[0]
+
+        if len(diff):
+            mismatched_rows += 1
+            mismatched_cols.update(encoder.feature_columns[j] for j in diff)
+
+    numeric_idx = {i for _, i in encoder.numeric_slots}
+    onehot_idx = [
+        i for i in range(encoder.n_features) if i not in numeric_idx
+    ]
+    onehot_hits = int((expected[:, onehot_idx] != 0).sum())
+
+    print("\n========== FEATURE ENCODER PARITY ==========\n")
+    print(f"Rows checked        : {len(df)}")
+    print(f"Contract width      : {encoder.n_features}")
+    print(f"Numeric slots       : {len(encoder.numeric_slots)}")
+    print(f"Categorical fields  : {len(encoder.categorical_fields)}")
+    print(f"Active one-hot slots: {onehot_hits}")
+    print(f"Mismatched rows     : {mismatched_rows}")
+
+    if mismatched_cols:
+        print("\nMismatched columns:")
+        for name in sorted(mismatched_cols):
+            print(f"  - {name}")
+        raise SystemExit(1)
+
+    print("\n✅ FeatureEncoder matches training-time get_dummies encoding.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import time
+import numpy as np
+
+from app.ml.pipeline import RiskPipeline
+from app.ml.offline.bench_data import load_sample_rows
+
+
+# Config
+N_ROWS = 4096
+BATCH_SIZES = [1, 25, 256, 4096]
+
+
+def check_parity(pipeline, rows):
+    """
+    score_batch must be bit-identical to the per-row stage calls.
+    """
+    batch = pipeline.score_batch(rows)
+
+    for i, tx in enumerate(rows):
+        fraud_prob = pipeline.fraud_model.predict(tx)
+        anomaly_score = pipeline.anomaly_scorer.score(tx)
+        decision = pipeline.decision_engine.decide(fraud_prob, anomaly_score)
+
+        assert fraud_prob == batch["fraud_prob"][i]
+        assert anomaly_score == batch["anomaly_score"][i]
+        assert decision["decision"] == batch["decision"][i]
+        assert decision["severity"] == batch["severity"][i]
+        assert decision["reasons"] == batch["reasons"][i]
+
+        if decision["decision"] in ("REVIEW", "BLOCK"):
+            assert pipeline.fraud_model.explain(tx) == batch["shap_values"][i]
+
+
+def throughput(fn, rows, batch_size):
+    start = time.perf_counter()
+    for i in range(0, len(rows), batch_size):
+        fn(rows[i : i + batch_size])
+    return len(rows) / (time.perf_counter() - start)
+
+
+def main():
+    pipeline = RiskPipeline()
+    rows = load_sample_rows(N_ROWS)
+
+    # warm lazy loads before timing
+    pipeline.score_batch(rows[:8])
+
+    check_parity(pipeline, rows[:500])
+    print("\n✅ score_batch is bit-identical to per-row scoring on 500 rows")
+
+    single_tps = throughput(
+        lambda chunk: [pipeline.score(tx) for tx in chunk], rows, 1
+    )
+
+    flagged = np.isin(
+        pipeline.score_batch(rows)["decision"], ("REVIEW", "BLOCK")
+    ).mean()
+
+    print("\n========== BATCH SCORING THROUGHPUT ==========\n")
+    print(f"Rows          : {len(rows)}")
+    print(f"Flagged (SHAP): {flagged:.2%}")
+    print(f"score() loop  : {single_tps:10.0f} tx/s\n")
+    print("Batch size | score_batch tx/s | Speed-up")
+    print("-------------------------------------------")
+
+    for batch_size in BATCH_SIZES:
+        tps = throughput(pipeline.score_batch, rows, batch_size)
+        print(f"{batch_size:10d} | {tps:16.0f} | {tps / single_tps:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
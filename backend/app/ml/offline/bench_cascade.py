@@ -0,0 +1,136 @@
+import argparse
+import time
+import numpy as np
+
+from app.ml.cascade import SCORED_BY_SCREEN, Cascade
+from app.ml.decision_engine import DecisionEngine
+from app.ml.offline.bench_data import load_validation_rows
+from app.ml.pipeline import RiskPipeline
+
+
+# Cascade scoring: recall loss vs throughput gain
+#   python -m app.ml.offline.bench_cascade [--iterations 5 10 20 40]
+#
+# IEEE validation split (app/ml/ieee/train_lightgbm.py), synthetic rows
+# when the train CSVs are not present (no labels -> no label recall).
+#
+# Cut-offs are swept as quantiles of the stage-1 score (target share
+# of traffic ALLOWed by the screen): truncated-k probabilities sit near
+# the boosted prior, so fixed values mean different things per k.
+# Cut-offs above REVIEW_TH are skipped (the screen may only ALLOW).
+#
+# flag recall  : rows the full pipeline flags (>= REVIEW_TH) that the
+#                cascade still flags
+# label recall : isFraud rows flagged, cascade vs full pipeline
+
+
+# Config
+SCREEN_TARGETS = [0.5, 0.7, 0.8, 0.9]
+BATCH_SIZE = 1000
+SINGLE_ROW_CALLS = 300
+
+
+def run_columns(pipeline, rows):
+    """
+    Full batch scored in BATCH_SIZE chunks -> (fraud_prob, scored_by, rows/s).
+    """
+    ctxs = [
+        pipeline.build_context(rows[i : i + BATCH_SIZE])
+        for i in range(0, len(rows), BATCH_SIZE)
+    ]
+    pipeline.run_local(ctxs[0])
+
+    probs, scored_by = [], []
+    started = time.perf_counter()
+    for ctx in ctxs:
+        columns = pipeline.run_local(ctx)
+        probs.append(columns["fraud_prob"])
+        scored_by += columns["scored_by"]
+    elapsed = time.perf_counter() - started
+
+    return np.concatenate(probs), np.asarray(scored_by), len(rows) / elapsed
+
+
+def single_row_p50_ms(pipeline, rows) -> float:
+    ctxs = [pipeline.build_context([tx]) for tx in rows[:SINGLE_ROW_CALLS]]
+    pipeline.run_local(ctxs[0])
+
+    samples = []
+    for ctx in ctxs:
+        t0 = time.perf_counter()
+        pipeline.run_local(ctx)
+        samples.append(time.perf_counter() - t0)
+    return float(np.percentile(samples, 50)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, nargs="+", default=[5, 10, 20, 40])
+    parser.add_argument("--targets", type=float, nargs="+", default=SCREEN_TARGETS)
+    parser.add_argument("--rows", type=int, default=None)
+    args = parser.parse_args()
+
+    rows, labels = load_validation_rows(args.rows)
+    source = "IEEE validation split" if labels is not None else "synthetic rows, no labels"
+    review_th = DecisionEngine.REVIEW_TH
+
+    full = RiskPipeline()
+    model = full.fraud_model
+    X = model.build_matrix(rows)
+
+    ref_probs, _, ref_rps = run_columns(full, rows)
+    ref_p50 = single_row_p50_ms(full, rows)
+    ref_flags = ref_probs >= review_th
+    ref_label_recall = (
+        float(np.mean(ref_flags[labels == 1])) if labels is not None else None
+    )
+
+    print(f"\n========== CASCADE (rows={len(rows)}, {source}) ==========\n")
+    line = (
+        f"full pipeline: {ref_rps:,.0f} rows/s (batch {BATCH_SIZE}), "
+        f"single row p50 {ref_p50:.2f} ms, flagged {int(ref_flags.sum())}"
+    )
+    if ref_label_recall is not None:
+        line += f", label recall {ref_label_recall:.4f}"
+    print(line + "\n")
+
+    header = (
+        "   k | target | allow_below | screened | flags lost | flag recall"
+        + (" | label recall" if labels is not None else "")
+        + " |   rows/s | speedup | 1-row p50"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for k in args.iterations:
+        stage1 = model.predict_matrix(X, num_iteration=k)
+
+        for target in args.targets:
+            allow_below = float(np.quantile(stage1, target))
+            if not 0.0 < allow_below <= review_th:
+                print(f"{k:4d} | {target:6.0%} | {allow_below:11.4f} | skipped (> REVIEW_TH)")
+                continue
+
+            pipeline = RiskPipeline(cascade=Cascade(k, allow_below))
+            probs, scored_by, rps = run_columns(pipeline, rows)
+            p50 = single_row_p50_ms(pipeline, rows)
+
+            flags = probs >= review_th
+            lost = int(np.sum(ref_flags & ~flags))
+            flag_recall = (
+                float(np.sum(ref_flags & flags) / ref_flags.sum())
+                if ref_flags.any() else 1.0
+            )
+
+            line = (
+                f"{k:4d} | {target:6.0%} | {allow_below:11.4f} | "
+                f"{np.mean(scored_by == SCORED_BY_SCREEN):8.1%} | {lost:10d} | {flag_recall:11.4f}"
+            )
+            if labels is not None:
+                line += f" | {float(np.mean(flags[labels == 1])):12.4f}"
+            line += f" | {rps:8,.0f} | {rps / ref_rps:6.2f}x | {p50:6.2f} ms"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
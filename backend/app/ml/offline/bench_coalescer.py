@@ -0,0 +1,125 @@
+import argparse
+import threading
+import time
+import numpy as np
+
+from app.ml.pipeline import RiskPipeline, iter_score_rows
+from app.ml.offline.bench_data import load_sample_rows
+from app.services.scoring_coalescer import (
+    COALESCE_MAX_BATCH,
+    COALESCE_MAX_WAIT_MS,
+    ScoringCoalescer,
+)
+
+
+# Micro-batching vs one pipeline pass per request
+#   python -m app.ml.offline.bench_coalescer --max-wait-ms 2 --max-batch 64
+#
+# Synthetic closed-loop load: C client threads, each sending
+# single-transaction requests back to back.
+
+
+CONCURRENCY = [1, 4, 16, 64]
+REQUESTS_PER_CLIENT = 200
+
+
+def check_parity(pipeline, coalescer, rows):
+    """
+    Coalesced results must match scoring each request alone.
+    """
+    futures = [coalescer.submit([tx]) for tx in rows]
+
+    for tx, future in zip(rows, futures):
+        alone = pipeline.score(tx)
+        coalesced = next(iter_score_rows(future.result()["columns"]))
+
+        assert alone["fraud_prob"] == coalesced["fraud_prob"]
+        assert alone["anomaly_score"] == coalesced["anomaly_score"]
+        assert alone["decision"] == coalesced["decision"]
+        assert alone["shap_values"] == coalesced["shap_values"]
+
+
+def run_load(score_one, rows, clients: int, per_client: int) -> dict:
+    latencies = [[] for _ in range(clients)]
+    barrier = threading.Barrier(clients + 1)
+
+    def client(k):
+        barrier.wait()
+        for i in range(per_client):
+            tx = rows[(k * per_client + i) % len(rows)]
+            t0 = time.perf_counter()
+            score_one(tx)
+            latencies[k].append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=client, args=(k,)) for k in range(clients)]
+    for t in threads:
+        t.start()
+
+    barrier.wait()
+    started = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    samples = np.concatenate([np.asarray(l) for l in latencies])
+    return {
+        "p50_ms": round(float(np.percentile(samples, 50)) * 1000, 2),
+        "p99_ms": round(float(np.percentile(samples, 99)) * 1000, 2),
+        "tx_per_second": round(len(samples) / elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-wait-ms", type=float, default=COALESCE_MAX_WAIT_MS)
+    parser.add_argument("--max-batch", type=int, default=COALESCE_MAX_BATCH)
+    parser.add_argument("--requests", type=int, default=REQUESTS_PER_CLIENT)
+    args = parser.parse_args()
+
+    pipeline = RiskPipeline()
+    rows = load_sample_rows(4096)
+
+    # warm lazy loads before timing
+    pipeline.score_batch(rows[:8])
+
+    coalescer = ScoringCoalescer(
+        pipeline, max_wait_ms=args.max_wait_ms, max_batch=args.max_batch
+    )
+    coalescer.start()
+
+    check_parity(pipeline, coalescer, rows[:300])
+    print("\n✅ coalesced results match per-request scoring on 300 rows")
+
+    unbatched = lambda tx: pipeline.score_batch([tx])
+    coalesced = lambda tx: coalescer.score([tx])
+
+    print(
+        f"\n========== MICRO-BATCHING "
+        f"(max_wait={args.max_wait_ms} ms, max_batch={args.max_batch}) "
+        f"==========\n"
+    )
+    print("Clients | Path       |  p50 ms |  p99 ms |   tx/s | mean batch")
+    print("------------------------------------------------------------------")
+
+    for clients in CONCURRENCY:
+        for name, score_one in (("unbatched", unbatched), ("coalesced", coalesced)):
+            before = dict(coalescer.stats)
+            result = run_load(score_one, rows, clients, args.requests)
+
+            batches = coalescer.stats["batches"] - before["batches"]
+            mean_batch = (
+                (coalescer.stats["transactions"] - before["transactions"]) / batches
+                if batches else 1.0
+            )
+
+            print(
+                f"{clients:7d} | {name:<10} | {result['p50_ms']:7.2f} | "
+                f"{result['p99_ms']:7.2f} | {result['tx_per_second']:6d} | "
+                f"{mean_batch:10.1f}"
+            )
+
+    coalescer.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from app.ml.features import RAW_FEATURES, get_feature_encoder
+from app.ml.anomaly.isolation_forest import IF_FEATURES
+
+
+# Paths
+BASE_DIR = Path(__file__).resolve().parents[3]   # backend/
+DATA_DIR = BASE_DIR / "app" / "data" / "ieee"
+
+TX_PATH = DATA_DIR / "test_transaction.csv"
+ID_PATH = DATA_DIR / "test_identity.csv"
+
+TRAIN_TX_PATH = DATA_DIR / "train_transaction.csv"
+TRAIN_ID_PATH = DATA_DIR / "train_identity.csv"
+
+FIELDS = list(dict.fromkeys(["TransactionID"] + RAW_FEATURES + IF_FEATURES))
+
+# training rows / label of app/ml/ieee/train_lightgbm.py (a script: not importable)
+TRAIN_FEATURES = [
+    "TransactionAmt", "ProductCD", "card1", "addr1", "C1", "C2", "D1",
+    "DeviceType", "DeviceInfo",
+] + [f"id_{i:02d}" for i in range(1, 39)]
+TARGET = "isFraud"
+
+
+def load_sample_rows(n: int, seed: int = 42) -> list[dict]:
+    """
+    Benchmark input: first n IEEE test rows if the CSVs are present,
+    otherwise synthetic rows drawn from the feature contract.
+    """
+    if TX_PATH.exists() and ID_PATH.exists():
+        return _load_ieee_rows(n)
+    return _synthetic_rows(n, seed)
+
+
+def _load_ieee_rows(n: int) -> list[dict]:
+    tx = pd.read_csv(TX_PATH, nrows=n)
+    identity = pd.read_csv(ID_PATH)
+
+    # test_identity.csv uses "id-01" style names
+    identity.columns = identity.columns.str.replace("-", "_")
+
+    df = tx.merge(identity, on="TransactionID", how="left")
+    df = df.reindex(columns=FIELDS)
+    df = df.astype(object).where(df.notna(), None)
+
+    return df.to_dict(orient="records")
+
+
+def load_validation_rows(n: int | None = None, seed: int = 42):
+    """
+    IEEE validation split of app/ml/ieee/train_lightgbm.py
+    (rows complete on its features, 20% stratified, random_state=42)
+    as raw rows + isFraud labels.
+
+    Without the train CSVs: synthetic rows, labels None.
+    """
+    if not (TRAIN_TX_PATH.exists() and TRAIN_ID_PATH.exists()):
+        return _synthetic_rows(n or 20_000, seed), None
+
+    from sklearn.model_selection import train_test_split
+
+    tx = pd.read_csv(TRAIN_TX_PATH)
+    identity = pd.read_csv(TRAIN_ID_PATH)
+    df = tx.merge(identity, on="TransactionID", how="left")
+    df = df.dropna(subset=TRAIN_FEATURES + [TARGET])
+
+    # same sizes + labels + seed as training -> same validation rows
+    _, val = train_test_split(
+        df, test_size=0.2, stratify=df[TARGET], random_state=42
+    )
+    if n is not None:
+        val = val.iloc[:n]
+
+    labels = val[TARGET].to_numpy(dtype=np.int8)
+    val = val.reindex(columns=FIELDS)
+    val = val.astype(object).where(val.notna(), None)
+
+    return val.to_dict(orient="records"), labels
+
+
+def _synthetic_rows(n: int, seed: int) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    encoder = get_feature_encoder()
+
+    categories = {
+        field: [
+            name[len(field) + 1:]
+            for name in encoder.onehot_slots[field]
+        ] + [None]
+        for field in encoder.categorical_fields
+    }
+
+    rows = []
+    for i in range(n):
+        row = {"TransactionID": str(3_663_549 + i)}
+
+        for field in FIELDS[1:]:
+            if field in categories:
+                options = categories[field]
+                row[field] = options[rng.integers(len(options))]
+            elif field != "TransactionAmt" and rng.random() < 0.1:
+                row[field] = None
+            else:
+                row[field] = float(rng.lognormal(3.0, 1.5))
+
+        rows.append(row)
+
+    return rows
@@ -0,0 +1,131 @@
+import json
+import resource
+import subprocess
+import sys
+import time
+import numpy as np
+
+from app.ml.offline.bench_data import load_sample_rows
+
+
+# Config
+N_ROWS = 1000
+TOP_K = 10
+TOLERANCE = 1e-6
+MODULE = "app.ml.offline.bench_explainers"
+
+
+def cold_start(backend: str) -> dict:
+    """
+    Runs in a FRESH interpreter: load model + explainer,
+    explain one row, report wall time and peak RSS.
+    """
+    import os
+
+    os.environ["EXPLAINER_BACKEND"] = backend
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    from app.ml.fraud_classifier import FraudClassifier
+
+    model = FraudClassifier()
+    model.explain(load_sample_rows(1)[0])
+    elapsed = time.perf_counter() - start
+
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "cold_start_s": elapsed,
+        "peak_rss_mb": rss_after / 1024,
+        "rss_delta_mb": (rss_after - rss_before) / 1024,
+        "shap_imported": "shap" in sys.modules,
+    }
+
+
+def run_cold_start(backend: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", MODULE, "--cold", backend],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def check_parity(native, shap_backend, X):
+    """
+    Same contributions (to TOLERANCE) and same top-k output.
+    """
+    a = native.explainer.shap_values(X)
+    b = shap_backend.explainer.shap_values(X)
+    max_abs = float(np.max(np.abs(a - b)))
+
+    top_a = native.explain_matrix(X, top_k=TOP_K)
+    top_b = shap_backend.explain_matrix(X, top_k=TOP_K)
+
+    same_features = sum(
+        {c["feature"] for c in ra} == {c["feature"] for c in rb}
+        for ra, rb in zip(top_a, top_b)
+    )
+
+    return max_abs, same_features
+
+
+def per_row_latency_ms(model, X):
+    start = time.perf_counter()
+    for i in range(len(X)):
+        model.explain_matrix(X[i : i + 1], top_k=TOP_K)
+    return (time.perf_counter() - start) / len(X) * 1000
+
+
+def batch_latency_ms(model, X):
+    start = time.perf_counter()
+    model.explain_matrix(X, top_k=TOP_K)
+    return (time.perf_counter() - start) / len(X) * 1000
+
+
+def main():
+    from app.ml.fraud_classifier import FraudClassifier
+    from app.ml.explainers import create_explainer
+
+    native = FraudClassifier()
+    X = native.build_matrix(load_sample_rows(N_ROWS))
+
+    shap_backend = FraudClassifier()
+    shap_backend._load_model()
+    shap_backend.explainer = create_explainer(shap_backend.model, "shap")
+
+    max_abs, same_features = check_parity(native, shap_backend, X)
+
+    print("\n========== EXPLAINER PARITY ==========\n")
+    print(f"Rows                    : {len(X)}")
+    print(f"Max |native - shap|     : {max_abs:.2e}")
+    print(f"Identical top-{TOP_K} sets  : {same_features}/{len(X)}")
+
+    if max_abs > TOLERANCE:
+        raise SystemExit("❌ pred_contrib does not match shap.TreeExplainer")
+
+    print("\n========== LATENCY (ms / row) ==========\n")
+    print("Backend | single-row | batch")
+    print("----------------------------------")
+    for name, model in (("native", native), ("shap", shap_backend)):
+        single = per_row_latency_ms(model, X[:200])
+        batch = batch_latency_ms(model, X)
+        print(f"{name:7s} | {single:10.3f} | {batch:.4f}")
+
+    print("\n========== COLD START (fresh process) ==========\n")
+    print("Backend | load+explain s | peak RSS MB | shap imported")
+    print("------------------------------------------------------")
+    for name in ("native", "shap"):
+        stats = run_cold_start(name)
+        print(
+            f"{name:7s} | {stats['cold_start_s']:14.2f} | "
+            f"{stats['peak_rss_mb']:11.0f} | {stats['shap_imported']}"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--cold":
+        print(json.dumps(cold_start(sys.argv[2])))
+    else:
+        main()
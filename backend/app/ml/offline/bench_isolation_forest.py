@@ -0,0 +1,117 @@
+import time
+import numpy as np
+
+from app.ml.anomaly.evaluators import create_anomaly_evaluator
+from app.ml.anomaly.isolation_forest import AnomalyScorer, build_anomaly_matrix
+from app.ml.offline.bench_data import load_sample_rows
+
+
+# Compiled Isolation Forest evaluator vs sklearn score_samples
+#   python -m app.ml.offline.bench_isolation_forest
+
+
+# Config
+N_ROWS = 5000
+TOLERANCE = 1e-9
+BATCH_SIZES = [1, 16, 64, 256, 1000]
+N_SINGLE = 500
+SEED = 42
+
+
+def parity_inputs(X: np.ndarray) -> dict:
+    """
+    Real rows, the same rows with 20% NaN (missing_go_to_left),
+    and far out-of-range values.
+    """
+    rng = np.random.default_rng(SEED)
+
+    with_nan = X.copy()
+    with_nan[rng.random(X.shape) < 0.2] = np.nan
+
+    return {
+        "sample rows": X,
+        "20% NaN": with_nan,
+        "random x1e4": rng.normal(size=X.shape) * 1e4,
+    }
+
+
+def latency_ms(fn, X, batch_size, n_calls):
+    samples = []
+    for i in range(n_calls):
+        start = (i * batch_size) % (len(X) - batch_size + 1)
+        t0 = time.perf_counter()
+        fn(X[start : start + batch_size])
+        samples.append(time.perf_counter() - t0)
+    return (
+        float(np.percentile(samples, 50)) * 1000,
+        float(np.percentile(samples, 99)) * 1000,
+    )
+
+
+def main():
+    rows = load_sample_rows(N_ROWS)
+    X = build_anomaly_matrix(rows)
+
+    scorer = AnomalyScorer()
+    scorer._load_model()
+    sklearn_eval = create_anomaly_evaluator(scorer.model, "sklearn")
+
+    started = time.perf_counter()
+    compiled = create_anomaly_evaluator(scorer.model, "compiled")
+    compile_s = time.perf_counter() - started
+
+    print("\n========== COMPILED FOREST ==========\n")
+    print(f"Trees / nodes           : {len(compiled.roots)} / {compiled.n_nodes}")
+    print(f"Max depth               : {compiled.max_depth}")
+    print(f"Array size              : {compiled.nbytes / 1024:.0f} KB")
+    print(f"Compile time            : {compile_s * 1000:.1f} ms")
+
+    print("\n========== PARITY vs sklearn score_samples ==========\n")
+    failed = False
+    for name, inputs in parity_inputs(X).items():
+        diff = np.abs(compiled.score_samples(inputs) - sklearn_eval.score_samples(inputs))
+        max_abs = float(diff.max())
+        failed |= max_abs > TOLERANCE
+        print(f"{name:<12} : max |diff| = {max_abs:.2e}  ({len(inputs)} rows)")
+
+    # online single-row path (dict -> matrix -> score)
+    scorer.evaluator = sklearn_eval
+    expected = [scorer.score(tx) for tx in rows[:N_SINGLE]]
+    scorer.evaluator = compiled
+    actual = [scorer.score(tx) for tx in rows[:N_SINGLE]]
+    max_abs = float(np.max(np.abs(np.subtract(expected, actual))))
+    failed |= max_abs > TOLERANCE
+    print(f"{'score(tx)':<12} : max |diff| = {max_abs:.2e}  ({N_SINGLE} rows)")
+
+    if failed:
+        raise SystemExit(f"❌ Compiled evaluator differs from sklearn by > {TOLERANCE}")
+
+    print("\n========== LATENCY (ms per call) ==========\n")
+    print("batch | sklearn p50 / p99   | compiled p50 / p99  | speedup (p50)")
+    print("------------------------------------------------------------------")
+    for batch_size in BATCH_SIZES:
+        n_calls = max(20, 2000 // batch_size)
+        base = latency_ms(sklearn_eval.score_samples, X, batch_size, n_calls)
+        fast = latency_ms(compiled.score_samples, X, batch_size, n_calls)
+        print(
+            f"{batch_size:5d} | {base[0]:8.3f} / {base[1]:8.3f} | "
+            f"{fast[0]:8.3f} / {fast[1]:8.3f} | {base[0] / fast[0]:6.1f}x"
+        )
+
+    single = {}
+    for evaluator in (sklearn_eval, compiled):
+        scorer.evaluator = evaluator
+        started = time.perf_counter()
+        for tx in rows[:N_SINGLE]:
+            scorer.score(tx)
+        single[evaluator.name] = (time.perf_counter() - started) / N_SINGLE * 1000
+
+    print(
+        f"\nAnomalyScorer.score(tx) : sklearn {single['sklearn']:.3f} ms, "
+        f"compiled {single['compiled']:.3f} ms "
+        f"({single['sklearn'] / single['compiled']:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
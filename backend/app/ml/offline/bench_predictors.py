@@ -0,0 +1,116 @@
+import argparse
+import time
+import numpy as np
+
+from app.ml.fraud_classifier import FraudClassifier
+from app.ml.offline.bench_data import load_validation_rows
+from app.ml.predictors import PREDICTOR_BACKENDS, create_predictor
+
+
+# LightGBM inference backends: parity + latency / throughput
+#   python -m app.ml.offline.bench_predictors [--backends native numpy treelite]
+#
+# Parity on the IEEE validation split (app/ml/ieee/train_lightgbm.py),
+# synthetic rows when the train CSVs are not present.
+
+
+# Config
+TOLERANCE = 1e-9
+BATCH_SIZES = [1, 16, 64, 256, 1000]
+THROUGHPUT_ROWS = 20_000
+REVIEW_TH = 0.4
+
+
+def latency_ms(predictor, X, batch_size, n_calls):
+    samples = []
+    for i in range(n_calls):
+        start = (i * batch_size) % (len(X) - batch_size + 1)
+        batch = X[start : start + batch_size]
+        t0 = time.perf_counter()
+        predictor.predict(batch)
+        samples.append(time.perf_counter() - t0)
+    return (
+        float(np.percentile(samples, 50)) * 1000,
+        float(np.percentile(samples, 99)) * 1000,
+    )
+
+
+def throughput(predictor, X) -> float:
+    started = time.perf_counter()
+    predictor.predict(X)
+    return len(X) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", default=list(PREDICTOR_BACKENDS))
+    parser.add_argument("--rows", type=int, default=None)
+    args = parser.parse_args()
+
+    rows, labels = load_validation_rows(args.rows)
+    source = "IEEE validation split" if labels is not None else "synthetic rows"
+
+    model = FraudClassifier()
+    X = model.build_matrix(rows)
+
+    predictors = {}
+    setup = {}
+    for name in args.backends:
+        started = time.perf_counter()
+        predictors[name] = create_predictor(model.model, name)
+        setup[name] = time.perf_counter() - started
+
+    reference = predictors["native"].predict(X) if "native" in predictors else None
+
+    print("\n========== PARITY vs Booster.predict ==========\n")
+    print(f"Rows : {len(X)} ({source})")
+    failed = False
+    for name, predictor in predictors.items():
+        probs = predictor.predict(X)
+        if reference is None:
+            break
+        max_abs = float(np.max(np.abs(probs - reference)))
+        same_flags = int(np.sum((probs >= REVIEW_TH) == (reference >= REVIEW_TH)))
+        failed |= max_abs > TOLERANCE
+
+        line = (
+            f"{name:<9} max |diff| = {max_abs:.2e}  "
+            f"bit-identical={np.array_equal(probs, reference)}  "
+            f"same side of {REVIEW_TH}: {same_flags}/{len(X)}"
+        )
+        if labels is not None:
+            from sklearn.metrics import roc_auc_score
+            line += f"  AUC={roc_auc_score(labels, probs):.6f}"
+        print(line)
+
+    if failed:
+        raise SystemExit(f"❌ Backend differs from Booster.predict by > {TOLERANCE}")
+
+    print("\n========== SETUP ==========\n")
+    for name, predictor in predictors.items():
+        extra = ""
+        if getattr(predictor, "compile_seconds", None) is not None:
+            extra = f" (compiled {predictor.libpath.name} in {predictor.compile_seconds:.1f} s)"
+        elif hasattr(predictor, "libpath"):
+            extra = f" (cached {predictor.libpath.name})"
+        print(f"{name:<9} {setup[name] * 1000:8.1f} ms{extra}")
+
+    print("\n========== LATENCY (ms per call, p50 / p99) ==========\n")
+    print("batch | " + " | ".join(f"{name:>17}" for name in predictors))
+    for batch_size in BATCH_SIZES:
+        n_calls = max(50, 5000 // batch_size)
+        cells = []
+        for predictor in predictors.values():
+            p50, p99 = latency_ms(predictor, X, batch_size, n_calls)
+            cells.append(f"{p50:7.3f} / {p99:7.3f}")
+        print(f"{batch_size:5d} | " + " | ".join(cells))
+
+    X_big = np.resize(X, (THROUGHPUT_ROWS, X.shape[1]))
+    print(f"\n========== THROUGHPUT ({THROUGHPUT_ROWS:,} rows, one call) ==========\n")
+    for name, predictor in predictors.items():
+        predictor.predict(X_big[:1000])
+        print(f"{name:<9} {throughput(predictor, X_big):12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import json
+import time
+import numpy as np
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import scoring
+from app.ml.offline.bench_data import load_sample_rows
+
+
+# POST /api/scoring/batch latency (in-process, no network)
+#   python -m app.ml.offline.bench_scoring_api
+
+# Published targets (p99, ms, single process, warm model)
+LATENCY_TARGETS_MS = {
+    1: 20.0,
+    500: 150.0,
+}
+
+N_REQUESTS = {1: 500, 500: 60}
+
+
+def percentile_ms(samples, q) -> float:
+    return round(float(np.percentile(samples, q)) * 1000, 2)
+
+
+def measure(client, rows, batch_size, n_requests, content_type="json"):
+    samples = []
+
+    for i in range(n_requests):
+        start = (i * batch_size) % (len(rows) - batch_size + 1)
+        batch = rows[start : start + batch_size]
+
+        if content_type == "ndjson":
+            body = "\n".join(json.dumps(tx) for tx in batch)
+            headers = {"content-type": "application/x-ndjson"}
+        else:
+            body = json.dumps(batch)
+            headers = {"content-type": "application/json"}
+
+        t0 = time.perf_counter()
+        response = client.post("/api/scoring/batch", content=body, headers=headers)
+        samples.append(time.perf_counter() - t0)
+
+        assert response.status_code == 200, response.text
+        assert response.json()["count"] == len(batch)
+
+    return {
+        "batch_size": batch_size,
+        "format": content_type,
+        "p50_ms": percentile_ms(samples, 50),
+        "p95_ms": percentile_ms(samples, 95),
+        "p99_ms": percentile_ms(samples, 99),
+        "tx_per_second": round(batch_size * n_requests / sum(samples)),
+    }
+
+
+def main():
+    app = FastAPI()
+    app.include_router(scoring.router, prefix="/api/scoring")
+    client = TestClient(app)
+
+    rows = load_sample_rows(5000)
+
+    # warm lazy loads before timing
+    client.post("/api/scoring/batch", json=rows[:8])
+
+    print("\n========== /api/scoring/batch LATENCY ==========\n")
+
+    failed = False
+    for batch_size, n_requests in N_REQUESTS.items():
+        for content_type in ("json", "ndjson"):
+            result = measure(client, rows, batch_size, n_requests, content_type)
+            target = LATENCY_TARGETS_MS[batch_size]
+            ok = result["p99_ms"] <= target
+            failed |= not ok
+
+            print(
+                f"batch={batch_size:<4} {content_type:<6} "
+                f"p50={result['p50_ms']:>7} ms  "
+                f"p95={result['p95_ms']:>7} ms  "
+                f"p99={result['p99_ms']:>7} ms  "
+                f"({result['tx_per_second']:,} tx/s)  "
+                f"target p99 <= {target} ms {'✅' if ok else '❌'}"
+            )
+
+    if failed:
+        print("\n❌ Latency target missed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+
+from app.ml.thread_budget import available_cpus
+
+
+# Thread budget: online p99 under mixed load
+#   python -m app.ml.offline.bench_thread_budget --cores 8 --processes 2 --backfill 1
+#
+# Processes sharing the host, all running for --seconds:
+#   - --processes API workers, --online threads each: single-row
+#     RiskPipeline.run_local (predict + SHAP) every --interval-ms
+#     (open loop, like API traffic)
+#   - --backfill batch workers: 2000-row batches back to back
+#
+# library default : THREAD_BUDGET=0, OMP/BLAS pools sized to --cores
+#                   (what an unconfigured --cores host gives each process)
+# budget          : 1 thread per online call, real cores / processes
+#                   per batch (auto-derived)
+#
+# --cores above the real core count = libraries sizing their pools to
+# more cores than the process really gets (e.g. host cores vs the
+# container's CPUs, or N workers each assuming the whole host).
+
+
+MODULE = "app.ml.offline.bench_thread_budget"
+BACKFILL_ROWS = 2000
+
+
+def child(role: str, seconds: float, online: int, interval_ms: float) -> dict:
+    from app.ml.thread_budget import get_thread_budget
+
+    # before numpy / lightgbm are loaded, as in app.main
+    get_thread_budget().set_env()
+
+    from app.ml.offline.bench_data import load_sample_rows
+    from app.ml.pipeline import RiskPipeline
+
+    get_thread_budget().enforce()
+
+    rows = load_sample_rows(BACKFILL_ROWS)
+    pipeline = RiskPipeline()
+    batch_ctx = pipeline.build_context(rows)
+    single_ctxs = [pipeline.build_context([tx]) for tx in rows[:200]]
+
+    # warm every path before timing
+    pipeline.run_local(batch_ctx)
+    pipeline.run_local(single_ctxs[0])
+
+    stop = threading.Event()
+    latencies = [[] for _ in range(online)]
+    backfill_rows = [0]
+
+    def online_loop(i):
+        n = 0
+        next_at = time.perf_counter()
+        while not stop.is_set():
+            ctx = single_ctxs[n % len(single_ctxs)]
+            t0 = time.perf_counter()
+            pipeline.run_local(ctx)
+            latencies[i].append(time.perf_counter() - t0)
+            n += 1
+
+            next_at += interval_ms / 1000
+            time.sleep(max(0.0, next_at - time.perf_counter()))
+
+    def backfill_loop():
+        while not stop.is_set():
+            pipeline.run_local(batch_ctx)
+            backfill_rows[0] += len(batch_ctx)
+
+    if role == "online":
+        threads = [threading.Thread(target=online_loop, args=(i,)) for i in range(online)]
+    else:
+        threads = [threading.Thread(target=backfill_loop)]
+
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "latencies": [x for samples in latencies for x in samples],
+        "backfill_rows": backfill_rows[0],
+        "budget": {
+            k: v for k, v in get_thread_budget().to_dict().items() if k != "pools"
+        },
+    }
+
+
+def run_mode(mode: str, args) -> dict:
+    env = dict(os.environ)
+    if mode == "library default":
+        env["THREAD_BUDGET"] = "0"
+        for name in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+            env[name] = str(args.cores)
+    else:
+        # auto: REAL cores / processes (set_env sizes the library pools)
+        env["THREAD_BUDGET"] = "1"
+        env["THREAD_BUDGET_PROCESSES"] = str(args.processes + args.backfill)
+        env.pop("THREAD_BUDGET_BATCH", None)
+
+    def launch(role):
+        command = [
+            sys.executable, "-m", MODULE, "--child", role,
+            "--seconds", str(args.seconds),
+            "--online", str(args.online),
+            "--interval-ms", str(args.interval_ms),
+        ]
+        return subprocess.Popen(command, env=env, stdout=subprocess.PIPE, text=True)
+
+    procs = [launch("online") for _ in range(args.processes)]
+    procs += [launch("backfill") for _ in range(args.backfill)]
+
+    results = []
+    for proc in procs:
+        out = proc.communicate()[0].strip()
+        if proc.returncode != 0 or not out:
+            raise RuntimeError(f"{mode}: benchmark child exited with {proc.returncode}")
+        results.append(json.loads(out.splitlines()[-1]))
+
+    latencies = np.array([x for r in results for x in r["latencies"]])
+    return {
+        "mode": mode,
+        "budget": results[0]["budget"],
+        "online_calls": len(latencies),
+        "p50_ms": float(np.percentile(latencies, 50)) * 1000,
+        "p99_ms": float(np.percentile(latencies, 99)) * 1000,
+        "backfill_rows_s": sum(r["backfill_rows"] for r in results) / args.seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cores", type=int, default=available_cpus())
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--online", type=int, default=4)
+    parser.add_argument("--backfill", type=int, default=1)
+    parser.add_argument("--interval-ms", type=float, default=10)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--child", choices=["online", "backfill"])
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child, args.seconds, args.online, args.interval_ms)))
+        return
+
+    print(
+        f"\n========== THREAD BUDGET (cores={args.cores}, real={available_cpus()}, "
+        f"processes={args.processes}, online={args.online} x every "
+        f"{args.interval_ms:g} ms, backfill={args.backfill}) ==========\n"
+    )
+    print("mode            | online p50 | online p99 | online calls | backfill rows/s")
+    print("---------------------------------------------------------------------------")
+    for mode in ("library default", "budget"):
+        r = run_mode(mode, args)
+        print(
+            f"{r['mode']:<15} | {r['p50_ms']:7.2f} ms | {r['p99_ms']:7.2f} ms | "
+            f"{r['online_calls']:12d} | {r['backfill_rows_s']:15,.0f}"
+        )
+        if r["mode"] == "budget":
+            print(f"\nbudget: {r['budget']}")
+
+
+if __name__ == "__main__":
+    main()
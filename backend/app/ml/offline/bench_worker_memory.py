@@ -0,0 +1,199 @@
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from app.ml.offline.bench_data import load_sample_rows
+
+
+# Per-worker memory of multi-worker serving
+#   python -m app.ml.offline.bench_worker_memory --workers 1 4 8
+#
+# uvicorn --workers N : every worker imports the app and loads the models
+#                       itself (N private copies)
+# gunicorn --preload  : models loaded once in the master, workers forked
+#                       from it (copy-on-write, see app/gunicorn_conf.py)
+#
+# Measured after warmup + scoring traffic on every worker, from
+# /proc/<pid>/smaps_rollup (Linux):
+#   RSS : resident pages, shared ones counted in full in every worker
+#   PSS : shared pages split between the processes that map them
+#   USS : private pages (what one more worker really costs)
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[3]
+PORT = 8765
+N_REQUESTS = 200
+BATCH_SIZE = 32
+
+
+def server_command(mode: str, workers: int) -> list[str]:
+    if mode == "uvicorn":
+        return [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(PORT),
+            "--workers", str(workers),
+            "--log-level", "warning",
+        ]
+    return [
+        sys.executable, "-m", "gunicorn", "app.main:app",
+        "-c", "python:app.gunicorn_conf",
+        "--bind", f"127.0.0.1:{PORT}",
+        "--workers", str(workers),
+        "--log-level", "warning",
+    ]
+
+
+def children(pid: int) -> list[int]:
+    found = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            found.append(int(entry))
+    return found
+
+
+def worker_pids(server_pid: int) -> list[int]:
+    """
+    Serving processes: children of the server that are not
+    multiprocessing helpers (uvicorn's spawn resource tracker).
+    """
+    pids = []
+    for pid in children(server_pid):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                cmdline = f.read().replace(b"\0", b" ").decode()
+        except OSError:
+            continue
+        if "resource_tracker" not in cmdline:
+            pids.append(pid)
+    return pids
+
+
+def memory_kb(pid: int) -> dict:
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": values["Rss"],
+        "pss": values["Pss"],
+        "uss": values["Private_Clean"] + values["Private_Dirty"],
+    }
+
+
+def request(method: str, path: str, body=None, timeout: float = 30):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(
+        f"http://127.0.0.1:{PORT}{path}",
+        data=data,
+        method=method,
+        headers={"content-type": "application/json"},
+    )
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return response.status, response.read()
+
+
+def wait_ready(workers: int, timeout: float = 300):
+    """
+    Keep polling until that many distinct worker pids have answered.
+    """
+    ready = set()
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            # WARMUP_MODE=blocking: a worker only answers once it is warm
+            _, body = request("GET", "/api/models/loaded", timeout=5)
+            ready.add(json.loads(body)["pid"])
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        if len(ready) >= workers:
+            return
+        time.sleep(0.2)
+    raise RuntimeError(f"only {len(ready)}/{workers} workers ready")
+
+
+def measure(mode: str, workers: int, rows) -> dict:
+    env = dict(os.environ, WARMUP_MODE="blocking", SCORING_POOL_WORKERS="0")
+    server = subprocess.Popen(
+        server_command(mode, workers),
+        cwd=BACKEND_DIR,
+        env=env,
+        start_new_session=True,
+    )
+    try:
+        wait_ready(workers)
+
+        for i in range(N_REQUESTS):
+            start = (i * BATCH_SIZE) % (len(rows) - BATCH_SIZE + 1)
+            status, _ = request(
+                "POST", "/api/scoring/batch", rows[start : start + BATCH_SIZE]
+            )
+            assert status == 200
+
+        # uvicorn --workers 1 serves from the server process itself
+        pids = worker_pids(server.pid) or [server.pid]
+        per_worker = [memory_kb(pid) for pid in pids]
+        master = memory_kb(server.pid) if server.pid not in pids else None
+    finally:
+        # graceful stop through the master, then nothing left behind
+        server.terminate()
+        server.wait(timeout=60)
+        try:
+            os.killpg(server.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def mean_mb(key):
+        return sum(m[key] for m in per_worker) / len(per_worker) / 1024
+
+    return {
+        "mode": mode,
+        "workers": len(per_worker),
+        "rss_mb": round(mean_mb("rss"), 1),
+        "pss_mb": round(mean_mb("pss"), 1),
+        "uss_mb": round(mean_mb("uss"), 1),
+        "total_pss_mb": round(
+            (sum(m["pss"] for m in per_worker) + (master["pss"] if master else 0))
+            / 1024, 1
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--modes", nargs="+", default=["uvicorn", "gunicorn"])
+    args = parser.parse_args()
+
+    rows = load_sample_rows(2000)
+
+    print("\n========== PER-WORKER MEMORY (mean per worker) ==========\n")
+    for workers in args.workers:
+        for mode in args.modes:
+            r = measure(mode, workers, rows)
+            print(
+                f"{r['mode']:<9} workers={r['workers']:<2} "
+                f"RSS={r['rss_mb']:>7} MB  "
+                f"PSS={r['pss_mb']:>7} MB  "
+                f"USS={r['uss_mb']:>7} MB  "
+                f"total PSS (incl. master)={r['total_pss_mb']:>7} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
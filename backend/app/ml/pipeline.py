@@ -1,34 +1,202 @@
-from app.ml.fraud_classifier import FraudClassifier
-from app.ml.decision_engine import DecisionEngine
-from app.ml.anomaly.isolation_forest import AnomalyScorer
+from concurrent.futures import Future
+
+import numpy as np
+
+from app.ml.anomaly.isolation_forest import build_anomaly_matrix
+from app.ml.cascade import SCORED_BY_FULL, SCORED_BY_SCREEN
+from app.ml.context import ScoringContext
+from app.ml.registry import get_model_registry
 
 
 class RiskPipeline:
-    def __init__(self):
-        self.fraud_model = FraudClassifier()
-        self.decision_engine = DecisionEngine()
-        self.anomaly_scorer = AnomalyScorer()
-
-    def score(self, tx):
-        fraud_prob = self.fraud_model.predict(tx)
-        anomaly_score = self.anomaly_scorer.score(tx)
-
-        decision = self.decision_engine.decide(
-            fraud_prob=fraud_prob,
-            anomaly_score=anomaly_score,
-        )
+    def __init__(self, executor=None, registry=None, cascade=None):
+        # shared, process-wide model instances (app/ml/registry.py)
+        self.registry = registry or get_model_registry()
+
+        # optional out-of-process backend (services/scoring_pool.py):
+        # build_context stays here, run() is shipped to worker processes
+        self.executor = executor
+
+        # optional first-stage screen (app/ml/cascade.py)
+        self.cascade = cascade
+
+    # live model set: re-read on every access (hot reload swaps it);
+    # a request pins ONE set in build_context (ctx.models)
+
+    @property
+    def fraud_model(self):
+        return self.registry.fraud_model
+
+    @property
+    def anomaly_scorer(self):
+        return self.registry.anomaly_scorer
+
+    @property
+    def decision_engine(self):
+        return self.registry.decision_engine
+
+    def build_context(self, txs) -> ScoringContext:
+        """
+        Encode ONCE for every stage (LightGBM + Isolation Forest inputs).
+        """
+        txs = list(txs)
+        models = self.registry.current
+        models.fraud_model._load_model()
+
+        ctx = ScoringContext(txs, X=None, X_anomaly=None)
+        ctx.models = models
+        ctx.cascade = self.cascade
+
+        with ctx.timed("encode"):
+            if len(txs) == 1:
+                ctx.X = models.fraud_model.encoder.encode(txs[0])
+            else:
+                ctx.X = models.fraud_model.encoder.encode_batch(txs)
+            ctx.X_anomaly = build_anomaly_matrix(txs)
+
+        return ctx
+
+    def run(self, ctx: ScoringContext, explain: bool = True):
+        """
+        All stages over a prepared context. Returns COLUMNS:
+        - fraud_prob / anomaly_score: float64 arrays
+        - decision / severity / reasons / shap_values /
+          explanation_status / model_version / scored_by: lists
+
+        explain=False defers SHAP: flagged transactions come back
+        with shap_values=None and explanation_status="pending".
+        """
+        if self.executor is not None:
+            return self.executor.run(ctx, explain=explain)
+        return self.run_local(ctx, explain=explain)
+
+    def submit(self, ctx: ScoringContext, explain: bool = True) -> Future:
+        """
+        Non-blocking run(): a Future resolving to the same columns
+        (asyncio callers: await asyncio.wrap_future(...)).
+        """
+        if self.executor is not None:
+            return self.executor.submit(ctx, explain=explain)
+
+        future = Future()
+        try:
+            future.set_result(self.run_local(ctx, explain=explain))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def run_local(self, ctx: ScoringContext, explain: bool = True):
+        """
+        run() in this process, on the set pinned by build_context.
+        """
+        if ctx.models is None:
+            ctx.models = self.registry.current
+        models = ctx.models
+
+        if ctx.cascade is not None:
+            self._run_cascade(ctx)
+        else:
+            with ctx.timed("predict"):
+                ctx.fraud_probs = models.fraud_model.predict_matrix(ctx.X)
+
+            with ctx.timed("anomaly"):
+                ctx.anomaly_scores = models.anomaly_scorer.score_matrix(ctx.X_anomaly)
+
+        with ctx.timed("decision"):
+            ctx.decisions = models.decision_engine.decide_batch(
+                fraud_probs=ctx.fraud_probs,
+                anomaly_scores=ctx.anomaly_scores,
+            )
 
         # SHAP only for analyst-visible decisions
-        if decision["decision"] in ("REVIEW", "BLOCK"):
-            shap_values = self.fraud_model.explain(tx)
+        shap_values = [[] for _ in range(len(ctx))]
+        statuses = ["not_required" for _ in range(len(ctx))]
+        flagged = np.flatnonzero(
+            np.isin(ctx.decisions["decision"], ("REVIEW", "BLOCK"))
+        )
+
+        if len(flagged) and explain:
+            with ctx.timed("explain"):
+                explanations = models.fraud_model.explain_matrix(ctx.X[flagged])
+            for i, explanation in zip(flagged, explanations):
+                shap_values[i] = explanation
+                statuses[i] = "ready"
         else:
-            shap_values = []
+            for i in flagged:
+                shap_values[i] = None
+                statuses[i] = "pending"
 
         return {
-            "fraud_prob": fraud_prob,
-            "anomaly_score": anomaly_score,
-            "decision": decision["decision"],
-            "severity": decision["severity"],
-            "reasons": decision.get("reasons", []),
+            "fraud_prob": ctx.fraud_probs,
+            "anomaly_score": ctx.anomaly_scores,
+            "decision": ctx.decisions["decision"],
+            "severity": ctx.decisions["severity"],
+            "reasons": ctx.decisions["reasons"],
             "shap_values": shap_values,
+            "explanation_status": statuses,
+            "model_version": [models.version] * len(ctx),
+            "scored_by": self._scored_by(ctx),
+        }
+
+    @staticmethod
+    def _run_cascade(ctx: ScoringContext):
+        """
+        Screen every row on the first k iterations; only rows at or
+        above allow_below get the full model. Screened rows keep prob_k
+        (< REVIEW_TH -> ALLOW, no SHAP). The Isolation Forest scores
+        every row.
+        """
+        models, cascade = ctx.models, ctx.cascade
+
+        with ctx.timed("screen"):
+            fraud_probs = models.fraud_model.predict_matrix(
+                ctx.X, num_iteration=cascade.iterations
+            )
+        full = np.flatnonzero(fraud_probs >= cascade.allow_below)
+
+        if len(full):
+            with ctx.timed("predict"):
+                fraud_probs[full] = models.fraud_model.predict_matrix(ctx.X[full])
+
+        with ctx.timed("anomaly"):
+            ctx.anomaly_scores = models.anomaly_scorer.score_matrix(ctx.X_anomaly)
+
+        ctx.fraud_probs = fraud_probs
+        ctx.screened = np.setdiff1d(np.arange(len(ctx)), full)
+
+    @staticmethod
+    def _scored_by(ctx: ScoringContext) -> list:
+        scored_by = [SCORED_BY_FULL] * len(ctx)
+        if ctx.screened is not None:
+            for i in ctx.screened:
+                scored_by[i] = SCORED_BY_SCREEN
+        return scored_by
+
+    def score(self, tx, explain: bool = True):
+        ctx = self.build_context([tx])
+        return next(iter_score_rows(self.run(ctx, explain=explain)))
+
+    def score_batch(self, txs, explain: bool = True):
+        """
+        Batched score(): one LightGBM predict, one Isolation Forest
+        pass and one SHAP call (flagged rows only) per chunk.
+        """
+        return self.run(self.build_context(txs), explain=explain)
+
+
+def iter_score_rows(columns):
+    """
+    score_batch() columns -> per-transaction dicts shaped like score().
+    """
+    for i in range(len(columns["decision"])):
+        yield {
+            "fraud_prob": float(columns["fraud_prob"][i]),
+            "anomaly_score": float(columns["anomaly_score"][i]),
+            "decision": columns["decision"][i],
+            "severity": columns["severity"][i],
+            "reasons": columns["reasons"][i],
+            "shap_values": columns["shap_values"][i],
+            "explanation_status": columns["explanation_status"][i],
+            "model_version": columns["model_version"][i],
+            "scored_by": columns["scored_by"][i],
         }
@@ -0,0 +1,274 @@
+import hashlib
+import logging
+import os
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.ml.thread_budget import get_thread_budget
+
+
+logger = logging.getLogger(__name__)
+
+
+# LightGBM inference backends: same probabilities, different engines.
+# PREDICTOR_BACKEND=native (default) | numpy | treelite
+#
+# Explanations always use the Booster (pred_contrib, see explainers.py).
+# Threads per call come from the thread budget (app/ml/thread_budget.py).
+
+
+class NativeBoosterPredictor:
+    """
+    Booster.predict (LightGBM C API, one call per matrix).
+    """
+
+    name = "native"
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        threads = get_thread_budget().threads_for(len(X))
+        kwargs = {} if threads is None else {"num_threads": threads}
+        return np.asarray(self.model.predict(X, **kwargs), dtype=np.float64)
+
+
+class NumpyTreePredictor:
+    """
+    Vectorized evaluator built from Booster.dump_model().
+
+    Per node, all trees concatenated (tree t starts at roots[t]):
+    - feature / threshold : go left if x <= threshold (float64)
+    - children            : [left, right] pairs, flat (node i -> 2i, 2i+1)
+    - missing_type        : LightGBM None / Zero / NaN handling
+    - default_right       : direction of missing values
+    - value               : leaf output (internal nodes: 0)
+
+    Leaves point to themselves, so max_depth steps land every
+    (row, tree) on its leaf. Leaf outputs are summed tree by tree
+    in LightGBM's order, then the binary sigmoid is applied.
+    """
+
+    name = "numpy"
+
+    MISSING_NONE, MISSING_ZERO, MISSING_NAN = 0, 1, 2
+    MISSING_TYPES = {"None": MISSING_NONE, "Zero": MISSING_ZERO, "NaN": MISSING_NAN}
+
+    # LightGBM kZeroThreshold
+    ZERO_THRESHOLD = 1e-35
+
+    # rows per step (bounds the (rows, n_trees) work arrays)
+    CHUNK_ROWS = 2048
+
+    def __init__(self, model):
+        dump = model.dump_model()
+
+        match = re.match(r"binary sigmoid:([0-9.eE+-]+)", dump["objective"])
+        if match is None or dump["num_tree_per_iteration"] != 1:
+            raise RuntimeError(
+                f"numpy backend supports binary models only, got '{dump['objective']}'"
+            )
+        self.sigmoid = float(match.group(1))
+
+        # Booster.predict default: best_iteration if set, else every tree
+        trees = dump["tree_info"]
+        if model.best_iteration > 0:
+            trees = trees[: model.best_iteration]
+
+        feature, threshold, children = [], [], []
+        missing_type, default_right, value = [], [], []
+        roots, depths = [], []
+
+        def add_node() -> int:
+            feature.append(0)
+            threshold.append(0.0)
+            children.extend([0, 0])
+            missing_type.append(self.MISSING_NONE)
+            default_right.append(False)
+            value.append(0.0)
+            return len(feature) - 1
+
+        for tree in trees:
+            root = add_node()
+            roots.append(root)
+            stack = [(tree["tree_structure"], root, 0)]
+
+            while stack:
+                node, idx, depth = stack.pop()
+
+                if "leaf_value" in node:
+                    children[2 * idx] = children[2 * idx + 1] = idx
+                    value[idx] = node["leaf_value"]
+                    depths.append(depth)
+                    continue
+
+                if node["decision_type"] != "<=":
+                    raise RuntimeError(
+                        "numpy backend does not support categorical splits"
+                    )
+
+                feature[idx] = node["split_feature"]
+                threshold[idx] = node["threshold"]
+                missing_type[idx] = self.MISSING_TYPES[node["missing_type"]]
+                default_right[idx] = not node["default_left"]
+
+                for side, child in enumerate((node["left_child"], node["right_child"])):
+                    child_idx = add_node()
+                    children[2 * idx + side] = child_idx
+                    stack.append((child, child_idx, depth + 1))
+
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.children = np.asarray(children, dtype=np.intp)
+        self.missing_type = np.asarray(missing_type, dtype=np.int8)
+        self.default_right = np.asarray(default_right, dtype=bool)
+        self.value = np.asarray(value, dtype=np.float64)
+
+        self.n_features = dump["max_feature_idx"] + 1
+        self.max_depth = max(depths)
+        # every split treats NaN as 0.0 and compares: no per-node branch
+        self.simple_missing = bool(np.all(self.missing_type == self.MISSING_NONE))
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected (n, {self.n_features}) input, got {X.shape}")
+
+        raw = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), self.CHUNK_ROWS):
+            stop = start + self.CHUNK_ROWS
+            raw[start:stop] = self._raw_scores(X[start:stop])
+
+        return 1.0 / (1.0 + np.exp(-self.sigmoid * raw))
+
+    def _raw_scores(self, X: np.ndarray) -> np.ndarray:
+        n_rows = len(X)
+        if self.simple_missing:
+            X = np.where(np.isnan(X), 0.0, X)
+
+        flat = X.ravel()
+        row_base = (np.arange(n_rows, dtype=np.intp) * self.n_features)[:, None]
+
+        node = np.broadcast_to(self.roots, (n_rows, len(self.roots)))
+        for _ in range(self.max_depth):
+            x = flat[row_base + self.feature[node]]
+
+            if self.simple_missing:
+                go_right = ~(x <= self.threshold[node])
+            else:
+                go_right = self._go_right(x, node)
+
+            node = self.children[2 * node + go_right]
+
+        # running sum tree by tree == LightGBM's accumulation order
+        return np.cumsum(self.value[node], axis=1)[:, -1]
+
+    def _go_right(self, x: np.ndarray, node: np.ndarray) -> np.ndarray:
+        """
+        LightGBM NumericalDecision for Zero / NaN missing types.
+        """
+        missing_type = self.missing_type[node]
+        is_nan = np.isnan(x)
+
+        x = np.where(is_nan & (missing_type != self.MISSING_NAN), 0.0, x)
+        use_default = (
+            (missing_type == self.MISSING_ZERO) & (np.abs(x) <= self.ZERO_THRESHOLD)
+        ) | ((missing_type == self.MISSING_NAN) & is_nan)
+
+        return np.where(use_default, self.default_right[node], ~(x <= self.threshold[node]))
+
+
+# compiled libraries, one per model (content hash)
+TREELITE_LIB_DIR = Path(
+    os.getenv("TREELITE_LIB_DIR", str(Path(__file__).resolve().parent / "ieee/artifacts/compiled"))
+)
+TREELITE_TOOLCHAIN = os.getenv("TREELITE_TOOLCHAIN", "gcc")
+
+
+class TreelitePredictor:
+    """
+    Ahead-of-time compiled model: treelite -> C -> shared library
+    (tl2cgen, local C compiler). Built once per model and cached
+    in TREELITE_LIB_DIR; later loads only dlopen() the library.
+    """
+
+    name = "treelite"
+
+    def __init__(self, model):
+        try:
+            import tl2cgen
+            import treelite
+        except ImportError as e:
+            raise RuntimeError(
+                "PREDICTOR_BACKEND=treelite needs the treelite and tl2cgen packages"
+            ) from e
+
+        self.tl2cgen = tl2cgen
+
+        # Booster.predict default: best_iteration (model_to_string does the same)
+        model_str = model.model_to_string()
+        digest = hashlib.sha256(model_str.encode()).hexdigest()[:16]
+        self.libpath = TREELITE_LIB_DIR / f"lightgbm_{digest}.so"
+        self.compile_seconds = None
+
+        if not self.libpath.exists():
+            TREELITE_LIB_DIR.mkdir(parents=True, exist_ok=True)
+            started = time.perf_counter()
+
+            # build under a temp name: concurrent loaders never dlopen a partial file
+            tmp = self.libpath.with_suffix(f".{os.getpid()}.tmp.so")
+            tl2cgen.export_lib(
+                treelite.frontend.from_lightgbm(model),
+                toolchain=TREELITE_TOOLCHAIN,
+                libpath=tmp,
+                params={"parallel_comp": os.cpu_count() or 1},
+            )
+            os.replace(tmp, self.libpath)
+
+            self.compile_seconds = time.perf_counter() - started
+            logger.info("Compiled %s in %.1fs", self.libpath.name, self.compile_seconds)
+
+        # one handle per thread count (nthread is fixed per Predictor)
+        self.predictors = {}
+
+    def _predictor(self, threads: int | None):
+        predictor = self.predictors.get(threads)
+        if predictor is None:
+            predictor = self.tl2cgen.Predictor(self.libpath, nthread=threads)
+            self.predictors[threads] = predictor
+        return predictor
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        predictor = self._predictor(get_thread_budget().threads_for(len(X)))
+        dmat = self.tl2cgen.DMatrix(np.asarray(X, dtype=np.float64), dtype="float64")
+        return np.asarray(predictor.predict(dmat), dtype=np.float64).reshape(-1)
+
+
+PREDICTOR_BACKENDS = {
+    NativeBoosterPredictor.name: NativeBoosterPredictor,
+    NumpyTreePredictor.name: NumpyTreePredictor,
+    TreelitePredictor.name: TreelitePredictor,
+}
+
+
+def create_predictor(model, backend: str | None = None):
+    """
+    PREDICTOR_BACKEND=native (default) | numpy | treelite
+    """
+    backend = backend or os.getenv("PREDICTOR_BACKEND", "native")
+
+    if backend not in PREDICTOR_BACKENDS:
+        raise RuntimeError(
+            f"Unknown PREDICTOR_BACKEND '{backend}'. "
+            f"Expected one of: {', '.join(PREDICTOR_BACKENDS)}"
+        )
+
+    return PREDICTOR_BACKENDS[backend](model)
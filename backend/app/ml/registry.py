@@ -0,0 +1,227 @@
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import joblib
+
+from app.ml.anomaly.isolation_forest import IF_FEATURES, AnomalyScorer
+from app.ml.artifacts import rss_bytes
+from app.ml.decision_engine import DecisionEngine
+from app.ml.features import ARTIFACT_DIR
+from app.ml.fraud_classifier import FraudClassifier
+
+
+# VERSIONED ARTIFACTS
+# <MODEL_VERSIONS_DIR>/<version>/
+#     lightgbm_model.joblib
+#     isolation_forest.joblib
+#     features_lgbm.joblib     (optional: must equal the live contract)
+#
+# "default" = MODEL_PATH / IF_MODEL_PATH (the flat artifacts dir)
+
+MODEL_VERSIONS_DIR = Path(
+    os.getenv("MODEL_VERSIONS_DIR", str(ARTIFACT_DIR / "versions"))
+)
+DEFAULT_VERSION = "default"
+MODEL_VERSION = os.getenv("MODEL_VERSION", DEFAULT_VERSION)
+
+FRAUD_MODEL_FILE = "lightgbm_model.joblib"
+ANOMALY_MODEL_FILE = "isolation_forest.joblib"
+FEATURES_FILE = "features_lgbm.joblib"
+
+_VERSION_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+
+def version_dir(version: str) -> Path:
+    if not _VERSION_RE.match(version):
+        raise ValueError(f"Invalid model version '{version}'")
+    return MODEL_VERSIONS_DIR / version
+
+
+def available_versions() -> list[str]:
+    versions = [DEFAULT_VERSION]
+    if MODEL_VERSIONS_DIR.is_dir():
+        versions += sorted(
+            p.name for p in MODEL_VERSIONS_DIR.iterdir()
+            if p.is_dir() and (p / FRAUD_MODEL_FILE).exists()
+        )
+    return versions
+
+
+class ModelSet:
+    """
+    One version of every artifact, loaded together.
+
+    Immutable once published: a swap replaces the whole set, so a
+    request that captured a set scores on it until it finishes.
+    """
+
+    def __init__(self, version: str = DEFAULT_VERSION):
+        self.version = version
+
+        if version == DEFAULT_VERSION:
+            self.fraud_model = FraudClassifier()
+            self.anomaly_scorer = AnomalyScorer()
+            self.features_path = None
+        else:
+            root = version_dir(version)
+            if not (root / FRAUD_MODEL_FILE).exists():
+                raise RuntimeError(f"Model version '{version}' not found at {root}")
+
+            self.fraud_model = FraudClassifier(root / FRAUD_MODEL_FILE)
+            self.anomaly_scorer = AnomalyScorer(root / ANOMALY_MODEL_FILE)
+            self.features_path = root / FEATURES_FILE
+
+        self.decision_engine = DecisionEngine()
+        self.activated_at = None
+
+    def load(self):
+        self.fraud_model._load_model()
+        self.anomaly_scorer._load_model()
+
+    def validate(self):
+        """
+        Feature-contract checks (raises RuntimeError):
+        - booster features == live encoder columns (same order)
+        - version's features_lgbm.joblib, if shipped, == live contract
+        - Isolation Forest input width == IF_FEATURES
+        """
+        self.load()
+
+        columns = list(self.fraud_model.encoder.feature_columns)
+        booster = self.fraud_model.model
+
+        if booster.num_feature() != len(columns):
+            raise RuntimeError(
+                f"LightGBM expects {booster.num_feature()} features, "
+                f"contract has {len(columns)}"
+            )
+        if list(booster.feature_name()) != columns:
+            raise RuntimeError("LightGBM feature names differ from the contract")
+
+        if self.features_path is not None and self.features_path.exists():
+            if list(joblib.load(self.features_path)) != columns:
+                raise RuntimeError(
+                    f"{self.features_path.name} differs from the live feature "
+                    f"contract (contract changes need a deploy)"
+                )
+
+        n_if = getattr(self.anomaly_scorer.model, "n_features_in_", None)
+        if n_if is not None and n_if != len(IF_FEATURES):
+            raise RuntimeError(
+                f"Isolation Forest expects {n_if} features, "
+                f"IF_FEATURES has {len(IF_FEATURES)}"
+            )
+
+    def describe(self) -> dict:
+        return {
+            "version": self.version,
+            "activated_at": self.activated_at,
+            "fraud_classifier": {
+                "loaded": self.fraud_model.model is not None,
+                **self.fraud_model.load_info,
+            },
+            "anomaly_scorer": {
+                "loaded": self.anomaly_scorer.model is not None,
+                **self.anomaly_scorer.load_info,
+            },
+            "decision_engine": {
+                "loaded": True,
+                "review_threshold": self.decision_engine.REVIEW_TH,
+                "soft_block_threshold": self.decision_engine.SOFT_BLOCK_TH,
+                "hard_block_threshold": self.decision_engine.HARD_BLOCK_TH,
+            },
+        }
+
+
+class ModelRegistry:
+    """
+    ONE loaded instance of each artifact per process.
+
+    - Every RiskPipeline (API, ingestion, workers) takes its
+      components from here instead of loading its own copies
+    - Loading is lazy and lock-protected (first caller loads,
+      concurrent callers wait); scoring only reads the models,
+      so the shared references are safe across threads
+    - swap() publishes a new ModelSet atomically (one reference
+      assignment); in-flight requests keep the set they captured
+    """
+
+    def __init__(self, version: str = MODEL_VERSION, models: ModelSet | None = None):
+        # models=...: registry pinned to an existing set
+        # (e.g. scoring a reload candidate before it goes live)
+        if models is None:
+            models = ModelSet(version)
+            models.activated_at = datetime.now(timezone.utc).isoformat()
+        self.current = models
+        self.history = []
+        self._swap_lock = threading.Lock()
+
+    # current set (read once per request: ScoringContext.models)
+
+    @property
+    def version(self) -> str:
+        return self.current.version
+
+    @property
+    def fraud_model(self) -> FraudClassifier:
+        return self.current.fraud_model
+
+    @property
+    def anomaly_scorer(self) -> AnomalyScorer:
+        return self.current.anomaly_scorer
+
+    @property
+    def decision_engine(self) -> DecisionEngine:
+        return self.current.decision_engine
+
+    def load(self):
+        """
+        Load every artifact now (startup warmup).
+        """
+        self.current.load()
+
+    def swap(self, candidate: ModelSet) -> ModelSet:
+        """
+        Publish a loaded + validated set. Returns the previous one.
+        """
+        with self._swap_lock:
+            previous = self.current
+            candidate.activated_at = datetime.now(timezone.utc).isoformat()
+            self.current = candidate
+            self.history.append({
+                "from": previous.version,
+                "to": candidate.version,
+                "at": candidate.activated_at,
+            })
+        return previous
+
+    def describe(self) -> dict:
+        """
+        Versions, load times and memory footprint of what is loaded.
+        """
+        current = self.current
+        return {
+            "pid": os.getpid(),
+            "rss_bytes": rss_bytes(),
+            "version": current.version,
+            "models": current.describe(),
+            "history": list(self.history),
+        }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Process-wide registry (nothing is loaded until first use).
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+    return _registry
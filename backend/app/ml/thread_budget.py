@@ -0,0 +1,196 @@
+import math
+import os
+import threading
+from pathlib import Path
+
+
+# THREAD BUDGET
+# LightGBM (OpenMP), NumPy / SciPy (BLAS) and sklearn (loky) each size
+# their pools to every core. With API threads, ingestion threads and
+# several worker processes on one host that oversubscribes the CPU and
+# single-row predicts pay for it in tail latency.
+#
+# Per process:
+#   online (<= THREAD_BUDGET_SMALL_BATCH rows) : THREAD_BUDGET_ONLINE (1)
+#   batch / backfill                           : THREAD_BUDGET_BATCH
+#                                                (auto: cores / processes)
+#
+# processes = THREAD_BUDGET_PROCESSES or WEB_CONCURRENCY (gunicorn workers)
+# THREAD_BUDGET=0 disables it (library defaults, every core per call).
+
+# library pool sizes read at import time (spawned / forked children)
+THREAD_ENV = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "LOKY_MAX_CPU_COUNT",
+)
+
+
+# gunicorn master (app/gunicorn_conf.py): pools stay at 1 thread until
+# post_fork applies the per-worker budget
+FORK_SAFE_ENV = "THREAD_BUDGET_FORK_SAFE"
+
+# CFS quota (docker --cpus, Kubernetes / Railway CPU limits)
+CGROUP_V2_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_V1_CPU_DIR = Path("/sys/fs/cgroup/cpu")
+
+
+def _cgroup_cpu_quota() -> int | None:
+    """
+    CPUs allowed by the CFS quota, rounded up (None = no quota).
+    """
+    try:
+        if CGROUP_V2_CPU_MAX.exists():
+            quota, period = CGROUP_V2_CPU_MAX.read_text().split()[:2]
+            if quota == "max":
+                return None
+            quota, period = int(quota), int(period)
+        else:
+            quota = int((CGROUP_V1_CPU_DIR / "cpu.cfs_quota_us").read_text())
+            period = int((CGROUP_V1_CPU_DIR / "cpu.cfs_period_us").read_text())
+    except (OSError, ValueError):
+        return None
+
+    if quota <= 0 or period <= 0:
+        return None
+    return max(1, math.ceil(quota / period))
+
+
+def available_cpus() -> int:
+    """
+    Cores this process may run on: CPU affinity (taskset / cpuset)
+    capped by the cgroup CFS quota on Linux.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+
+    quota = _cgroup_cpu_quota()
+    return min(cpus, quota) if quota is not None else cpus
+
+
+def _env_int(name: str) -> int | None:
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+class ThreadBudget:
+    """
+    How many threads one native call may use.
+
+    - threads_for(n_rows) : per call (LightGBM num_threads, treelite nthread)
+    - set_env()           : library defaults, before numpy / lightgbm load
+    - enforce()           : threadpoolctl limit on the pools already loaded
+    """
+
+    def __init__(
+        self,
+        processes: int | None = None,
+        online: int | None = None,
+        batch: int | None = None,
+        small_batch: int | None = None,
+        enabled: bool | None = None,
+    ):
+        self.cpus = available_cpus()
+        self.processes = max(1, (
+            processes
+            or _env_int("THREAD_BUDGET_PROCESSES")
+            or _env_int("WEB_CONCURRENCY")
+            or 1
+        ))
+        self.enabled = (
+            enabled if enabled is not None
+            else os.getenv("THREAD_BUDGET", "1") == "1"
+        )
+
+        self.batch = max(1, batch or _env_int("THREAD_BUDGET_BATCH") or self.cpus // self.processes)
+        self.online = min(self.batch, online or _env_int("THREAD_BUDGET_ONLINE") or 1)
+        self.small_batch = small_batch or _env_int("THREAD_BUDGET_SMALL_BATCH") or 64
+
+        self._limits = None
+
+    def threads_for(self, n_rows: int) -> int | None:
+        """
+        Threads for one call over n_rows (None = library default).
+        """
+        if not self.enabled:
+            return None
+        return self.online if n_rows <= self.small_batch else self.batch
+
+    def set_env(self):
+        # the gunicorn master keeps 1 thread (fork safety)
+        if self.enabled and os.getenv(FORK_SAFE_ENV) != "1":
+            for name in THREAD_ENV:
+                os.environ[name] = str(self.batch)
+
+    def enforce(self):
+        """
+        Cap BLAS / OpenMP pools loaded so far (BLAS: process-wide;
+        OpenMP: calling thread, hence the per-call num_threads).
+        """
+        if not self.enabled:
+            return
+
+        from threadpoolctl import threadpool_limits
+
+        self._limits = threadpool_limits(limits=self.batch)
+
+    def to_dict(self) -> dict:
+        from threadpoolctl import threadpool_info
+
+        return {
+            "enabled": self.enabled,
+            "cpus": self.cpus,
+            "processes": self.processes,
+            "online_threads": self.online,
+            "batch_threads": self.batch,
+            "small_batch_rows": self.small_batch,
+            "pools": [
+                {
+                    "api": info["internal_api"],
+                    "library": os.path.basename(info["filepath"]),
+                    "threads": info["num_threads"],
+                }
+                for info in threadpool_info()
+            ],
+        }
+
+
+def limit_process_threads(threads: int, override: bool = True):
+    """
+    Budget of a spawned child (scoring pool, ingestion workers):
+    call BEFORE the model / numpy imports.
+    """
+    for name in THREAD_ENV + ("THREAD_BUDGET_BATCH",):
+        if override:
+            os.environ[name] = str(threads)
+        else:
+            os.environ.setdefault(name, str(threads))
+
+    # one budget per child process, not per host
+    os.environ["THREAD_BUDGET_PROCESSES"] = "1"
+
+
+_budget = None
+_budget_lock = threading.Lock()
+
+
+def get_thread_budget() -> ThreadBudget:
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            _budget = ThreadBudget()
+    return _budget
+
+
+def configure_thread_budget(**kwargs) -> ThreadBudget:
+    """
+    Replace the process budget (e.g. gunicorn post_fork with the
+    real worker count).
+    """
+    global _budget
+    with _budget_lock:
+        _budget = ThreadBudget(**kwargs)
+    return _budget
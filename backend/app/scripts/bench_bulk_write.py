@@ -0,0 +1,216 @@
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pandas as pd
+from sqlalchemy import MetaData, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, registry
+
+from app.db.bulk import copy_rows, copy_upsert
+from app.db.database import engine
+from app.db.models.ieee_raw_transaction import IEEERawTransaction
+from app.db.models.transaction import Transaction
+
+
+# Bulk-write benchmark: current write paths vs app/db/bulk.py
+#   python -m app.scripts.bench_bulk_write --rows 100000
+#
+# Writes into scratch copies (bench_ieee_raw_transactions,
+# bench_transactions) that are dropped at the end.
+
+
+BATCH_SIZE = 5000
+
+RAW_COLUMNS = [
+    "id",
+    "TransactionID",
+    "TransactionAmt",
+    "ProductCD",
+    "card1",
+    "addr1",
+    "C1",
+    "C2",
+    "D1",
+    "DeviceType",
+    "DeviceInfo",
+    "ingested_at",
+]
+
+
+def scratch_table(model, metadata: MetaData):
+    table = model.__table__.to_metadata(
+        metadata, name=f"bench_{model.__tablename__}"
+    )
+    # index names are schema-global
+    for index in table.indexes:
+        if isinstance(index.name, str):
+            index.name = f"bench_{index.name}"
+    return table
+
+
+def batches(rows, size: int = BATCH_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+# write methods: (conn/session, table, rows) -> None
+
+def to_sql_multi(table, rows):
+    # scripts/ingest_ieee_csv_to_db.py before the COPY loader
+    pd.DataFrame(rows).to_sql(
+        table.name,
+        engine,
+        if_exists="append",
+        index=False,
+        chunksize=BATCH_SIZE,
+        method="multi",
+    )
+
+
+def orm_bulk_save_objects(table, rows):
+    # pattern of the legacy loaders (scripts/load_paysim_test_to_db.py)
+    class Row:
+        def __init__(self, **kwargs):
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    mapper_registry = registry()
+    mapper_registry.map_imperatively(Row, table)
+    try:
+        with Session(engine) as db:
+            for batch in batches(rows):
+                db.bulk_save_objects([Row(**row) for row in batch])
+                db.commit()
+    finally:
+        mapper_registry.dispose()
+
+
+def insert_values_on_conflict(table, rows):
+    # services/ingestion.py _insert_scored before the COPY path
+    with engine.begin() as conn:
+        for batch in batches(rows):
+            conn.execute(
+                pg_insert(table)
+                .values(batch)
+                .on_conflict_do_nothing(index_elements=["TransactionID"])
+                .returning(table.c.id)
+            ).all()
+
+
+def core_executemany(table, rows):
+    with engine.begin() as conn:
+        for batch in batches(rows):
+            conn.execute(insert(table), batch)
+
+
+def copy_method(upsert: bool, fmt: str):
+    def run(table, rows):
+        with engine.begin() as conn:
+            for batch in batches(rows):
+                if upsert:
+                    copy_upsert(
+                        conn,
+                        table,
+                        batch,
+                        conflict_columns=["TransactionID"],
+                        returning="id",
+                        format=fmt,
+                    )
+                else:
+                    copy_rows(conn, table, batch, format=fmt)
+
+    run.__name__ = f"copy_{'upsert' if upsert else 'rows'}_{fmt}"
+    return run
+
+
+RAW_METHODS = [
+    to_sql_multi,
+    orm_bulk_save_objects,
+    core_executemany,
+    insert_values_on_conflict,
+    copy_method(False, "text"),
+    copy_method(False, "binary"),
+    copy_method(True, "text"),
+    copy_method(True, "binary"),
+]
+
+SCORED_METHODS = [
+    insert_values_on_conflict,
+    copy_method(True, "text"),
+    copy_method(True, "binary"),
+]
+
+
+def raw_rows(n: int) -> list[dict]:
+    from app.ml.offline.bench_data import load_sample_rows
+
+    now = datetime.now(timezone.utc)
+    rows = []
+    for row in load_sample_rows(n):
+        record = {c: row.get(c) for c in RAW_COLUMNS}
+        record["id"] = uuid4()
+        record["TransactionID"] = str(row["TransactionID"])
+        record["ingested_at"] = now
+        rows.append(record)
+    return rows
+
+
+def scored_rows(rows: list[dict]) -> list[dict]:
+    from app.services.ingestion import _score_records, _transaction_record
+
+    now = datetime.now(timezone.utc)
+    records = [_transaction_record(row, now) for row in rows]
+    for batch in batches(records):
+        _score_records(batch)
+    return records
+
+
+def bench(table, methods, rows) -> list[dict]:
+    results = []
+    for method in methods:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f'TRUNCATE "{table.name}"')
+
+        started = time.perf_counter()
+        method(table, [dict(row) for row in rows])
+        elapsed = time.perf_counter() - started
+
+        with engine.connect() as conn:
+            written = conn.exec_driver_sql(
+                f'SELECT COUNT(*) FROM "{table.name}"'
+            ).scalar_one()
+
+        results.append({
+            "table": table.name,
+            "method": method.__name__,
+            "rows": written,
+            "seconds": round(elapsed, 2),
+            "rows_per_second": round(len(rows) / elapsed),
+        })
+        print(json.dumps(results[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    metadata = MetaData()
+    raw_table = scratch_table(IEEERawTransaction, metadata)
+    scored_table = scratch_table(Transaction, metadata)
+    metadata.create_all(engine)
+
+    try:
+        rows = raw_rows(args.rows)
+        bench(raw_table, RAW_METHODS, rows)
+        bench(scored_table, SCORED_METHODS, scored_rows(rows))
+    finally:
+        metadata.drop_all(engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,128 @@
-import pandas as pd
-from sqlalchemy import create_engine
-import os
-from uuid import uuid4
+import argparse
+import json
+import resource
+import time
 from datetime import datetime, timezone
+from uuid import uuid4
 
-# ---------- CONFIG ----------
-DATABASE_URL = os.environ["DATABASE_URL"]
-
-
-
-
-from pathlib import Path
-
-BASE_DIR = Path(__file__).resolve().parents[2]  
+from app.data.ieee_loader import READ_CHUNK_SIZE, iter_ieee_chunks
+from app.db.bulk import COPY_FORMATS, copy_upsert
+from app.db.database import engine
+from app.db.models.ieee_raw_transaction import IEEERawTransaction
+
+
+# Streaming IEEE test CSV -> Postgres (COPY via app/db/bulk.py, bounded memory)
+# Re-runs skip TransactionIDs that are already loaded.
+#
+#   python -m app.scripts.ingest_ieee_csv_to_db               # -> ieee_raw_transactions
+#   python -m app.scripts.ingest_ieee_csv_to_db --score       # -> transactions (scored inline)
+#   python -m app.scripts.ingest_ieee_csv_to_db --limit 10000
+
+
+# Minimal columns (match IEEERawTransaction)
+RAW_COLUMNS = [
+    "TransactionID",
+    "TransactionAmt",
+    "ProductCD",
+    "card1",
+    "addr1",
+    "C1",
+    "C2",
+    "D1",
+    "DeviceType",
+    "DeviceInfo",
+]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_raw_chunk(conn, df, format: str = "binary") -> int:
+    """
+    CSV chunk -> ieee_raw_transactions (system id + ingested_at added).
+    Rows whose TransactionID is already loaded are skipped.
+    """
+    df = df[RAW_COLUMNS].copy()
+    df.insert(0, "id", [uuid4() for _ in range(len(df))])
+    df["ingested_at"] = datetime.now(timezone.utc)
+    df["TransactionID"] = df["TransactionID"].astype(str)
 
-DATA_DIR = BASE_DIR / "app" / "data" / "ieee"
+    rows = df.astype(object).where(df.notna(), None).itertuples(
+        index=False, name=None
+    )
+    return copy_upsert(
+        conn,
+        IEEERawTransaction,
+        rows,
+        conflict_columns=["TransactionID"],
+        columns=list(df.columns),
+        format=format,
+    )
 
-TX_CSV = DATA_DIR / "test_transaction.csv"
-ID_CSV = DATA_DIR / "test_identity.csv"
 
+def load_scored_chunk(conn, df) -> int:
+    """
+    CSV chunk -> scored transactions (same stages as live ingestion).
+    Rows already in transactions are skipped.
+    """
+    from app.services.ingestion import _insert_scored, _prepare_chunk, _score_records
 
+    chunk = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+    records = _prepare_chunk(conn, chunk)
+    if not records:
+        return 0
 
-CHUNK_SIZE = 5000
-# ----------------------------
+    _score_records(records)
+    return len(_insert_scored(conn, records))
 
 
 def main():
-    engine = create_engine(DATABASE_URL)
-
-    print("Loading CSVs...")
-    tx = pd.read_csv(TX_CSV)
-    idn = pd.read_csv(ID_CSV)
-
-
-    print("Merging...")
-    df = tx.merge(idn, on="TransactionID", how="left")
-
-    print(f"Total rows: {len(df)}")
-
-    # Minimal columns (match your Transaction model)
-    keep_cols = [
-        "TransactionID",
-        "TransactionAmt",
-        "ProductCD",
-        "card1",
-        "addr1",
-        "C1",
-        "C2",
-        "D1",
-        "DeviceType",
-        "DeviceInfo",
-    ]
-
-    df = df[keep_cols]
-
-    # Add system fields
-    df["id"] = [uuid4() for _ in range(len(df))]
-    df["ingested_at"] = datetime.now(timezone.utc)
-
-    print("Inserting into DB...")
-    df.to_sql(
-        "ieee_raw_transactions", 
-        engine,
-        if_exists="append",
-        index=False,
-        chunksize=CHUNK_SIZE,
-        method="multi",
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunk-size", type=int, default=READ_CHUNK_SIZE)
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--format", choices=COPY_FORMATS, default="binary")
+    parser.add_argument(
+        "--score",
+        action="store_true",
+        help="score each chunk inline and write to transactions",
     )
-
-    print("DONE")
+    args = parser.parse_args()
+
+    columns = RAW_COLUMNS
+    if args.score:
+        from app.ml.features import RAW_FEATURES
+        from app.ml.anomaly.isolation_forest import IF_FEATURES
+
+        columns = list(dict.fromkeys(["TransactionID"] + RAW_FEATURES + IF_FEATURES))
+
+    print("Indexing identity + streaming transactions...")
+    started = time.perf_counter()
+    total = 0
+
+    for df in iter_ieee_chunks(args.chunk_size, columns=columns, limit=args.limit):
+        # ONE transaction per chunk (lookup + COPY on the same connection)
+        with engine.begin() as conn:
+            if args.score:
+                written = load_scored_chunk(conn, df)
+            else:
+                written = load_raw_chunk(conn, df, args.format)
+
+        total += written
+        elapsed = time.perf_counter() - started
+        print(
+            f"{total} rows | {total / elapsed:,.0f} rows/s | "
+            f"peak RSS {peak_rss_mb():,.0f} MB"
+        )
+
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        "rows_written": total,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(total / elapsed if elapsed > 0 else 0.0, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }))
 
 
 if __name__ == "__main__":
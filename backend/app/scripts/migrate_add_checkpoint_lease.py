@@ -0,0 +1,11 @@
+from app.db.database import engine
+from sqlalchemy import text
+
+with engine.begin() as conn:
+    conn.execute(text(
+        "ALTER TABLE ingestion_checkpoints "
+        "ADD COLUMN IF NOT EXISTS leased_by VARCHAR, "
+        "ADD COLUMN IF NOT EXISTS leased_until TIMESTAMPTZ;"
+    ))
+
+print("Checkpoint lease columns ensured")
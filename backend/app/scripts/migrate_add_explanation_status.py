@@ -0,0 +1,20 @@
+from app.db.database import engine
+from sqlalchemy import text
+
+with engine.begin() as conn:
+    conn.execute(text(
+        "ALTER TABLE transactions ADD COLUMN IF NOT EXISTS explanation_status VARCHAR;"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_transactions_explanation_pending "
+        "ON transactions (explanation_status) "
+        "WHERE explanation_status = 'pending';"
+    ))
+    # sweep order (ExplanationWorker.sweep: oldest pending first)
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_transactions_explanation_pending_age "
+        "ON transactions (ingested_at, id) "
+        "WHERE explanation_status = 'pending';"
+    ))
+
+print("Explanation status column ensured")
@@ -0,0 +1,13 @@
+from app.db.database import engine
+from app.db.models.ingestion_checkpoint import IngestionCheckpoint
+from sqlalchemy import text
+
+IngestionCheckpoint.__table__.create(engine, checkfirst=True)
+
+with engine.begin() as conn:
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_ieee_raw_ingested_at_id "
+        "ON ieee_raw_transactions (ingested_at, id);"
+    ))
+
+print("Ingestion checkpoint table + raw keyset index ensured")
@@ -0,0 +1,9 @@
+from app.db.database import engine
+from sqlalchemy import text
+
+with engine.begin() as conn:
+    conn.execute(text(
+        "ALTER TABLE transactions ADD COLUMN IF NOT EXISTS model_version VARCHAR;"
+    ))
+
+print("Model version column ensured")
@@ -0,0 +1,17 @@
+from app.db.database import engine
+from sqlalchemy import text
+
+with engine.begin() as conn:
+    conn.execute(text(
+        "ALTER TABLE ieee_raw_transactions "
+        "ADD COLUMN IF NOT EXISTS claimed_by VARCHAR, "
+        "ADD COLUMN IF NOT EXISTS claimed_until TIMESTAMPTZ, "
+        "ADD COLUMN IF NOT EXISTS processed_at TIMESTAMPTZ;"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_ieee_raw_unprocessed "
+        "ON ieee_raw_transactions (ingested_at, id) "
+        "WHERE processed_at IS NULL;"
+    ))
+
+print("Raw claim columns + unprocessed index ensured")
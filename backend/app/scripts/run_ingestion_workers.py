@@ -0,0 +1,38 @@
+import argparse
+import json
+
+from app.services.ingestion_workers import (
+    LEASE_SECONDS,
+    WORKER_BATCH_SIZE,
+    run_workers,
+)
+
+
+# Drain ieee_raw_transactions with N scoring processes
+#   python -m app.scripts.run_ingestion_workers --workers 4
+# Requires app/scripts/migrate_add_raw_claims.py
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=WORKER_BATCH_SIZE)
+    parser.add_argument("--lease-seconds", type=float, default=LEASE_SECONDS)
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="keep polling for new raw rows instead of exiting when idle",
+    )
+    args = parser.parse_args()
+
+    stats = run_workers(
+        args.workers,
+        batch_size=args.batch_size,
+        lease_seconds=args.lease_seconds,
+        exit_when_idle=not args.follow,
+    )
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
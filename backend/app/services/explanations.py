@@ -0,0 +1,295 @@
+import logging
+import os
+import queue
+import threading
+import time
+
+from app.db.deps import open_session
+from app.db.models.transaction import Transaction
+
+
+logger = logging.getLogger(__name__)
+
+
+# EXPLANATION MODE
+# inline   -> SHAP computed while scoring (decision waits for it)
+# deferred -> decision committed with shap_values pending,
+#             ExplanationWorker back-fills in batches
+EXPLANATION_MODE = os.getenv("EXPLANATION_MODE", "inline")
+
+EXPLAIN_BATCH_SIZE = int(os.getenv("EXPLAIN_BATCH_SIZE", "64"))
+EXPLAIN_QUEUE_SIZE = int(os.getenv("EXPLAIN_QUEUE_SIZE", "10000"))
+EXPLAIN_POLL_SECONDS = float(os.getenv("EXPLAIN_POLL_SECONDS", "5"))
+
+
+STATUS_PENDING = "pending"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+STATUS_NOT_REQUIRED = "not_required"
+# scored by a model version that is no longer live: SHAP from the
+# current model would not explain the stored fraud_prob
+STATUS_STALE = "stale"
+
+
+def explanations_deferred() -> bool:
+    return EXPLANATION_MODE == "deferred"
+
+
+def explanation_status(tx) -> str:
+    """
+    API-facing status (rows scored before the column existed
+    have no stored status).
+    """
+    if tx.explanation_status:
+        return tx.explanation_status
+    if tx.shap_values:
+        return STATUS_READY
+    return STATUS_NOT_REQUIRED
+
+
+class ExplanationWorker:
+    """
+    Background SHAP back-fill.
+
+    - submit() is non-blocking: a full queue never delays a decision
+    - Ids that do not fit (or were pending before a restart) are
+      picked up by a sweep of explanation_status = 'pending', oldest
+      first; it runs every poll_seconds and keeps going while it
+      returns full batches (started in the lifespan when deferred)
+    - Rows are claimed with FOR UPDATE SKIP LOCKED: several workers
+      (gunicorn, ingestion processes) never explain the same row
+    - One explain_matrix call + one bulk UPDATE per batch; if the batch
+      call fails, rows are explained one by one and only the failing
+      ones are marked 'failed' (never picked up again)
+    - fraud_model=None follows the registry's live model: rows scored
+      by another version (model_version) are marked 'stale' instead of
+      being explained by a model that did not score them
+    """
+
+    def __init__(
+        self,
+        fraud_model=None,
+        session_factory=open_session,
+        batch_size: int = EXPLAIN_BATCH_SIZE,
+        max_queue: int = EXPLAIN_QUEUE_SIZE,
+        poll_seconds: float = EXPLAIN_POLL_SECONDS,
+    ):
+        self.fraud_model = fraud_model
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+
+        self.queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.stats = {
+            "submitted": 0,
+            "overflowed": 0,
+            "explained": 0,
+            "failed": 0,
+            "stale": 0,
+            "batches": 0,
+        }
+
+    # lifecycle
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="explanation-worker",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # producer side
+
+    def submit(self, tx_ids) -> int:
+        """
+        Queue committed transaction ids for explanation.
+        Returns how many were queued (the rest wait for the sweep).
+        """
+        queued = 0
+
+        for tx_id in tx_ids:
+            try:
+                self.queue.put_nowait(tx_id)
+                queued += 1
+            except queue.Full:
+                self.stats["overflowed"] += 1
+
+        self.stats["submitted"] += queued
+        return queued
+
+    def backlog(self) -> int:
+        return self.queue.qsize()
+
+    # consumer side
+
+    def _run(self):
+        last_sweep = 0.0
+        sweeping = False
+
+        while not self._stop.is_set():
+            # submitted ids first; no waiting while a backlog is swept
+            batch = self._drain(timeout=0 if sweeping else self.poll_seconds)
+            if batch:
+                self._safely(self.process, batch)
+                continue
+
+            if sweeping or time.monotonic() - last_sweep >= self.poll_seconds:
+                claimed = self._safely(self.sweep)
+                last_sweep = time.monotonic()
+                sweeping = claimed >= self.batch_size
+
+    def _safely(self, step, *args) -> int:
+        try:
+            return step(*args)
+        except Exception:
+            logger.exception("Explanation batch failed")
+            return 0
+
+    def _drain(self, timeout: float) -> list:
+        try:
+            batch = [self.queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _model(self):
+        """
+        (fraud model, version it explains; None = any row).
+        """
+        if self.fraud_model is not None:
+            return self.fraud_model, None
+
+        from app.ml.registry import get_model_registry
+        models = get_model_registry().current
+        return models.fraud_model, models.version
+
+    def _claim(self, db, tx_ids=None) -> list:
+        """
+        Pending rows locked for this transaction; rows another
+        worker holds are skipped, not waited on.
+        """
+        query = (
+            db.query(Transaction)
+            .filter(Transaction.explanation_status == STATUS_PENDING)
+        )
+        if tx_ids is not None:
+            query = query.filter(Transaction.id.in_(tx_ids))
+
+        return (
+            query
+            .order_by(Transaction.ingested_at, Transaction.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    def process(self, tx_ids) -> int:
+        """
+        Explain one batch of ids and write shap_values back.
+        Returns how many rows were claimed.
+        """
+        return self._explain_claimed(tx_ids)
+
+    def sweep(self) -> int:
+        """
+        Explain the oldest pending rows (one batch).
+        Returns how many rows were claimed.
+        """
+        return self._explain_claimed(None)
+
+    def _explain_claimed(self, tx_ids) -> int:
+        db = self.session_factory()
+        try:
+            txs = self._claim(db, tx_ids)
+            if not txs:
+                db.rollback()
+                return 0
+
+            model, version = self._model()
+            stale = [
+                tx for tx in txs
+                if version is not None
+                and tx.model_version is not None
+                and tx.model_version != version
+            ]
+            current = [tx for tx in txs if tx not in stale]
+
+            updates = [
+                {"id": tx.id, "explanation_status": STATUS_STALE} for tx in stale
+            ]
+            self.stats["stale"] += len(stale)
+            if current:
+                updates += self._explain(model, current)
+
+            db.bulk_update_mappings(Transaction, updates)
+            db.commit()
+            self.stats["batches"] += 1
+            return len(txs)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _explain(self, model, txs) -> list:
+        """
+        Batch explain; on failure row by row, so one bad row
+        fails alone.
+        """
+        try:
+            explanations = model.explain_batch(txs)
+        except Exception:
+            if len(txs) == 1:
+                logger.exception("SHAP explanation failed for %s", txs[0].id)
+                self.stats["failed"] += 1
+                return [{"id": txs[0].id, "explanation_status": STATUS_FAILED}]
+
+            logger.warning("SHAP batch of %d failed, explaining row by row", len(txs))
+            return [update for tx in txs for update in self._explain(model, [tx])]
+
+        self.stats["explained"] += len(txs)
+        return [
+            {
+                "id": tx.id,
+                "shap_values": explanation,
+                "explanation_status": STATUS_READY,
+            }
+            for tx, explanation in zip(txs, explanations)
+        ]
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_explanation_worker(fraud_model=None) -> ExplanationWorker:
+    """
+    Process-wide worker, started on first use.
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = ExplanationWorker(fraud_model)
+            _worker.start()
+    return _worker
@@ -1,23 +1,64 @@
 from uuid import uuid4
 from datetime import datetime, timezone
-import time
 import math
+import os
+import threading
+import time
 
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
+from app.db.bulk import copy_upsert
+from app.db.models.ingestion_checkpoint import IngestionCheckpoint
 from app.db.models.transaction import Transaction
-from app.ml.pipeline import RiskPipeline
+from app.ml.cascade import get_cascade
+from app.ml.pipeline import RiskPipeline, iter_score_rows
+from app.services.explanations import (
+    explanations_deferred,
+    get_explanation_worker,
+)
+from app.services.pacing import FixedDelayPacing
+from app.services.scoring_pool import get_scoring_pool
+from app.services.stages import StageMetrics, run_stages
+
 
-               
 # GLOBAL, REUSED PIPELINE (LOADED ONCE)
-               
-pipeline = RiskPipeline()
 
-               
-# INGESTION TUNING (REAL-TIME SIMULATION)
-               
+pipeline = RiskPipeline(executor=get_scoring_pool(), cascade=get_cascade())
+
+
+# INGESTION DEFAULTS (REAL-TIME SIMULATION)
+# override per run: chunk_size + PacingPolicy (see services/pacing.py)
+
 CHUNK_SIZE = 25          # smaller chunk = smoother UI growth
 YIELD_SECONDS = 0.05     # ~20 commits/sec (realistic)
+MAX_CHUNK_SIZE = 5000
+
+# read -> score -> write run concurrently (INGEST_PIPELINED=0: serial)
+PIPELINED = os.getenv("INGEST_PIPELINED", "1") == "1"
+QUEUE_DEPTH = int(os.getenv("INGEST_QUEUE_DEPTH", "2"))   # chunks per queue
+
+# COPY encoding for chunk writes ("text" | "binary")
+COPY_FORMAT = os.getenv("INGEST_COPY_FORMAT", "binary")
+
+
+# raw IEEE fields copied onto Transaction
+# (typed by the Transaction columns: id_12, id_15, id_30, ... are strings)
+RAW_FIELDS = [
+    "TransactionAmt",
+    "card1",
+    "addr1",
+    "C1",
+    "C2",
+    "D1",
+] + [f"id_{i:02d}" for i in range(1, 39)]
+
+TEXT_FIELDS = [
+    "ProductCD",
+    "DeviceType",
+    "DeviceInfo",
+]
 
 
 def _clean(v):
@@ -31,87 +72,583 @@ def _clean(v):
     return v
 
 
-def ingest_ieee_rows(db: Session, rows: list):
+def _transaction_record(row, ingested_at) -> dict:
+    """
+    Raw IEEE row -> Transaction column values (UUID assigned client-side).
+    """
+    record = {
+        "id": uuid4(),
+        "TransactionID": str(row["TransactionID"]),
+        "ingested_at": ingested_at,
+    }
+
+    for field in RAW_FIELDS:
+        record[field] = _clean(row.get(field))
+    for field in TEXT_FIELDS:
+        record[field] = row.get(field)
+
+    return record
+
+
+def _existing_ids(db: Session, source_ids) -> set:
+    """
+    ONE set-based idempotency lookup per chunk.
+    """
+    if not source_ids:
+        return set()
+
+    return set(
+        db.execute(
+            select(Transaction.TransactionID)
+            .where(Transaction.TransactionID.in_(source_ids))
+        ).scalars()
+    )
+
+
+def _insert_scored(db: Session, records: list) -> set:
+    """
+    ONE COPY + staged INSERT per chunk (app/db/bulk.py).
+    ON CONFLICT keeps row-level idempotency under concurrent writers.
+    Returns the ids actually inserted.
+    """
+    if not records:
+        return set()
+
+    return set(copy_upsert(
+        db,
+        Transaction,
+        records,
+        conflict_columns=["TransactionID"],
+        returning="id",
+        format=COPY_FORMAT,
+    ))
+
+
+RAW_CHECKPOINT = "ieee_raw_transactions"
+
+# one run per watermark across processes (gunicorn workers, replicas);
+# renewed with every chunk commit, expires if its holder dies
+CHECKPOINT_LEASE_SECONDS = float(os.getenv("INGEST_CHECKPOINT_LEASE_SECONDS", "120"))
+
+
+class CheckpointLeaseError(RuntimeError):
+    pass
+
+
+RAW_COLUMNS = """
+    id,
+    ingested_at,
+    "TransactionID",
+    "TransactionAmt",
+    "ProductCD",
+    card1,
+    addr1,
+    "C1",
+    "C2",
+    "D1",
+    "DeviceType",
+    "DeviceInfo"
+"""
+
+
+def load_checkpoint(db: Session, name: str = RAW_CHECKPOINT):
+    """
+    Watermark row for a raw source (created empty on first use).
+    """
+    db.execute(
+        insert(IngestionCheckpoint)
+        .values(name=name, updated_at=datetime.now(timezone.utc))
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+    return db.get(IngestionCheckpoint, name)
+
+
+def acquire_checkpoint_lease(
+    db: Session,
+    owner: str,
+    name: str = RAW_CHECKPOINT,
+    lease_seconds: float = CHECKPOINT_LEASE_SECONDS,
+) -> bool:
+    """
+    Take the watermark for owner unless another run holds an unexpired
+    lease. Caller commits to publish it.
+    """
+    load_checkpoint(db, name)
+    return db.execute(
+        text("""
+            UPDATE ingestion_checkpoints
+            SET leased_by = :owner,
+                leased_until = now() + make_interval(secs => :lease_seconds)
+            WHERE name = :name
+              AND (leased_until IS NULL
+                   OR leased_until < now()
+                   OR leased_by = :owner)
+        """),
+        {"owner": owner, "name": name, "lease_seconds": lease_seconds},
+    ).rowcount == 1
+
+
+def renew_checkpoint_lease(
+    db: Session,
+    owner: str,
+    name: str = RAW_CHECKPOINT,
+    lease_seconds: float = CHECKPOINT_LEASE_SECONDS,
+):
     """
-    Production-grade IEEE ingestion
+    Extend the lease inside a chunk's transaction; raises (and so rolls
+    the chunk back) if it expired and another run took the watermark.
+    """
+    renewed = db.execute(
+        text("""
+            UPDATE ingestion_checkpoints
+            SET leased_until = now() + make_interval(secs => :lease_seconds)
+            WHERE name = :name AND leased_by = :owner
+        """),
+        {"owner": owner, "name": name, "lease_seconds": lease_seconds},
+    ).rowcount
+    if renewed != 1:
+        raise CheckpointLeaseError(f"Lost the lease on checkpoint {name}")
+
+
+def release_checkpoint_lease(db: Session, owner: str, name: str = RAW_CHECKPOINT):
+    db.execute(
+        text("""
+            UPDATE ingestion_checkpoints
+            SET leased_by = NULL, leased_until = NULL
+            WHERE name = :name AND leased_by = :owner
+        """),
+        {"owner": owner, "name": name},
+    )
+    db.commit()
+
+
+def checkpoint_lease_holder(checkpoint) -> str | None:
+    """
+    Owner of an unexpired lease (None = free).
+    """
+    if checkpoint.leased_until is None:
+        return None
+    if checkpoint.leased_until < datetime.now(timezone.utc):
+        return None
+    return checkpoint.leased_by
+
+
+def _watermark(checkpoint):
+    if checkpoint.last_ingested_at is None:
+        return None
+    return (checkpoint.last_ingested_at, checkpoint.last_id)
+
+
+def _pending_after(position) -> tuple:
+    """
+    Unprocessed rows strictly after (ingested_at, id).
+
+    processed_at is the ONE "done" marker shared with the claim queue
+    (services/ingestion_workers.py): rows a worker already completed are
+    skipped here, rows ingested here are never claimed by a worker.
+    """
+    if position is None:
+        return "WHERE processed_at IS NULL", {}
+
+    return (
+        "WHERE processed_at IS NULL "
+        "AND (ingested_at, id) > (:last_ingested_at, :last_id)",
+        {"last_ingested_at": position[0], "last_id": position[1]},
+    )
+
+
+def fetch_raw_page(db: Session, position, limit: int):
+    """
+    Next page of unprocessed raw IEEE rows after a keyset position
+    (oldest first). Served by ix_ieee_raw_unprocessed: cost is
+    O(limit), independent of how many rows were ingested before.
+    """
+    where, params = _pending_after(position)
+
+    return db.execute(
+        text(f"""
+            SELECT {RAW_COLUMNS}
+            FROM ieee_raw_transactions
+            {where}
+            ORDER BY ingested_at ASC, id ASC
+            LIMIT :limit
+        """),
+        {**params, "limit": limit}
+    ).mappings().all()
+
+
+def count_raw_pending(db: Session, checkpoint) -> int:
+    where, params = _pending_after(_watermark(checkpoint))
+
+    return db.execute(
+        text(f"SELECT COUNT(*) FROM ieee_raw_transactions {where}"),
+        params,
+    ).scalar_one()
+
+
+def mark_raw_processed(db: Session, raw_ids) -> int:
+    """
+    Mark raw rows done (same transaction as their insert); a worker's
+    live claim on them is dropped, its complete_batch counts it lost.
+    """
+    return db.execute(
+        text("""
+            UPDATE ieee_raw_transactions
+            SET processed_at = now(),
+                claimed_by = NULL,
+                claimed_until = NULL
+            WHERE id = ANY(:raw_ids)
+              AND processed_at IS NULL
+        """),
+        {"raw_ids": list(raw_ids)},
+    ).rowcount
+
+
+def _check_chunk_size(chunk_size: int):
+    if not 1 <= chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError(f"chunk_size must be in [1, {MAX_CHUNK_SIZE}]")
+
+
+def ingest_ieee_rows(
+    db: Session,
+    rows: list,
+    chunk_size: int = CHUNK_SIZE,
+    pacing=None,
+    cancel_event=None,
+    on_progress=None,
+    pipelined: bool = PIPELINED,
+) -> dict:
+    """
+    Production-grade IEEE ingestion of an in-memory row list
 
     Guarantees:
     - UUID is the ONLY system identity
     - IEEE TransactionID is metadata only
     - Idempotent on IEEE TransactionID
-    - Chunked commits (real-time simulation)
+    - Chunked commits, paced by a PacingPolicy
     - ML scoring happens ONCE (ingestion-time)
+    - ONE lookup + ONE COPY-staged insert per chunk, then commit
+
+    Returns run stats (rows, timings, achieved throughput,
+    per-stage metrics).
+
+    cancel_event : threading.Event, checked between chunks
+                   (also interrupts pacing waits)
+    on_progress  : called with the running stats after every chunk
     """
+    _check_chunk_size(chunk_size)
 
-    total = len(rows)
+    def chunks():
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start : start + chunk_size]
 
-    for start in range(0, total, CHUNK_SIZE):
-        chunk = rows[start : start + CHUNK_SIZE]
+    return _ingest_chunks(
+        db,
+        chunks,
+        chunk_size=chunk_size,
+        pacing=pacing,
+        cancel_event=cancel_event,
+        on_progress=on_progress,
+        pipelined=pipelined,
+    )
 
-        for row in chunk:
-            source_id = str(row["TransactionID"])
 
+def ingest_raw_incremental(
+    db: Session,
+    limit: int,
+    chunk_size: int = CHUNK_SIZE,
+    pacing=None,
+    cancel_event=None,
+    on_progress=None,
+    checkpoint_name: str = RAW_CHECKPOINT,
+    pipelined: bool = PIPELINED,
+    owner: str | None = None,
+) -> dict:
+    """
+    Incremental ingestion from ieee_raw_transactions.
+
+    - Reads ONE keyset page per chunk after the persisted watermark
+      (memory bounded by chunk_size * queue depth, not by limit)
+    - The watermark advances in the SAME transaction as the chunk
+      insert: a crash re-reads at most the uncommitted chunks,
+      and the TransactionID upsert absorbs that replay
+    - Re-running only sees rows that arrived since the last run
+    - Rows are marked processed_at with the watermark, and rows the
+      ingestion workers already processed are skipped
+    - The run holds the checkpoint lease (CheckpointLeaseError if
+      another process does): two runs never read and advance the
+      same watermark
+    """
+    _check_chunk_size(chunk_size)
+
+    owner = owner or str(uuid4())
+    if not acquire_checkpoint_lease(db, owner, checkpoint_name):
+        db.rollback()
+        raise CheckpointLeaseError(
+            f"Checkpoint {checkpoint_name} is leased by another ingestion run"
+        )
+    db.commit()
 
-            # 1️ IDEMPOTENCY (IEEE DATASET ID)
+    try:
+        # loaded under the lease: the watermark cannot move meanwhile
+        checkpoint = load_checkpoint(db, checkpoint_name)
+        start_position = _watermark(checkpoint)
+        db.commit()
+
+        def pages():
+            # read position runs ahead of the committed watermark
+            position = start_position
+            remaining = limit
+            while remaining > 0:
+                page = fetch_raw_page(db, position, min(chunk_size, remaining))
+                if not page:
+                    return
+                remaining -= len(page)
+                position = (page[-1]["ingested_at"], page[-1]["id"])
+                yield page
+
+        def advance(page):
+            renew_checkpoint_lease(db, owner, checkpoint_name)
+            mark_raw_processed(db, [row["id"] for row in page])
+            last = page[-1]
+            checkpoint.last_ingested_at = last["ingested_at"]
+            checkpoint.last_id = last["id"]
+
+        return _ingest_chunks(
+            db,
+            pages,
+            chunk_size=chunk_size,
+            pacing=pacing,
+            cancel_event=cancel_event,
+            on_progress=on_progress,
+            before_commit=advance,
+            pipelined=pipelined,
+        )
+    finally:
+        db.rollback()
+        release_checkpoint_lease(db, owner, checkpoint_name)
+
+
+# STAGES
+# read  (DB)  : raw page + ONE idempotency lookup -> Transaction records
+# score (CPU) : ONE score_batch per chunk
+# write (DB)  : ONE multi-row INSERT + commit, pacing, SHAP back-fill
+
+
+def _prepare_chunk(db: Session, chunk) -> list:
+    """
+    1️ IDEMPOTENCY (IEEE DATASET ID) + 2️ BUILD TRANSACTIONS (UUID, NO FLUSH)
+    """
+    by_source_id = {}
+    for row in chunk:
+        by_source_id.setdefault(str(row["TransactionID"]), row)
+
+    existing = _existing_ids(db, list(by_source_id))
+
+    ingested_at = datetime.now(timezone.utc)
+    return [
+        _transaction_record(row, ingested_at)
+        for source_id, row in by_source_id.items()
+        if source_id not in existing
+    ]
+
+
+def _score_records(records: list):
+    """
+    3️ ML SCORING (ONCE, EVER) — ONE BATCH PER CHUNK
+    """
+    if not records:
+        return
 
-            exists = (
-                db.query(Transaction)
-                .filter(Transaction.TransactionID == source_id)
-                .first()
+    apply_scores(
+        records,
+        pipeline.score_batch(records, explain=not explanations_deferred()),
+    )
+
+
+def apply_scores(records: list, columns):
+    """
+    score_batch() columns -> Transaction score columns on each record.
+    """
+    for record, result in zip(records, iter_score_rows(columns)):
+        record["fraud_prob"] = result["fraud_prob"]
+        record["anomaly_score"] = result.get("anomaly_score")
+        record["decision"] = result["decision"]
+        record["severity"] = result.get("severity")
+        record["decision_reasons"] = result.get("reasons", [])
+        record["shap_values"] = result.get("shap_values", [])
+        record["explanation_status"] = result.get("explanation_status")
+        record["model_version"] = result.get("model_version")
+        record["scored_by"] = result.get("scored_by")
+
+
+def _write_chunk(db: Session, chunk, records: list, before_commit=None):
+    """
+    4️ WRITE + COMMIT CHUNK → UI CAN SEE IT
+    Returns (inserted ids, commit seconds).
+    """
+    commit_started = time.perf_counter()
+    inserted = _insert_scored(db, records)
+    if before_commit is not None:
+        before_commit(chunk)
+    if records or before_commit is not None:
+        db.commit()
+
+    return inserted, time.perf_counter() - commit_started
+
+
+def _ingest_chunks(
+    db: Session,
+    chunks,
+    chunk_size: int,
+    pacing=None,
+    cancel_event=None,
+    on_progress=None,
+    before_commit=None,
+    pipelined: bool = PIPELINED,
+) -> dict:
+    """
+    Shared chunk driver over a chunks() generator factory.
+
+    pipelined=True  : read / score / write run concurrently, joined by
+                      bounded queues (backpressure). Throughput tends to
+                      max(DB, scoring) instead of their sum.
+    pipelined=False : the three stages inline, one chunk at a time.
+
+    before_commit(chunk) runs inside each chunk's transaction
+    (watermark updates commit atomically with the rows).
+    """
+    pacing = pacing or FixedDelayPacing(YIELD_SECONDS)
+
+    stats = {
+        "rows_read": 0,
+        "rows_processed": 0,
+        "rows_scored": 0,
+        "rows_written": 0,
+        "rows_skipped": 0,
+        "chunks": 0,
+        "waited_seconds": 0.0,
+        "cancelled": False,
+    }
+    metrics = {
+        "read": StageMetrics("read"),
+        "score": StageMetrics("score"),
+        "write": StageMetrics("write"),
+    }
+    started = time.perf_counter()
+
+    # ONE pooled connection: the two DB stages take turns on the
+    # session, both overlap with scoring
+    db_lock = threading.Lock()
+
+    def read():
+        source = chunks()
+        while cancel_event is None or not cancel_event.is_set():
+            with db_lock:
+                read_started = time.perf_counter()
+                chunk = next(source, None)
+                if chunk is None:
+                    return
+                records = _prepare_chunk(db, chunk)
+                metrics["read"].add(
+                    len(chunk), time.perf_counter() - read_started
+                )
+
+            stats["rows_read"] += len(chunk)
+            yield chunk, records
+
+    def score(item):
+        chunk, records = item
+        with metrics["score"].timed(len(records)):
+            _score_records(records)
+        stats["rows_scored"] += len(records)
+        return item
+
+    def write(item):
+        chunk, records = item
+
+        # 5️ PACING (real-time simulation / rate limit / back-off)
+        stats["waited_seconds"] += _pause(
+            pacing.before_chunk(len(records)), cancel_event
+        )
+
+        with db_lock, metrics["write"].timed(len(records)):
+            inserted, commit_seconds = _write_chunk(
+                db, chunk, records, before_commit
             )
-            if exists:
-                continue
-
-                
-            # 2️ CREATE TRANSACTION (UUID)
-                
-            tx = Transaction(
-                id=uuid4(),
-                TransactionID=source_id,
-                ingested_at=datetime.now(timezone.utc),
-
-                TransactionAmt=_clean(row.get("TransactionAmt")),
-                ProductCD=row.get("ProductCD"),
-
-                card1=_clean(row.get("card1")),
-                addr1=_clean(row.get("addr1")),
-
-                C1=_clean(row.get("C1")),
-                C2=_clean(row.get("C2")),
-                D1=_clean(row.get("D1")),
-
-                DeviceType=row.get("DeviceType"),
-                DeviceInfo=row.get("DeviceInfo"),
-
-                **{
-                    f"id_{i:02d}": _clean(row.get(f"id_{i:02d}"))
-                    for i in range(1, 39)
-                },
+
+        stats["chunks"] += 1
+        stats["rows_processed"] += len(chunk)
+        stats["rows_written"] += len(inserted)
+        stats["rows_skipped"] += len(chunk) - len(inserted)
+
+        # 4b SHAP BACK-FILL OFF THE CRITICAL PATH (deferred mode)
+        pending = [
+            record["id"] for record in records
+            if record["id"] in inserted
+            and record["explanation_status"] == "pending"
+        ]
+        if pending:
+            get_explanation_worker().submit(pending)
+
+        _report(on_progress, stats, started, metrics)
+
+        if records:
+            stats["waited_seconds"] += _pause(
+                pacing.after_commit(len(records), commit_seconds),
+                cancel_event,
             )
 
-            db.add(tx)
-            db.flush()  # UUID assigned here (NO COMMIT YET)
+    if pipelined:
+        queues = run_stages(
+            read(),
+            [score],
+            write,
+            depth=QUEUE_DEPTH,
+            cancel_event=cancel_event,
+        )
+    else:
+        queues = {}
+        for item in read():
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            write(score(item))
 
-                
-            # 3️ ML SCORING (ONCE, EVER)
-                
-            result = pipeline.score(tx)
+    stats["cancelled"] = bool(cancel_event is not None and cancel_event.is_set())
+    _finalize(stats, started, metrics)
+    stats["queues"] = queues
+    stats["waited_seconds"] = round(stats["waited_seconds"], 3)
+    stats["chunk_size"] = chunk_size
+    stats["pipelined"] = pipelined
+    stats["pacing"] = pacing.describe()
 
-            tx.fraud_prob = result["fraud_prob"]
-            tx.anomaly_score = result.get("anomaly_score")
-            tx.decision = result["decision"]
-            tx.severity = result.get("severity")
-            tx.decision_reasons = result.get("reasons", [])
-            tx.shap_values = result.get("shap_values", [])
+    return stats
 
 
+def _finalize(stats: dict, started: float, metrics=None):
+    elapsed = time.perf_counter() - started
+    rate = 1 / elapsed if elapsed > 0 else 0.0
+
+    stats["elapsed_seconds"] = round(elapsed, 3)
+    stats["throughput_tps"] = round(stats["rows_processed"] * rate, 1)
+    stats["written_tps"] = round(stats["rows_written"] * rate, 1)
+    if metrics is not None:
+        stats["stages"] = {
+            name: stage.to_dict(elapsed) for name, stage in metrics.items()
+        }
+
+
+def _report(on_progress, stats: dict, started: float, metrics=None):
+    if on_progress is not None:
+        _finalize(stats, started, metrics)
+        on_progress(dict(stats))
 
-                 
-        # 4️ COMMIT CHUNK → UI CAN SEE IT
-                 
-        db.commit()
 
-                 
-        # 5️ YIELD CPU (SIMULATES STREAMING)
-                 
-        time.sleep(YIELD_SECONDS)
+def _pause(seconds: float, cancel_event=None) -> float:
+    if seconds <= 0:
+        return 0.0
+    if cancel_event is not None:
+        cancel_event.wait(seconds)
+    else:
+        time.sleep(seconds)
+    return seconds
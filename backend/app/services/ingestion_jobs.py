@@ -0,0 +1,225 @@
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.db.deps import open_session
+from app.services.ingestion import (
+    CheckpointLeaseError,
+    checkpoint_lease_holder,
+    count_raw_pending,
+    ingest_raw_incremental,
+    load_checkpoint,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# Jobs over ieee_raw_transactions share one watermark,
+# so only ONE may run at a time: per process here, across processes
+# through the checkpoint lease (ingest_raw_incremental).
+MAX_ACTIVE_JOBS = 1
+JOB_HISTORY = int(os.getenv("INGESTION_JOB_HISTORY", "50"))
+
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+
+class JobConflictError(RuntimeError):
+    pass
+
+
+class IngestionJob:
+    """
+    One background ingestion run (progress is updated per chunk).
+    """
+
+    def __init__(self, limit: int, chunk_size: int, pacing):
+        self.id = str(uuid4())
+        # checkpoint lease owner
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{self.id}"
+        self.limit = limit
+        self.chunk_size = chunk_size
+        self.pacing = pacing
+
+        self.status = QUEUED
+        self.error = None
+        self.rows_total = None
+        self.stats = {}
+
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at = None
+        self.finished_at = None
+
+        self.cancel_event = threading.Event()
+
+    def update(self, stats: dict):
+        self.stats = stats
+
+    def to_dict(self) -> dict:
+        stats = self.stats
+        processed = stats.get("rows_processed", 0)
+        tps = stats.get("throughput_tps", 0.0)
+
+        eta = None
+        if self.status == RUNNING and self.rows_total is not None and tps:
+            eta = round((self.rows_total - processed) / tps, 1)
+
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "params": {
+                "limit": self.limit,
+                "chunk_size": self.chunk_size,
+                "pacing": self.pacing.describe(),
+            },
+            "rows_total": self.rows_total,
+            "rows_read": stats.get("rows_read", 0),
+            "rows_processed": processed,
+            "rows_scored": stats.get("rows_scored", 0),
+            "rows_written": stats.get("rows_written", 0),
+            "rows_skipped": stats.get("rows_skipped", 0),
+            "throughput_tps": tps,
+            "eta_seconds": eta,
+            "elapsed_seconds": stats.get("elapsed_seconds", 0.0),
+            "stages": stats.get("stages", {}),
+            "queues": stats.get("queues", {}),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class IngestionJobManager:
+    """
+    Runs ingestion jobs on a dedicated thread (never inside a request).
+    Each job opens its own session; the pooled connection is
+    released after every chunk commit, so API requests interleave.
+    """
+
+    def __init__(self, session_factory=open_session):
+        self.session_factory = session_factory
+        self.executor = ThreadPoolExecutor(
+            max_workers=MAX_ACTIVE_JOBS,
+            thread_name_prefix="ingestion-job",
+        )
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, limit: int, chunk_size: int, pacing) -> IngestionJob:
+        with self.lock:
+            active = [
+                job for job in self.jobs.values()
+                if job.status in ACTIVE_STATES
+            ]
+            if len(active) >= MAX_ACTIVE_JOBS:
+                raise JobConflictError(
+                    f"Ingestion job {active[0].id} is already {active[0].status}"
+                )
+
+            holder = self._lease_holder()
+            if holder is not None:
+                raise JobConflictError(
+                    f"Ingestion is already running in another process ({holder})"
+                )
+
+            job = IngestionJob(limit, chunk_size, pacing)
+            self.jobs[job.id] = job
+            self._trim_history()
+
+        self.executor.submit(self._run, job)
+        return job
+
+    def _lease_holder(self) -> str | None:
+        """
+        Early 409 for a run held elsewhere (the lease taken by the
+        job itself is what actually excludes it).
+        """
+        db = self.session_factory()
+        try:
+            holder = checkpoint_lease_holder(load_checkpoint(db))
+            db.commit()
+            return holder
+        finally:
+            db.close()
+
+    def get(self, job_id: str):
+        return self.jobs.get(job_id)
+
+    def list(self):
+        return sorted(
+            self.jobs.values(),
+            key=lambda job: job.created_at,
+            reverse=True,
+        )
+
+    def cancel(self, job_id: str):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+
+        job.cancel_event.set()
+        if job.status == QUEUED:
+            job.status = CANCELLED
+            job.finished_at = datetime.now(timezone.utc)
+        return job
+
+    def _run(self, job: IngestionJob):
+        if job.cancel_event.is_set():
+            return
+
+        job.status = RUNNING
+        job.started_at = datetime.now(timezone.utc)
+
+        db = self.session_factory()
+        try:
+            checkpoint = load_checkpoint(db)
+            job.rows_total = min(job.limit, count_raw_pending(db, checkpoint))
+            db.commit()
+
+            stats = ingest_raw_incremental(
+                db,
+                job.limit,
+                chunk_size=job.chunk_size,
+                pacing=job.pacing,
+                cancel_event=job.cancel_event,
+                on_progress=job.update,
+                owner=job.owner,
+            )
+            job.update(stats)
+            job.status = CANCELLED if stats["cancelled"] else COMPLETED
+        except CheckpointLeaseError as e:
+            logger.warning("Ingestion job %s not run: %s", job.id, e)
+            db.rollback()
+            job.status = FAILED
+            job.error = str(e)
+        except Exception as e:
+            logger.exception("Ingestion job %s failed", job.id)
+            db.rollback()
+            job.status = FAILED
+            job.error = str(e)
+        finally:
+            db.close()
+            job.finished_at = datetime.now(timezone.utc)
+
+    def _trim_history(self):
+        finished = [
+            job for job in self.list()
+            if job.status not in ACTIVE_STATES
+        ]
+        for job in finished[JOB_HISTORY:]:
+            del self.jobs[job.id]
+
+
+job_manager = IngestionJobManager()
@@ -0,0 +1,221 @@
+import logging
+import multiprocessing
+import os
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import text
+
+from app.ml.thread_budget import limit_process_threads
+
+
+logger = logging.getLogger(__name__)
+
+
+# MULTI-PROCESS INGESTION
+# N worker processes claim disjoint batches of ieee_raw_transactions
+# (FOR UPDATE SKIP LOCKED + lease), score them and write independently.
+#
+# - a claim is a short committed UPDATE: claimed_by / claimed_until
+# - a dead worker's claim expires after LEASE_SECONDS and is re-claimed
+# - results commit TOGETHER with processed_at; the TransactionID upsert
+#   keeps transactions exactly-once even when an expired lease is
+#   processed twice
+# - processed_at is shared with the watermark path
+#   (ingest_raw_incremental marks the rows it ingests and skips the
+#   rows workers completed), so the two never re-score each other's rows
+
+WORKER_BATCH_SIZE = int(os.getenv("INGEST_WORKER_BATCH_SIZE", "500"))
+LEASE_SECONDS = float(os.getenv("INGEST_LEASE_SECONDS", "60"))
+IDLE_POLL_SECONDS = float(os.getenv("INGEST_IDLE_POLL_SECONDS", "2"))
+
+
+def claim_batch(db, worker_id: str, batch_size: int, lease_seconds: float):
+    """
+    Lease up to batch_size unprocessed raw rows (oldest first).
+    Rows locked or leased by other workers are skipped, never waited on.
+    Caller commits to publish the claim.
+    """
+    return db.execute(
+        text("""
+            WITH batch AS (
+                SELECT id
+                FROM ieee_raw_transactions
+                WHERE processed_at IS NULL
+                  AND (claimed_until IS NULL OR claimed_until < now())
+                ORDER BY ingested_at ASC, id ASC
+                LIMIT :batch_size
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE ieee_raw_transactions AS r
+            SET claimed_by = :worker_id,
+                claimed_until = now() + make_interval(secs => :lease_seconds)
+            FROM batch
+            WHERE r.id = batch.id
+            RETURNING r.*
+        """),
+        {
+            "worker_id": worker_id,
+            "batch_size": batch_size,
+            "lease_seconds": lease_seconds,
+        },
+    ).mappings().all()
+
+
+def complete_batch(db, worker_id: str, raw_ids) -> int:
+    """
+    Mark claimed rows processed (same transaction as the insert).
+    Returns how many were still leased by this worker.
+    """
+    return db.execute(
+        text("""
+            UPDATE ieee_raw_transactions
+            SET processed_at = now(),
+                claimed_by = NULL,
+                claimed_until = NULL
+            WHERE id = ANY(:raw_ids)
+              AND claimed_by = :worker_id
+        """),
+        {"raw_ids": list(raw_ids), "worker_id": worker_id},
+    ).rowcount
+
+
+def count_unprocessed(db) -> int:
+    return db.execute(
+        text(
+            "SELECT COUNT(*) FROM ieee_raw_transactions "
+            "WHERE processed_at IS NULL"
+        )
+    ).scalar_one()
+
+
+def _limit_threads():
+    # one core per worker: scale with processes, not BLAS/OpenMP threads
+    limit_process_threads(1, override=False)
+
+
+def run_worker(
+    worker_id: str,
+    batch_size: int = WORKER_BATCH_SIZE,
+    lease_seconds: float = LEASE_SECONDS,
+    max_rows: int | None = None,
+    exit_when_idle: bool = True,
+) -> dict:
+    """
+    One worker process: claim -> score -> insert + complete -> commit.
+
+    Deferred SHAP rows are left 'pending' for the API process's
+    ExplanationWorker sweep (no back-fill thread per worker).
+    """
+    # model + DB imports AFTER thread limits (fresh spawn process)
+    from app.db.deps import open_session
+    from app.services.ingestion import (
+        _insert_scored,
+        _prepare_chunk,
+        _score_records,
+    )
+
+    stats = {
+        "worker_id": worker_id,
+        "batches": 0,
+        "rows_claimed": 0,
+        "rows_written": 0,
+        "rows_skipped": 0,
+        "rows_lease_lost": 0,
+        "score_seconds": 0.0,
+        "db_seconds": 0.0,
+    }
+    started = time.perf_counter()
+
+    db = open_session()
+    try:
+        while max_rows is None or stats["rows_claimed"] < max_rows:
+            db_started = time.perf_counter()
+            rows = claim_batch(db, worker_id, batch_size, lease_seconds)
+            db.commit()
+
+            if not rows:
+                stats["db_seconds"] += time.perf_counter() - db_started
+                if exit_when_idle:
+                    break
+                time.sleep(IDLE_POLL_SECONDS)
+                continue
+
+            records = _prepare_chunk(db, rows)
+            stats["db_seconds"] += time.perf_counter() - db_started
+
+            score_started = time.perf_counter()
+            _score_records(records)
+            stats["score_seconds"] += time.perf_counter() - score_started
+
+            db_started = time.perf_counter()
+            inserted = _insert_scored(db, records)
+            completed = complete_batch(db, worker_id, [row["id"] for row in rows])
+            db.commit()
+            stats["db_seconds"] += time.perf_counter() - db_started
+
+            stats["batches"] += 1
+            stats["rows_claimed"] += len(rows)
+            stats["rows_written"] += len(inserted)
+            stats["rows_skipped"] += len(rows) - len(inserted)
+            stats["rows_lease_lost"] += len(rows) - completed
+    except Exception:
+        logger.exception("Ingestion worker %s failed", worker_id)
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    stats["elapsed_seconds"] = round(elapsed, 3)
+    stats["score_seconds"] = round(stats["score_seconds"], 3)
+    stats["db_seconds"] = round(stats["db_seconds"], 3)
+    stats["throughput_tps"] = round(
+        stats["rows_claimed"] / elapsed if elapsed > 0 else 0.0, 1
+    )
+    return stats
+
+
+def run_workers(
+    n_workers: int,
+    batch_size: int = WORKER_BATCH_SIZE,
+    lease_seconds: float = LEASE_SECONDS,
+    exit_when_idle: bool = True,
+) -> dict:
+    """
+    Drain ieee_raw_transactions with n_workers spawned processes.
+    Returns per-worker stats and the aggregate throughput.
+    """
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_limit_threads,
+    ) as pool:
+        futures = [
+            pool.submit(
+                run_worker,
+                f"{prefix}:{i}",
+                batch_size,
+                lease_seconds,
+                None,
+                exit_when_idle,
+            )
+            for i in range(n_workers)
+        ]
+        workers = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    rows = sum(w["rows_claimed"] for w in workers)
+    return {
+        "workers": workers,
+        "n_workers": n_workers,
+        "rows_claimed": rows,
+        "rows_written": sum(w["rows_written"] for w in workers),
+        "rows_lease_lost": sum(w["rows_lease_lost"] for w in workers),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_tps": round(rows / elapsed if elapsed > 0 else 0.0, 1),
+    }
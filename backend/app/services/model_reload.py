@@ -0,0 +1,256 @@
+import logging
+import os
+import signal
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.ml.cascade import get_cascade
+from app.ml.pipeline import RiskPipeline
+from app.ml.registry import ModelRegistry, ModelSet, get_model_registry
+from app.services.scoring_pool import get_scoring_pool
+from app.services.warmup import warmup_rows
+
+
+logger = logging.getLogger(__name__)
+
+
+# HOT RELOAD (zero downtime)
+# load -> validate (feature contract) -> warmup -> parity -> swap
+#
+# The candidate is scored on a PINNED registry, never the live one.
+# The swap is one reference assignment: requests that already built
+# their context finish on the old set, the next ones get the new set.
+# Old models are freed once the last in-flight request drops them.
+
+# Under gunicorn (app/gunicorn_conf.py) a swap in the ONE worker that got
+# the request would leave the others on the old version. That worker
+# still runs every check, then hands the version to the master
+# (file + SIGHUP): the master loads it (no predictions) and re-forks
+# every worker from it, so all of them serve it and share its pages.
+MASTER_PID_ENV = "MODEL_RELOAD_MASTER_PID"
+
+PARITY_ROWS = int(os.getenv("MODEL_RELOAD_PARITY_ROWS", "64"))
+
+# decision agreement with the live set required to swap
+# (0 = report only: a retrain is expected to move some decisions)
+MIN_AGREEMENT = float(os.getenv("MODEL_RELOAD_MIN_AGREEMENT", "0"))
+
+STATUS_IDLE = "idle"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+
+
+def check_parity(candidate: ModelSet, rows) -> None:
+    """
+    Online paths of the candidate must agree with each other:
+    batched run() == per-row predict / score / decide (bit-identical).
+    """
+    pipeline = RiskPipeline(registry=ModelRegistry(models=candidate))
+    batch = pipeline.score_batch(rows, explain=False)
+
+    for i, tx in enumerate(rows):
+        fraud_prob = candidate.fraud_model.predict(tx)
+        anomaly_score = candidate.anomaly_scorer.score(tx)
+        decision = candidate.decision_engine.decide(fraud_prob, anomaly_score)
+
+        if fraud_prob != batch["fraud_prob"][i]:
+            raise RuntimeError(f"Parity: fraud_prob differs on row {i}")
+        if anomaly_score != batch["anomaly_score"][i]:
+            raise RuntimeError(f"Parity: anomaly_score differs on row {i}")
+        if decision["decision"] != batch["decision"][i]:
+            raise RuntimeError(f"Parity: decision differs on row {i}")
+
+
+def compare(live: ModelSet, candidate: ModelSet, rows) -> dict:
+    """
+    Candidate vs live set on the same rows (reported, gated by MIN_AGREEMENT).
+    """
+    old = RiskPipeline(registry=ModelRegistry(models=live)).score_batch(rows, explain=False)
+    new = RiskPipeline(registry=ModelRegistry(models=candidate)).score_batch(rows, explain=False)
+
+    agreement = float(np.mean(
+        np.asarray(old["decision"]) == np.asarray(new["decision"])
+    ))
+    return {
+        "rows": len(rows),
+        "decision_agreement": round(agreement, 4),
+        "max_fraud_prob_delta": float(np.max(np.abs(old["fraud_prob"] - new["fraud_prob"]))),
+        "max_anomaly_delta": float(np.max(np.abs(old["anomaly_score"] - new["anomaly_score"]))),
+    }
+
+
+def master_handoff_path(master_pid: int) -> Path:
+    return Path(tempfile.gettempdir()) / f"model-reload-{master_pid}.version"
+
+
+def hand_off_to_master(master_pid: int, version: str):
+    """
+    Publish the validated version for the master, then SIGHUP it.
+    """
+    path = master_handoff_path(master_pid)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(version)
+    os.replace(tmp, path)
+    os.kill(master_pid, signal.SIGHUP)
+
+
+def read_master_handoff(master_pid: int) -> str | None:
+    """
+    Version handed to this master (None = nothing pending).
+    """
+    path = master_handoff_path(master_pid)
+    try:
+        version = path.read_text().strip()
+    except FileNotFoundError:
+        return None
+    path.unlink(missing_ok=True)
+    return version or None
+
+
+class ModelReloader:
+    """
+    Background reload of a model version into the live registry.
+    One reload at a time; status + per-step timings via to_dict().
+    """
+
+    def __init__(self, registry=None, scoring_pool=None):
+        self.registry = registry or get_model_registry()
+        self.scoring_pool = scoring_pool
+
+        self.status = STATUS_IDLE
+        self.version = None
+        self.error = None
+        self.steps = []
+        self.comparison = None
+        self.handoff = None
+        self.started_at = None
+        self.finished_at = None
+
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def step(self, name: str, fn):
+        started = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - started
+
+        self.steps.append({"step": name, "seconds": round(seconds, 4)})
+        logger.info("Model reload %s step %s: %.3fs", self.version, name, seconds)
+        return result
+
+    def start(self, version: str) -> bool:
+        """
+        Returns False when a reload is already running.
+        """
+        with self._lock:
+            if self.status == STATUS_RUNNING:
+                return False
+
+            self.status = STATUS_RUNNING
+            self.version = version
+            self.error = None
+            self.steps = []
+            self.comparison = None
+            self.handoff = None
+            self.started_at = time.time()
+            self.finished_at = None
+
+        self._thread = threading.Thread(
+            target=self.run,
+            args=(version,),
+            name="model-reload",
+            daemon=True,
+        )
+        self._thread.start()
+        return True
+
+    def run(self, version: str):
+        rows = warmup_rows(PARITY_ROWS)
+
+        try:
+            candidate = self.step("load", lambda: self._load(version))
+            self.step("validate", candidate.validate)
+
+            # same screen as live traffic: builds the candidate's first-stage model
+            pinned = RiskPipeline(
+                registry=ModelRegistry(models=candidate), cascade=get_cascade()
+            )
+            ctx = pinned.build_context(rows)
+            self.step("warmup", lambda: (
+                pinned.run_local(ctx, explain=False),
+                candidate.fraud_model.explain_matrix(ctx.X),
+                pinned.run_local(pinned.build_context(rows[:1])),
+            ))
+
+            self.step("parity", lambda: check_parity(candidate, rows))
+
+            live = self.registry.current
+            live.load()
+            self.comparison = self.step("compare", lambda: compare(live, candidate, rows))
+            if self.comparison["decision_agreement"] < MIN_AGREEMENT:
+                raise RuntimeError(
+                    f"Decision agreement {self.comparison['decision_agreement']:.2%} "
+                    f"below MODEL_RELOAD_MIN_AGREEMENT={MIN_AGREEMENT:.2%}"
+                )
+
+            master_pid = os.getenv(MASTER_PID_ENV)
+            if master_pid:
+                # every worker (this one included) is replaced by the master
+                self.step("master_handoff", lambda: hand_off_to_master(int(master_pid), version))
+                self.handoff = "master"
+                logger.info("Model version %s handed to gunicorn master %s", version, master_pid)
+            else:
+                if self.scoring_pool is not None:
+                    self.step("scoring_pool", lambda: self.scoring_pool.reload(version))
+
+                previous = self.step("swap", lambda: self.registry.swap(candidate))
+                logger.info("Model version %s -> %s", previous.version, version)
+        except Exception as e:
+            logger.exception("Model reload to %s failed", version)
+            self.error = str(e)
+            self.status = STATUS_FAILED
+        else:
+            self.status = STATUS_SUCCEEDED
+        finally:
+            self.finished_at = time.time()
+
+    @staticmethod
+    def _load(version: str) -> ModelSet:
+        candidate = ModelSet(version)
+        candidate.load()
+        return candidate
+
+    def to_dict(self) -> dict:
+        total = None
+        if self.started_at is not None and self.finished_at is not None:
+            total = round(self.finished_at - self.started_at, 4)
+
+        return {
+            "status": self.status,
+            "version": self.version,
+            "live_version": self.registry.version,
+            "error": self.error,
+            "steps": list(self.steps),
+            "comparison": self.comparison,
+            # "master": workers are being re-forked on the new version
+            # (poll GET /api/models/versions)
+            "handoff": self.handoff,
+            "total_seconds": total,
+        }
+
+
+_reloader = None
+_reloader_lock = threading.Lock()
+
+
+def get_model_reloader() -> ModelReloader:
+    global _reloader
+    with _reloader_lock:
+        if _reloader is None:
+            _reloader = ModelReloader(scoring_pool=get_scoring_pool())
+    return _reloader
@@ -0,0 +1,147 @@
+import time
+
+
+class PacingPolicy:
+    """
+    Decides how long ingestion waits between chunks.
+
+    before_chunk(n_rows)        -> seconds to wait before writing a chunk
+    after_commit(n_rows, secs)  -> feedback with the observed commit latency
+    """
+
+    name = "base"
+
+    def before_chunk(self, n_rows: int) -> float:
+        return 0.0
+
+    def after_commit(self, n_rows: int, commit_seconds: float) -> float:
+        return 0.0
+
+    def describe(self) -> dict:
+        return {"mode": self.name}
+
+
+class UnlimitedPacing(PacingPolicy):
+    """
+    Max throughput (backfills): never waits.
+    """
+
+    name = "max"
+
+
+class FixedDelayPacing(PacingPolicy):
+    """
+    Legacy real-time simulation: fixed pause after every commit.
+    """
+
+    name = "realtime"
+
+    def __init__(self, delay_seconds: float = 0.05):
+        self.delay_seconds = delay_seconds
+
+    def after_commit(self, n_rows: int, commit_seconds: float) -> float:
+        return self.delay_seconds
+
+    def describe(self) -> dict:
+        return {"mode": self.name, "delay_seconds": self.delay_seconds}
+
+
+class TokenBucketPacing(PacingPolicy):
+    """
+    Rate limit in tx/s. Bursts up to `burst` rows are allowed,
+    longer runs converge to `rate_tps`.
+    """
+
+    name = "rate"
+
+    def __init__(self, rate_tps: float, burst: float | None = None):
+        if rate_tps <= 0:
+            raise ValueError("rate_tps must be > 0")
+
+        self.rate_tps = float(rate_tps)
+        self.burst = float(burst if burst is not None else rate_tps)
+        self.tokens = self.burst
+        self.last = time.monotonic()
+
+    def before_chunk(self, n_rows: int) -> float:
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst,
+            self.tokens + (now - self.last) * self.rate_tps,
+        )
+        self.last = now
+
+        # tokens may go negative: the debt is the wait
+        self.tokens -= n_rows
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate_tps
+
+    def describe(self) -> dict:
+        return {
+            "mode": self.name,
+            "rate_tps": self.rate_tps,
+            "burst": self.burst,
+        }
+
+
+class AdaptivePacing(PacingPolicy):
+    """
+    Backs off when commits get slow (DB under pressure),
+    speeds back up when they are fast (AIMD on the inter-chunk delay).
+    """
+
+    name = "adaptive"
+
+    def __init__(
+        self,
+        target_commit_seconds: float = 0.05,
+        step_seconds: float = 0.01,
+        max_delay_seconds: float = 1.0,
+    ):
+        self.target_commit_seconds = target_commit_seconds
+        self.step_seconds = step_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.delay_seconds = 0.0
+
+    def after_commit(self, n_rows: int, commit_seconds: float) -> float:
+        if commit_seconds > self.target_commit_seconds:
+            self.delay_seconds = min(
+                self.max_delay_seconds,
+                self.delay_seconds + self.step_seconds,
+            )
+        else:
+            self.delay_seconds *= 0.5
+
+        return self.delay_seconds
+
+    def describe(self) -> dict:
+        return {
+            "mode": self.name,
+            "target_commit_seconds": self.target_commit_seconds,
+            "current_delay_seconds": round(self.delay_seconds, 4),
+        }
+
+
+PACING_MODES = ("realtime", "rate", "max", "adaptive")
+
+
+def build_pacing(mode: str = "realtime", rate_tps: float | None = None):
+    """
+    /api/ingestion/start parameters -> PacingPolicy
+    """
+    if mode == "realtime":
+        return FixedDelayPacing()
+    if mode == "max":
+        return UnlimitedPacing()
+    if mode == "adaptive":
+        return AdaptivePacing()
+    if mode == "rate":
+        if not rate_tps:
+            raise ValueError("rate mode requires rate_tps")
+        return TokenBucketPacing(rate_tps)
+
+    raise ValueError(
+        f"Unknown pacing mode '{mode}'. "
+        f"Expected one of: {', '.join(PACING_MODES)}"
+    )
@@ -0,0 +1,192 @@
+import logging
+import os
+import queue
+import threading
+
+from app.db.deps import open_session
+from app.services.explanations import STATUS_PENDING, get_explanation_worker
+from app.services.ingestion import _insert_scored
+
+
+logger = logging.getLogger(__name__)
+
+
+# WRITE-BEHIND FOR /api/scoring/batch
+# decisions are returned first, scored records are written afterwards
+# (one COPY-staged upsert per drained batch, idempotent on TransactionID)
+
+PERSIST_BATCH_SIZE = int(os.getenv("SCORE_PERSIST_BATCH_SIZE", "1000"))
+PERSIST_QUEUE_SIZE = int(os.getenv("SCORE_PERSIST_QUEUE_SIZE", "50000"))
+PERSIST_POLL_SECONDS = float(os.getenv("SCORE_PERSIST_POLL_SECONDS", "1"))
+
+
+class ScorePersister:
+    """
+    Background writer for scored records.
+
+    - submit() is non-blocking; records that do not fit are reported
+      back as dropped (callers retry: writes are idempotent)
+    - Deferred SHAP rows are handed to the ExplanationWorker
+      after their commit
+    """
+
+    def __init__(
+        self,
+        fraud_model=None,
+        session_factory=open_session,
+        batch_size: int = PERSIST_BATCH_SIZE,
+        max_queue: int = PERSIST_QUEUE_SIZE,
+        poll_seconds: float = PERSIST_POLL_SECONDS,
+    ):
+        self.fraud_model = fraud_model
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+
+        self.queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.stats = {
+            "submitted": 0,
+            "dropped": 0,
+            "written": 0,
+            "skipped": 0,
+            "failed": 0,
+            "batches": 0,
+        }
+
+    # lifecycle
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="score-persister",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # producer side
+
+    def submit(self, records) -> int:
+        """
+        Queue scored Transaction records. Returns how many were queued.
+        """
+        queued = 0
+
+        for record in records:
+            try:
+                self.queue.put_nowait(record)
+                queued += 1
+            except queue.Full:
+                self.stats["dropped"] += 1
+
+        self.stats["submitted"] += queued
+        if queued < len(records):
+            logger.warning(
+                "Score persistence queue full: dropped %d records",
+                len(records) - queued,
+            )
+        return queued
+
+    def backlog(self) -> int:
+        return self.queue.qsize()
+
+    # consumer side
+
+    def _run(self):
+        # drain what is queued even after stop()
+        while not self._stop.is_set() or not self.queue.empty():
+            batch = self._drain(timeout=self.poll_seconds)
+            if not batch:
+                continue
+
+            self._write(batch)
+
+    def _write(self, records):
+        """
+        process() a drained batch; on failure bisect it, so one bad
+        record fails alone instead of dropping every acknowledged
+        write drained with it (retries are idempotent on TransactionID).
+        """
+        try:
+            self.process(records)
+        except Exception:
+            if len(records) == 1:
+                logger.exception(
+                    "Score persistence failed for TransactionID=%s",
+                    records[0].get("TransactionID"),
+                )
+                self.stats["failed"] += 1
+                return
+
+            logger.warning(
+                "Score persistence batch of %d failed, retrying in halves",
+                len(records),
+            )
+            mid = len(records) // 2
+            self._write(records[:mid])
+            self._write(records[mid:])
+
+    def _drain(self, timeout: float) -> list:
+        try:
+            batch = [self.queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def process(self, records):
+        db = self.session_factory()
+        try:
+            inserted = _insert_scored(db, records)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        self.stats["written"] += len(inserted)
+        self.stats["skipped"] += len(records) - len(inserted)
+        self.stats["batches"] += 1
+
+        pending = [
+            record["id"] for record in records
+            if record["id"] in inserted
+            and record.get("explanation_status") == STATUS_PENDING
+        ]
+        if pending:
+            get_explanation_worker(self.fraud_model).submit(pending)
+
+
+_persister = None
+_persister_lock = threading.Lock()
+
+
+def get_score_persister(fraud_model=None) -> ScorePersister:
+    """
+    Process-wide persister, started on first use.
+    """
+    global _persister
+    with _persister_lock:
+        if _persister is None:
+            _persister = ScorePersister(fraud_model)
+            _persister.start()
+    return _persister
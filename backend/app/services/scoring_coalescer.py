@@ -0,0 +1,248 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+logger = logging.getLogger(__name__)
+
+
+# REQUEST COALESCING (dynamic micro-batching)
+# concurrent small scoring calls are collected for up to MAX_WAIT_MS
+# (or MAX_BATCH transactions), scored with ONE pipeline pass and the
+# result columns are sliced back to each caller
+
+COALESCE_ENABLED = os.getenv("SCORING_COALESCE", "1") == "1"
+COALESCE_MAX_WAIT_MS = float(os.getenv("SCORING_COALESCE_MAX_WAIT_MS", "2"))
+COALESCE_MAX_BATCH = int(os.getenv("SCORING_COALESCE_MAX_BATCH", "64"))
+
+
+class _Pending:
+    __slots__ = ("txs", "explain", "future", "enqueued")
+
+    def __init__(self, txs, explain: bool):
+        self.txs = txs
+        self.explain = explain
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+
+def slice_columns(columns: dict, start: int, stop: int) -> dict:
+    """
+    Rows [start, stop) of RiskPipeline.run() columns.
+    """
+    return {name: values[start:stop] for name, values in columns.items()}
+
+
+class ScoringCoalescer:
+    """
+    Micro-batching front for RiskPipeline.
+
+    - submit() returns a Future resolving to
+      {"columns", "timings_ms", "batch_size", "wait_ms"}
+    - A batch closes after max_wait_ms from its FIRST request
+      or once max_batch transactions are collected
+    - Requests are never split: one larger than max_batch
+      is scored on its own
+    - explain=True / False requests are scored in separate passes
+    - A failed merged pass is retried request by request: only the
+      request that raises gets the exception
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        max_wait_ms: float = COALESCE_MAX_WAIT_MS,
+        max_batch: int = COALESCE_MAX_BATCH,
+    ):
+        self.pipeline = pipeline
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch = max_batch
+
+        self.queue = queue.Queue()
+        self._carry = None
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.stats = {
+            "requests": 0,
+            "transactions": 0,
+            "batches": 0,
+            "failed": 0,
+            "isolated": 0,
+        }
+
+    # lifecycle
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="scoring-coalescer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # producer side
+
+    def submit(self, txs, explain: bool = True) -> Future:
+        pending = _Pending(list(txs), explain)
+        self.queue.put(pending)
+        return pending.future
+
+    def score(self, txs, explain: bool = True, timeout: float | None = None) -> dict:
+        """
+        Blocking submit() for thread-pool callers.
+        """
+        return self.submit(txs, explain).result(timeout)
+
+    def to_dict(self) -> dict:
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "mean_batch_size": (
+                round(self.stats["transactions"] / batches, 2) if batches else 0.0
+            ),
+            "max_wait_ms": self.max_wait * 1000,
+            "max_batch": self.max_batch,
+            "backlog": self.queue.qsize(),
+        }
+
+    # consumer side
+
+    def _next(self, timeout: float):
+        if self._carry is not None:
+            pending, self._carry = self._carry, None
+            return pending
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _collect(self) -> list:
+        first = self._next(timeout=0.1)
+        if first is None:
+            return []
+
+        batch = [first]
+        size = len(first.txs)
+        deadline = first.enqueued + self.max_wait
+
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    pending = self.queue.get(timeout=remaining)
+                else:
+                    # window closed: still take what already arrived
+                    pending = self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if size + len(pending.txs) > self.max_batch:
+                self._carry = pending
+                break
+
+            batch.append(pending)
+            size += len(pending.txs)
+
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set() or self._carry is not None or not self.queue.empty():
+            batch = self._collect()
+            if not batch:
+                continue
+
+            for explain in (True, False):
+                group = [p for p in batch if p.explain is explain]
+                if group:
+                    self.process(group, explain)
+
+    def process(self, group: list, explain: bool):
+        """
+        Score one group. With a process-pool executor the batch is
+        resolved from a callback, so the next one can be collected
+        (and run) meanwhile.
+        """
+        started = time.perf_counter()
+        txs = [tx for pending in group for tx in pending.txs]
+
+        try:
+            ctx = self.pipeline.build_context(txs)
+            scored = self.pipeline.submit(ctx, explain=explain)
+        except Exception as e:
+            self._fail(group, explain, e)
+            return
+
+        scored.add_done_callback(
+            lambda future: self._resolve(group, explain, ctx, future, started)
+        )
+
+    def _fail(self, group: list, explain: bool, error: Exception):
+        if len(group) > 1:
+            # one bad request must not fail the requests merged with it:
+            # re-score each one on its own (non-blocking, like process())
+            logger.warning(
+                "Coalesced scoring batch of %d requests failed (%s), "
+                "retrying per request", len(group), error,
+            )
+            self.stats["isolated"] += len(group)
+            for pending in group:
+                self.process([pending], explain)
+            return
+
+        logger.error("Coalesced scoring request failed", exc_info=error)
+        self.stats["failed"] += 1
+        group[0].future.set_exception(error)
+
+    def _resolve(self, group: list, explain: bool, ctx, future, started: float):
+        # outside an except block: per-request retries may run inline
+        error = future.exception()
+        if error is not None:
+            self._fail(group, explain, error)
+            return
+        columns = future.result()
+
+        self.stats["requests"] += len(group)
+        self.stats["transactions"] += len(ctx)
+        self.stats["batches"] += 1
+
+        timings = ctx.timings_ms()
+        start = 0
+        for pending in group:
+            stop = start + len(pending.txs)
+            pending.future.set_result({
+                "columns": slice_columns(columns, start, stop),
+                "timings_ms": timings,
+                "batch_size": len(ctx),
+                "wait_ms": round((started - pending.enqueued) * 1000, 3),
+            })
+            start = stop
+
+
+_coalescer = None
+_coalescer_lock = threading.Lock()
+
+
+def get_scoring_coalescer(pipeline) -> ScoringCoalescer:
+    """
+    Process-wide coalescer, started on first use.
+    """
+    global _coalescer
+    with _coalescer_lock:
+        if _coalescer is None:
+            _coalescer = ScoringCoalescer(pipeline)
+            _coalescer.start()
+    return _coalescer
@@ -0,0 +1,314 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from app.ml.cascade import SCORED_BY_SCREEN
+from app.ml.thread_budget import limit_process_threads
+
+
+logger = logging.getLogger(__name__)
+
+
+# PROCESS-POOL SCORING BACKEND
+# RiskPipeline(executor=ScoringPool) keeps build_context() in the caller
+# and runs predict / anomaly / decision / explain in worker processes:
+#
+# - workers load the models ONCE (initializer), not per batch
+# - X and X_anomaly are copied into one shared-memory segment per batch;
+#   the worker maps them (no pickling of matrices) and writes fraud_prob /
+#   anomaly_score back into the same segment
+# - only the small per-row lists (decision, reasons, SHAP top-k) are pickled
+#
+# SCORING_POOL_WORKERS=0 (default) keeps scoring in-process.
+
+POOL_WORKERS = int(os.getenv("SCORING_POOL_WORKERS", "0"))
+POOL_THREADS_PER_WORKER = int(os.getenv("SCORING_POOL_THREADS_PER_WORKER", "1"))
+
+_ARRAY_COLUMNS = ("fraud_prob", "anomaly_score")
+
+
+# worker side
+
+_worker_pipeline = None
+
+
+def _init_worker(threads: int, version: str | None = None):
+    global _worker_pipeline
+
+    # env for pools created from here on; numpy (and its BLAS pool) is
+    # already loaded by this module's import, hence enforce() below
+    limit_process_threads(threads)
+
+    from app.ml.pipeline import RiskPipeline
+    from app.ml.registry import ModelSet
+    from app.ml.thread_budget import get_thread_budget
+
+    _worker_pipeline = RiskPipeline()
+    registry = _worker_pipeline.registry
+    if version is not None and version != registry.version:
+        registry.swap(ModelSet(version))
+    registry.load()
+
+    # every pool loaded by now (BLAS, LightGBM / sklearn OpenMP)
+    get_thread_budget().enforce()
+
+
+def _layout(n: int, x_shape, x_dtype, a_shape, a_dtype):
+    """
+    Byte offsets of X | X_anomaly | fraud_prob | anomaly_score.
+    """
+    x_bytes = int(np.prod(x_shape)) * np.dtype(x_dtype).itemsize
+    a_bytes = int(np.prod(a_shape)) * np.dtype(a_dtype).itemsize
+    out_bytes = 2 * n * np.dtype(np.float64).itemsize
+    return 0, x_bytes, x_bytes + a_bytes, x_bytes + a_bytes + out_bytes
+
+
+def _views(buf, n, x_shape, x_dtype, a_shape, a_dtype):
+    x_at, a_at, out_at, _ = _layout(n, x_shape, x_dtype, a_shape, a_dtype)
+    X = np.ndarray(x_shape, dtype=x_dtype, buffer=buf, offset=x_at)
+    X_anomaly = np.ndarray(a_shape, dtype=a_dtype, buffer=buf, offset=a_at)
+    out = np.ndarray((2, n), dtype=np.float64, buffer=buf, offset=out_at)
+    return X, X_anomaly, out
+
+
+def _score_segment(buf, n, x_shape, x_dtype, a_shape, a_dtype, explain, cascade=None):
+    from app.ml.context import ScoringContext
+
+    X, X_anomaly, out = _views(buf, n, x_shape, x_dtype, a_shape, a_dtype)
+
+    ctx = ScoringContext([None] * n, X=X, X_anomaly=X_anomaly)
+    ctx.cascade = cascade
+    columns = _worker_pipeline.run_local(ctx, explain=explain)
+
+    for i, name in enumerate(_ARRAY_COLUMNS):
+        out[i] = columns.pop(name)
+
+    return columns, ctx.timings
+
+
+def _run_shared(name, n, x_shape, x_dtype, a_shape, a_dtype, explain, cascade=None):
+    shm = SharedMemory(name=name)
+    try:
+        # views into shm die with _score_segment's frame
+        return _score_segment(
+            shm.buf, n, x_shape, x_dtype, a_shape, a_dtype, explain, cascade
+        )
+    finally:
+        try:
+            shm.close()
+        except BufferError:
+            # a traceback still references the views; freed with it
+            pass
+
+
+# caller side
+
+class ScoringPool:
+    """
+    Out-of-process run() for RiskPipeline.
+
+    - submit() -> Future of the run() columns (sync and async callers)
+    - run()    -> blocking submit()
+    - worker processes are spawned on first use
+    """
+
+    def __init__(
+        self,
+        n_workers: int = POOL_WORKERS,
+        threads_per_worker: int = POOL_THREADS_PER_WORKER,
+    ):
+        self.n_workers = max(1, n_workers)
+        self.threads_per_worker = threads_per_worker
+
+        self._executor = None
+        self._lock = threading.Lock()
+
+        # model version the workers load (None: registry default)
+        self.version = None
+
+        self.stats = {
+            "batches": 0,
+            "transactions": 0,
+            "failed": 0,
+            "shared_bytes": 0,
+        }
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.n_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.threads_per_worker, self.version),
+                )
+            return self._executor
+
+    def reload(self, version: str):
+        """
+        Hot reload: spawn + warm a NEW set of workers on `version`,
+        swap it in, then retire the old workers once their in-flight
+        batches finish.
+        """
+        fresh = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker, version),
+        )
+        list(fresh.map(time.sleep, [0.05] * self.n_workers))
+
+        with self._lock:
+            old, self._executor = self._executor, fresh
+            self.version = version
+
+        if old is not None:
+            threading.Thread(
+                target=old.shutdown,
+                kwargs={"wait": True},
+                name="scoring-pool-retire",
+                daemon=True,
+            ).start()
+
+    def warmup(self):
+        """
+        Spawn every worker and load its models now
+        (otherwise the first batches pay for it).
+        """
+        pool = self._pool()
+        list(pool.map(time.sleep, [0.05] * self.n_workers))
+
+    def _reset(self, broken: ProcessPoolExecutor):
+        """
+        A worker died: drop the broken executor, the next submit()
+        spawns a fresh one.
+        """
+        with self._lock:
+            if self._executor is broken:
+                logger.error("Scoring pool broken, respawning workers")
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def submit(self, ctx, explain: bool = True) -> Future:
+        n = len(ctx)
+        X = np.ascontiguousarray(ctx.X)
+        X_anomaly = np.ascontiguousarray(ctx.X_anomaly)
+        spec = (n, X.shape, X.dtype.str, X_anomaly.shape, X_anomaly.dtype.str)
+
+        size = _layout(*spec)[-1]
+        shm = SharedMemory(create=True, size=max(size, 1))
+        pool = None
+        try:
+            X_view, A_view, _ = _views(shm.buf, *spec)
+            X_view[:] = X
+            A_view[:] = X_anomaly
+            del X_view, A_view
+
+            submitted = time.perf_counter()
+            pool = self._pool()
+            task = pool.submit(_run_shared, shm.name, *spec, explain, ctx.cascade)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool) and pool is not None:
+                self._reset(pool)
+            shm.close()
+            shm.unlink()
+            raise
+
+        result = Future()
+
+        def done(task):
+            try:
+                columns, timings = task.result()
+
+                out = np.ndarray(
+                    (2, n), dtype=np.float64, buffer=shm.buf, offset=_layout(*spec)[2]
+                )
+                for i, name in enumerate(_ARRAY_COLUMNS):
+                    columns[name] = out[i].copy()
+                del out
+
+                self._record(ctx, columns, timings, time.perf_counter() - submitted)
+                self.stats["batches"] += 1
+                self.stats["transactions"] += n
+                self.stats["shared_bytes"] += size
+                result.set_result(columns)
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    self._reset(pool)
+                self.stats["failed"] += 1
+                result.set_exception(e)
+            finally:
+                shm.close()
+                shm.unlink()
+
+        task.add_done_callback(done)
+        return result
+
+    def run(self, ctx, explain: bool = True) -> dict:
+        return self.submit(ctx, explain=explain).result()
+
+    @staticmethod
+    def _record(ctx, columns, timings, round_trip: float):
+        """
+        Mirror run_local() on the caller's context
+        (stage outputs + worker timings + pool overhead).
+        """
+        ctx.fraud_probs = columns["fraud_prob"]
+        ctx.anomaly_scores = columns["anomaly_score"]
+        ctx.decisions = {
+            "decision": columns["decision"],
+            "severity": columns["severity"],
+            "reasons": columns["reasons"],
+        }
+        if ctx.cascade is not None:
+            ctx.screened = np.flatnonzero(
+                np.asarray(columns["scored_by"]) == SCORED_BY_SCREEN
+            )
+
+        for stage, seconds in timings.items():
+            ctx.timings[stage] = ctx.timings.get(stage, 0.0) + seconds
+        ctx.timings["pool"] = ctx.timings.get("pool", 0.0) + max(
+            0.0, round_trip - sum(timings.values())
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            **self.stats,
+            "n_workers": self.n_workers,
+            "threads_per_worker": self.threads_per_worker,
+            "version": self.version,
+            "started": self._executor is not None,
+        }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_scoring_pool() -> ScoringPool | None:
+    """
+    Process-wide pool when SCORING_POOL_WORKERS > 0, else None
+    (in-process scoring). Child processes (pool / ingestion workers)
+    always score in-process.
+    """
+    global _pool
+    if POOL_WORKERS <= 0 or multiprocessing.parent_process() is not None:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ScoringPool()
+    return _pool
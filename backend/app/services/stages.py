@@ -0,0 +1,184 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+
+# end-of-stream marker passed down the queues
+_DONE = object()
+
+_POLL_SECONDS = 0.1
+
+
+class StageMetrics:
+    """
+    Busy time + volume of one stage.
+    utilization ~ 1.0 marks the bottleneck stage.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.rows = 0
+        self.busy_seconds = 0.0
+
+    def add(self, rows: int, seconds: float):
+        self.items += 1
+        self.rows += rows
+        self.busy_seconds += seconds
+
+    @contextmanager
+    def timed(self, rows: int):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(rows, time.perf_counter() - started)
+
+    def to_dict(self, elapsed: float) -> dict:
+        busy = self.busy_seconds
+        return {
+            "items": self.items,
+            "rows": self.rows,
+            "busy_seconds": round(busy, 3),
+            "rows_per_busy_second": round(self.rows / busy, 1) if busy else 0.0,
+            "utilization": round(busy / elapsed, 3) if elapsed else 0.0,
+        }
+
+
+class MeteredQueue:
+    """
+    Bounded queue between two stages.
+
+    - blocked_put_seconds : producer waited on a full queue
+                            (downstream is slower -> backpressure)
+    - starved_get_seconds : consumer waited on an empty queue
+                            (upstream is slower)
+    """
+
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.maxsize = maxsize
+
+        self.puts = 0
+        self.depth_total = 0
+        self.max_depth = 0
+        self.blocked_put_seconds = 0.0
+        self.starved_get_seconds = 0.0
+
+    def put(self, item, should_stop) -> bool:
+        started = time.perf_counter()
+        while True:
+            try:
+                self.queue.put(item, timeout=_POLL_SECONDS)
+                break
+            except queue.Full:
+                if should_stop():
+                    return False
+        self.blocked_put_seconds += time.perf_counter() - started
+
+        depth = self.queue.qsize()
+        self.puts += 1
+        self.depth_total += depth
+        self.max_depth = max(self.max_depth, depth)
+        return True
+
+    def get(self, should_stop):
+        started = time.perf_counter()
+        while True:
+            try:
+                item = self.queue.get(timeout=_POLL_SECONDS)
+                break
+            except queue.Empty:
+                if should_stop():
+                    item = _DONE
+                    break
+        self.starved_get_seconds += time.perf_counter() - started
+        return item
+
+    def to_dict(self) -> dict:
+        return {
+            "maxsize": self.maxsize,
+            "max_depth": self.max_depth,
+            "mean_depth": round(self.depth_total / self.puts, 2) if self.puts else 0.0,
+            "blocked_put_seconds": round(self.blocked_put_seconds, 3),
+            "starved_get_seconds": round(self.starved_get_seconds, 3),
+        }
+
+
+def run_stages(source, transforms, sink, depth: int = 2, cancel_event=None):
+    """
+    source -> transforms... -> sink, one thread per upstream stage,
+    joined by bounded queues. sink runs on the calling thread.
+
+    - depth bounds the items in flight between two stages
+    - the first error stops every stage and is re-raised here
+    - cancel_event stops all stages; queued items are dropped
+
+    Returns queue metrics keyed "to_<stage>".
+    """
+    stop = threading.Event()
+    errors = []
+
+    def should_stop() -> bool:
+        if stop.is_set():
+            return True
+        return cancel_event is not None and cancel_event.is_set()
+
+    stages = list(transforms) + [sink]
+    queues = [
+        MeteredQueue(f"to_{getattr(fn, '__name__', 'stage')}", depth)
+        for fn in stages
+    ]
+
+    def produce():
+        try:
+            for item in source:
+                if not queues[0].put(item, should_stop):
+                    return
+            queues[0].put(_DONE, should_stop)
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+
+    def transform(fn, inbox, outbox):
+        try:
+            while True:
+                item = inbox.get(should_stop)
+                if item is _DONE:
+                    outbox.put(_DONE, should_stop)
+                    return
+                if not outbox.put(fn(item), should_stop):
+                    return
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+
+    threads = [threading.Thread(target=produce, name="stage-source", daemon=True)]
+    for i, fn in enumerate(transforms):
+        threads.append(threading.Thread(
+            target=transform,
+            args=(fn, queues[i], queues[i + 1]),
+            name=f"stage-{getattr(fn, '__name__', i)}",
+            daemon=True,
+        ))
+
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            item = queues[-1].get(should_stop)
+            if item is _DONE:
+                break
+            sink(item)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+
+    return {q.name: q.to_dict() for q in queues}
@@ -0,0 +1,161 @@
+import logging
+import os
+import threading
+import time
+
+from app.ml.features import RAW_FEATURES
+
+
+logger = logging.getLogger(__name__)
+
+
+# STARTUP WARMUP
+# models load lazily; without this the first request after a deploy pays
+# for joblib loads, explainer setup (shap/numba when EXPLAINER_BACKEND=shap)
+# and first-call overheads.
+#
+# WARMUP_MODE=background (default) : server accepts traffic at once,
+#                                    /api/health/ready is 503 until warm
+# WARMUP_MODE=blocking             : startup waits for the warmup
+# WARMUP_MODE=off                  : lazy loading only (ready immediately)
+
+WARMUP_MODE = os.getenv("WARMUP_MODE", "background")
+WARMUP_ROWS = int(os.getenv("WARMUP_ROWS", "64"))
+
+STATUS_PENDING = "pending"
+STATUS_WARMING = "warming"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+
+
+def warmup_rows(n: int = WARMUP_ROWS) -> list[dict]:
+    """
+    Dummy raw transactions covering the feature contract
+    (missing / numeric / categorical values, batch + single-row paths).
+    """
+    rows = []
+    for i in range(n):
+        row = {f: None for f in RAW_FEATURES}
+        row.update({
+            "TransactionID": f"warmup-{i}",
+            "TransactionAmt": float(10 + 37 * i),
+            "ProductCD": "WCHRS"[i % 5],
+            "card1": 1000 + i,
+            "addr1": 100 + i % 50,
+            "C1": float(i % 7),
+            "C2": float(i % 5),
+            "D1": float(i % 30),
+            "DeviceType": ("desktop", "mobile", None)[i % 3],
+        })
+        rows.append(row)
+    return rows
+
+
+class Warmup:
+    """
+    Startup warmup + readiness state.
+
+    - steps are timed and logged (seconds per step)
+    - a failed step marks the process not ready (API keeps serving
+      /api/health; scoring falls back to lazy loading)
+    """
+
+    def __init__(self):
+        self.status = STATUS_PENDING
+        self.error = None
+        self.steps = []
+        self.started_at = None
+        self.finished_at = None
+        self._thread = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == STATUS_READY
+
+    def step(self, name: str, fn):
+        started = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - started
+
+        self.steps.append({"step": name, "seconds": round(seconds, 4)})
+        logger.info("Warmup step %s: %.3fs", name, seconds)
+        return result
+
+    def run(self, pipeline, scoring_pool=None, n_rows: int = WARMUP_ROWS):
+        """
+        Load every registry artifact, then push dummy rows through
+        the pipeline (batch + single row, with SHAP).
+        """
+        self.status = STATUS_WARMING
+        self.started_at = time.time()
+        rows = warmup_rows(n_rows)
+
+        try:
+            self.step("load_fraud_model", pipeline.fraud_model._load_model)
+            self.step("load_anomaly_model", pipeline.anomaly_scorer._load_model)
+
+            ctx = self.step("encode", lambda: pipeline.build_context(rows))
+            self.step("predict", lambda: pipeline.run_local(ctx, explain=False))
+            self.step("explain", lambda: pipeline.fraud_model.explain_matrix(ctx.X))
+            self.step(
+                "score_single",
+                lambda: pipeline.run_local(pipeline.build_context(rows[:1])),
+            )
+
+            if scoring_pool is not None:
+                self.step("scoring_pool.spawn", scoring_pool.warmup)
+                self.step(
+                    "scoring_pool.score",
+                    lambda: scoring_pool.run(pipeline.build_context(rows)),
+                )
+        except Exception as e:
+            logger.exception("Warmup failed")
+            self.status = STATUS_FAILED
+            self.error = str(e)
+        else:
+            self.status = STATUS_READY
+        finally:
+            self.finished_at = time.time()
+
+        logger.info(
+            "Warmup %s in %.3fs",
+            self.status,
+            self.finished_at - self.started_at,
+        )
+
+    def start(self, pipeline, scoring_pool=None, mode: str = WARMUP_MODE):
+        if mode == "off":
+            self.status = STATUS_READY
+            return
+
+        if mode == "blocking":
+            self.run(pipeline, scoring_pool)
+            return
+
+        self._thread = threading.Thread(
+            target=self.run,
+            args=(pipeline, scoring_pool),
+            name="model-warmup",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def to_dict(self) -> dict:
+        total = None
+        if self.started_at is not None and self.finished_at is not None:
+            total = round(self.finished_at - self.started_at, 4)
+
+        return {
+            "status": self.status,
+            "ready": self.ready,
+            "error": self.error,
+            "steps": list(self.steps),
+            "total_seconds": total,
+        }
+
+
+_warmup = Warmup()
+
+
+def get_warmup() -> Warmup:
+    return _warmup